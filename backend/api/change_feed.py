@@ -0,0 +1,201 @@
+"""
+Push change feed for SimpleCP API clients.
+
+The menu-bar client used to poll /api/history/recent. ChangeFeed turns
+HistoryStore / SnippetStore delegate events into compact, sequenced
+change events that /api/events streams as Server-Sent Events, so the
+server only does work when something actually changes.
+
+Store events arrive on whichever thread mutated the store (the
+clipboard monitor or the API writer); subscribers are asyncio queues
+fed with loop.call_soon_threadsafe. A bounded backlog lets a client
+reconnect and resume after the last sequence number it saw. When
+that is no longer possible (the backlog moved on, the server
+restarted, or the client fell too far behind) the client gets a
+single "resync" event and should refetch its lists.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+# Item content up to this many characters is sent inline with events
+FEED_CONTENT_LIMIT = 4096
+
+
+def compact_item(item: Any) -> Dict[str, Any]:
+    """Fields a list view needs; large content is left for a follow-up fetch."""
+    data = {
+        "clip_id": item.clip_id,
+        "timestamp": item.timestamp_iso,
+        "content_type": item.content_type,
+        "display_string": item.display_string,
+        "source_app": item.source_app,
+        "item_type": item.item_type,
+        "has_name": item.has_name,
+        "snippet_name": item.snippet_name,
+        "folder_path": item.folder_path,
+        "tags": list(item.tags),
+        "content_length": item.content_length,
+    }
+    if item.content_length <= FEED_CONTENT_LIMIT:
+        data["content"] = item.content
+    return data
+
+
+class _Subscriber:
+    """One connected client: an asyncio queue owned by its event loop."""
+
+    __slots__ = ("loop", "queue", "limit")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, limit: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.limit = limit
+
+
+class ChangeFeed:
+    """
+    Sequenced change events with a resumable backlog.
+
+    Register handle_history_event / handle_snippet_event as store
+    delegates and iterate events() per client.
+    """
+
+    def __init__(self, backlog: int = 1000, queue_limit: int = 1000, heartbeat: float = 15.0):
+        """
+        Args:
+            backlog: Events kept for clients resuming with `after`
+            queue_limit: Undelivered events per client before it is told to resync
+            heartbeat: Seconds of silence before streams send a keep-alive
+        """
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        self._backlog: Deque[Dict[str, Any]] = deque(maxlen=backlog)
+        self._subscribers: Set[_Subscriber] = set()
+        self.queue_limit = queue_limit
+        # Start from the wall clock (ms) so sequence numbers keep increasing
+        # across restarts and stale resume points are detected, not replayed
+        self.seq = time.time_ns() // 1_000_000
+        self._stats = {"events": 0, "resyncs": 0, "overflows": 0}
+
+    def publish(self, store: str, op: str, **fields: Any) -> Dict[str, Any]:
+        """Sequence an event, keep it in the backlog and fan it out."""
+        with self._lock:
+            self.seq += 1
+            event = {"seq": self.seq, "store": store, "op": op, **fields}
+            self._backlog.append(event)
+            self._stats["events"] += 1
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, event)
+            except RuntimeError:
+                self._unsubscribe(subscriber)  # its loop has closed
+        return event
+
+    def _deliver(self, subscriber: _Subscriber, event: Dict[str, Any]):
+        """Runs on the subscriber's loop."""
+        queue = subscriber.queue
+        if queue.qsize() >= subscriber.limit:
+            # Too far behind to be worth replaying: tell it to refetch
+            while not queue.empty():
+                queue.get_nowait()
+            with self._lock:
+                self._stats["overflows"] += 1
+            queue.put_nowait(self._resync_event(event["seq"]))
+            return
+        queue.put_nowait(event)
+
+    def _resync_event(self, seq: int) -> Dict[str, Any]:
+        with self._lock:
+            self._stats["resyncs"] += 1
+        return {"seq": seq, "store": None, "op": "resync"}
+
+    def _subscribe(self, after: Optional[int]) -> Tuple[_Subscriber, Optional[List[Dict[str, Any]]]]:
+        """Register a subscriber and return the backlog after `after` (None: resync)."""
+        subscriber = _Subscriber(asyncio.get_running_loop(), self.queue_limit)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if after is None or after == self.seq:
+                return subscriber, []
+            oldest = self._backlog[0]["seq"] if self._backlog else self.seq + 1
+            if after > self.seq or after < oldest - 1:
+                return subscriber, None
+            return subscriber, [event for event in self._backlog if event["seq"] > after]
+
+    def _unsubscribe(self, subscriber: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    async def events(
+        self, after: Optional[int] = None, idle_timeout: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield events newer than `after`, then live events as they happen.
+
+        Yields None after `idle_timeout` seconds without events, so
+        callers can send keep-alives.
+        """
+        subscriber, backlog = self._subscribe(after)
+        try:
+            if backlog is None:
+                yield self._resync_event(self.seq)
+            else:
+                for event in backlog:
+                    yield event
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), idle_timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._unsubscribe(subscriber)
+
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        if event == "did_insert":
+            self.publish("history", "insert", index=args[0], item=compact_item(args[1]))
+        elif event == "did_delete":
+            self.publish("history", "delete", clip_id=args[1].clip_id)
+        elif event == "item_moved":
+            self.publish("history", "move", clip_id=args[2].clip_id, index=args[1])
+        elif event == "item_updated":
+            self.publish("history", "update", item=compact_item(args[0]))
+        elif event == "store_cleared":
+            self.publish("history", "clear")
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        if event == "folder_created":
+            self.publish("snippets", "folder_create", folder=args[0])
+        elif event == "folder_renamed":
+            self.publish("snippets", "folder_rename", folder=args[0], new_folder=args[1])
+        elif event == "folder_deleted":
+            self.publish("snippets", "folder_delete", folder=args[0])
+        elif event == "snippet_added":
+            self.publish("snippets", "insert", folder=args[0], item=compact_item(args[1]))
+        elif event == "snippet_updated":
+            self.publish("snippets", "update", folder=args[0], item=compact_item(args[1]))
+        elif event == "snippet_deleted":
+            self.publish("snippets", "delete", folder=args[0], clip_id=args[1].clip_id)
+        elif event == "snippet_moved":
+            self.publish(
+                "snippets", "move", folder=args[0], new_folder=args[1], clip_id=args[2].clip_id
+            )
+        elif event == "store_cleared":
+            self.publish("snippets", "clear")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Event counters, subscriber count and backlog size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["seq"] = self.seq
+            stats["subscribers"] = len(self._subscribers)
+            stats["backlog"] = len(self._backlog)
+        return stats
+
+    def __repr__(self) -> str:
+        return f"ChangeFeed(seq={self.seq}, subscribers={len(self._subscribers)})"
@@ -1,79 +1,211 @@
 """API endpoints for SimpleCP REST API."""
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+import json
+import secrets
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, Dict, List, Literal, Optional, Tuple
 from api.models import (ClipboardItemResponse, HistoryFolderResponse, CreateSnippetRequest,
     UpdateSnippetRequest, MoveSnippetRequest, CreateFolderRequest, RenameFolderRequest,
     CopyRequest, SearchResponse, StatsResponse, SnippetFolderResponse, SuccessResponse,
     StatusResponse, ExportData, ImportRequest, SearchRequest, clipboard_item_to_response)
+from api.change_feed import ChangeFeed
+from api.executor import ManagerExecutor
+from api.item_encoder import ItemEncoder, encode_str
+from api.response_cache import CacheKey, CachedBody, ResponseCache
 
 
-def create_router(clipboard_manager):
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _cursor_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    return {} if next_cursor is None else {NEXT_CURSOR_HEADER: next_cursor}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def create_router(
+    clipboard_manager,
+    executor: Optional[ManagerExecutor] = None,
+    feed: Optional[ChangeFeed] = None,
+    cache: Optional[ResponseCache] = None,
+    encoder: Optional[ItemEncoder] = None,
+):
+    """
+    Build the API routes.
+
+    Every call that takes the store lock runs on `executor` (mutations
+    on its writer, reads on its reader pool), so a writer queued behind
+    a save or scan never blocks the event loop. `feed` backs the /api/events stream and
+    `cache` holds encoded list bodies; `encoder` writes item JSON
+    without building response models. All three must be registered as
+    delegates of both stores.
+    """
     router = APIRouter()
+    executor = executor or ManagerExecutor()
+    # Store versions restart at zero with the process; the token keeps
+    # ETags from one run from matching the next
+    etag_token = secrets.token_hex(4)
+    if feed is None:
+        feed = ChangeFeed()
+        clipboard_manager.history_store.add_delegate(feed.handle_history_event)
+        clipboard_manager.snippet_store.add_delegate(feed.handle_snippet_event)
+    if cache is None:
+        cache = ResponseCache()
+        clipboard_manager.history_store.add_delegate(cache.handle_history_event)
+        clipboard_manager.snippet_store.add_delegate(cache.handle_snippet_event)
+    if encoder is None:
+        encoder = ItemEncoder()
+        clipboard_manager.history_store.add_delegate(encoder.handle_history_event)
+        clipboard_manager.snippet_store.add_delegate(encoder.handle_snippet_event)
+    read, write = executor.read, executor.write
+
+    async def serve(
+        key: CacheKey,
+        if_none_match: Optional[str],
+        accept_encoding: Optional[str],
+        build: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]],
+    ) -> Response:
+        """
+        Answer a list read from the store named by key[0].
+
+        Returns 304 if the client's ETag is current, else the cached body
+        for this key and store version, building it on a miss. The
+        version is read before the store, so a concurrent change can only
+        make the tag or cache entry older than the body, never newer.
+        """
+        store = key[0]
+        version = clipboard_manager.get_store_versions()[store]
+        headers = {"ETag": f'"{etag_token}-{store[0]}{version}"', "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        entry = cache.get(key, version)
+        if entry is None:
+            body, extra_headers = await build()
+            entry = cache.put(key, CachedBody(version, body, extra_headers))
+        return cache.respond(entry, headers, accept_encoding)
+
+    item_list = encoder.encode_list
 
     @router.get("/api/history", response_model=List[ClipboardItemResponse])
-    async def get_history(limit: Optional[int] = None):
-        return [clipboard_item_to_response(item) for item in clipboard_manager.get_all_history(limit)]
+    async def get_history(
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
+        """Get history, optionally paged with after=<clip_id>&limit=N."""
+        async def build():
+            try:
+                items, next_cursor = await read(clipboard_manager.get_history_page, after, limit)
+            except KeyError:
+                raise HTTPException(status_code=400, detail="Unknown cursor")
+            return item_list(items), _cursor_headers(next_cursor)
+
+        return await serve(("history", "page", limit, after), if_none_match, accept_encoding, build)
 
     @router.get("/api/history/recent", response_model=List[ClipboardItemResponse])
-    async def get_recent_history():
-        return [clipboard_item_to_response(item) for item in clipboard_manager.get_recent_history()]
+    async def get_recent_history(
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
+        async def build():
+            return item_list(await read(clipboard_manager.get_recent_history)), {}
+
+        return await serve(("history", "recent"), if_none_match, accept_encoding, build)
 
     @router.get("/api/history/folders", response_model=List[HistoryFolderResponse])
-    async def get_history_folders():
-        folders = clipboard_manager.get_history_folders()
-        result = []
-        for folder in folders:
-            result.append(
-                HistoryFolderResponse(
-                    name=folder["name"],
-                    start_index=folder["start_index"],
-                    end_index=folder["end_index"],
-                    count=folder["count"],
-                    items=[
-                        clipboard_item_to_response(item) for item in folder["items"]
-                    ],
+    async def get_history_folders(
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
+        async def build():
+            folders = await read(clipboard_manager.get_history_folders)
+            body = b",".join(
+                b'{"name":%s,"start_index":%d,"end_index":%d,"count":%d,"items":%s}'
+                % (
+                    encode_str(folder["name"]),
+                    folder["start_index"],
+                    folder["end_index"],
+                    folder["count"],
+                    item_list(folder["items"]),
                 )
+                for folder in folders
             )
-        return result
+            return b"[" + body + b"]", {}
+
+        return await serve(("history", "folders"), if_none_match, accept_encoding, build)
 
     @router.delete("/api/history/{clip_id}", response_model=SuccessResponse)
     async def delete_history_item(clip_id: str):
-        success = clipboard_manager.delete_history_item(clip_id)
+        success = await write(clipboard_manager.delete_history_item, clip_id)
         if not success:
             raise HTTPException(status_code=404, detail="Item not found")
         return SuccessResponse(success=True, message="Item deleted")
 
     @router.delete("/api/history", response_model=SuccessResponse)
     async def clear_history():
-        clipboard_manager.clear_history()
+        await write(clipboard_manager.clear_history)
         return SuccessResponse(success=True, message="History cleared")
 
     @router.get("/api/snippets", response_model=List[SnippetFolderResponse])
-    async def get_all_snippets():
-        snippets_by_folder = clipboard_manager.get_all_snippets()
-        result = []
-        for folder_name, items in snippets_by_folder.items():
-            result.append(
-                SnippetFolderResponse(
-                    folder_name=folder_name,
-                    snippets=[clipboard_item_to_response(item) for item in items],
-                )
+    async def get_all_snippets(
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
+        async def build():
+            snippets_by_folder = await read(clipboard_manager.get_all_snippets)
+            body = b",".join(
+                b'{"folder_name":%s,"snippets":%s}' % (encode_str(folder_name), item_list(items))
+                for folder_name, items in snippets_by_folder.items()
             )
-        return result
+            return b"[" + body + b"]", {}
+
+        return await serve(("snippets", "all"), if_none_match, accept_encoding, build)
 
     @router.get("/api/snippets/folders", response_model=List[str])
-    async def get_snippet_folders():
+    async def get_snippet_folders(
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
         """Get all snippet folder names."""
-        return clipboard_manager.get_snippet_folders()
+        async def build():
+            names = await read(clipboard_manager.get_snippet_folders)
+            return b"[" + b",".join(map(encode_str, names)) + b"]", {}
+
+        return await serve(("snippets", "names"), if_none_match, accept_encoding, build)
 
     @router.get(
         "/api/snippets/{folder_name}",
         response_model=List[ClipboardItemResponse],
     )
-    async def get_folder_snippets(folder_name: str):
-        """Get all snippets in a specific folder."""
-        items = clipboard_manager.get_folder_snippets(folder_name)
-        return [clipboard_item_to_response(item) for item in items]
+    async def get_folder_snippets(
+        folder_name: str,
+        limit: Optional[int] = Query(None, ge=1),
+        after: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None),
+        accept_encoding: Optional[str] = Header(None),
+    ):
+        """Get snippets in a specific folder, optionally paged with after/limit."""
+        async def build():
+            try:
+                items, next_cursor = await read(
+                    clipboard_manager.get_folder_snippets_page, folder_name, after, limit
+                )
+            except KeyError:
+                raise HTTPException(status_code=400, detail="Unknown cursor")
+            return item_list(items), _cursor_headers(next_cursor)
+
+        key = ("snippets", "folder", folder_name, limit, after)
+        return await serve(key, if_none_match, accept_encoding, build)
 
     @router.post("/api/snippets", response_model=ClipboardItemResponse)
     async def create_snippet(request: CreateSnippetRequest):
@@ -84,8 +216,9 @@ def create_router(clipboard_manager):
                 raise HTTPException(
                     status_code=400, detail="clip_id cannot be empty"
                 )
-            snippet = clipboard_manager.save_as_snippet(
-                request.clip_id, request.name, request.folder, request.tags
+            snippet = await write(
+                clipboard_manager.save_as_snippet,
+                request.clip_id, request.name, request.folder, request.tags,
             )
             if not snippet:
                 raise HTTPException(status_code=404, detail="History item not found")
@@ -96,8 +229,9 @@ def create_router(clipboard_manager):
                     status_code=400, detail="content cannot be empty"
                 )
             try:
-                snippet = clipboard_manager.add_snippet_direct(
-                    request.content, request.name, request.folder, request.tags
+                snippet = await write(
+                    clipboard_manager.add_snippet_direct,
+                    request.content, request.name, request.folder, request.tags,
                 )
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
@@ -112,8 +246,9 @@ def create_router(clipboard_manager):
         folder_name: str, clip_id: str, request: UpdateSnippetRequest
     ):
         """Update snippet properties."""
-        success = clipboard_manager.update_snippet(
-            folder_name, clip_id, request.content, request.name, request.tags
+        success = await write(
+            clipboard_manager.update_snippet,
+            folder_name, clip_id, request.content, request.name, request.tags,
         )
         if not success:
             raise HTTPException(status_code=404, detail="Snippet not found")
@@ -124,7 +259,7 @@ def create_router(clipboard_manager):
     )
     async def delete_snippet(folder_name: str, clip_id: str):
         """Delete specific snippet."""
-        success = clipboard_manager.delete_snippet(folder_name, clip_id)
+        success = await write(clipboard_manager.delete_snippet, folder_name, clip_id)
         if not success:
             raise HTTPException(status_code=404, detail="Snippet not found")
         return SuccessResponse(success=True, message="Snippet deleted")
@@ -135,8 +270,8 @@ def create_router(clipboard_manager):
     )
     async def move_snippet(folder_name: str, clip_id: str, request: MoveSnippetRequest):
         """Move snippet to different folder."""
-        success = clipboard_manager.move_snippet(
-            folder_name, request.to_folder, clip_id
+        success = await write(
+            clipboard_manager.move_snippet, folder_name, request.to_folder, clip_id
         )
         if not success:
             raise HTTPException(status_code=404, detail="Snippet not found")
@@ -146,13 +281,12 @@ def create_router(clipboard_manager):
     @router.get("/api/folders", response_model=List[str])
     async def get_folders():
         """Get list of all snippet folders."""
-        folders = clipboard_manager.get_snippet_folders()
-        return folders
+        return await read(clipboard_manager.get_snippet_folders)
 
     @router.post("/api/folders", response_model=SuccessResponse)
     async def create_folder(request: CreateFolderRequest):
         """Create new snippet folder."""
-        success = clipboard_manager.create_snippet_folder(request.folder_name)
+        success = await write(clipboard_manager.create_snippet_folder, request.folder_name)
         if not success:
             raise HTTPException(status_code=409, detail="Folder already exists")
         return SuccessResponse(success=True, message="Folder created")
@@ -160,7 +294,9 @@ def create_router(clipboard_manager):
     @router.put("/api/folders/{folder_name}", response_model=SuccessResponse)
     async def rename_folder(folder_name: str, request: RenameFolderRequest):
         """Rename snippet folder with detailed error handling."""
-        result = clipboard_manager.rename_snippet_folder(folder_name, request.new_name)
+        result = await write(
+            clipboard_manager.rename_snippet_folder, folder_name, request.new_name
+        )
 
         if not result["success"]:
             error_code = result.get("error", "UNKNOWN_ERROR")
@@ -185,7 +321,7 @@ def create_router(clipboard_manager):
     @router.delete("/api/folders/{folder_name}", response_model=SuccessResponse)
     async def delete_folder(folder_name: str):
         """Delete snippet folder and all its snippets."""
-        success = clipboard_manager.delete_snippet_folder(folder_name)
+        success = await write(clipboard_manager.delete_snippet_folder, folder_name)
         if not success:
             raise HTTPException(status_code=404, detail="Folder not found")
         return SuccessResponse(success=True, message="Folder deleted")
@@ -194,47 +330,69 @@ def create_router(clipboard_manager):
     @router.post("/api/clipboard/copy", response_model=SuccessResponse)
     async def copy_to_clipboard(request: CopyRequest):
         """Copy item to system clipboard by ID."""
-        success = clipboard_manager.copy_to_clipboard(request.clip_id)
+        success = await write(clipboard_manager.copy_to_clipboard, request.clip_id)
         if not success:
             raise HTTPException(status_code=404, detail="Item not found")
         return SuccessResponse(success=True, message="Copied to clipboard")
 
     # Search endpoint
+    def search_response(history, snippets, headers: Optional[Dict[str, str]] = None) -> Response:
+        body = b'{"history":%s,"snippets":%s}' % (item_list(history), item_list(snippets))
+        return Response(content=body, media_type="application/json", headers=headers)
+
     @router.get("/api/search", response_model=SearchResponse)
-    async def search(q: str):
-        """Search across history and snippets."""
-        results = clipboard_manager.search_all(q)
-        return SearchResponse(
-            history=[clipboard_item_to_response(item) for item in results["history"]],
-            snippets=[clipboard_item_to_response(item) for item in results["snippets"]],
+    async def search(
+        q: str,
+        mode: Literal["exact", "fuzzy"] = "exact",
+        limit: Optional[int] = Query(None, ge=1, le=500),
+        after: Optional[str] = None,
+    ):
+        """
+        Search across history and snippets.
+
+        mode=fuzzy returns the ranked top `limit` (default 20). Exact mode
+        pages with after=<cursor>&limit=N when either is given.
+        """
+        next_cursor = None
+        if mode == "fuzzy":
+            results = await read(clipboard_manager.search_fuzzy, q, limit or 20)
+        elif limit is None and after is None:
+            results = await read(clipboard_manager.search_all, q)
+        else:
+            try:
+                results, next_cursor = await read(clipboard_manager.search_page, q, after, limit)
+            except KeyError:
+                raise HTTPException(status_code=400, detail="Unknown cursor")
+        return search_response(
+            results["history"], results["snippets"], _cursor_headers(next_cursor)
         )
 
     # Stats endpoint
     @router.get("/api/stats", response_model=StatsResponse)
     async def get_stats():
         """Get manager statistics."""
-        stats = clipboard_manager.get_stats()
+        stats = await read(clipboard_manager.get_stats)
         return StatsResponse(**stats)
 
     # Status endpoint
     @router.get("/api/status", response_model=StatusResponse)
     async def get_status():
         """Get monitoring status."""
-        status = clipboard_manager.get_status()
+        status = await read(clipboard_manager.get_status)
         return StatusResponse(**status)
 
     # Export endpoint
     @router.get("/api/export", response_model=ExportData)
     async def export_snippets():
         """Export all snippets."""
-        export_data = clipboard_manager.export_snippets()
+        export_data = await read(clipboard_manager.export_snippets)
         return ExportData(**export_data)
 
     # Import endpoint
     @router.post("/api/import", response_model=SuccessResponse)
     async def import_snippets(request: ImportRequest):
         """Import snippets from export data."""
-        success = clipboard_manager.import_snippets(request.model_dump())
+        success = await write(clipboard_manager.import_snippets, request.model_dump())
         if not success:
             raise HTTPException(status_code=400, detail="Import failed")
         return SuccessResponse(success=True, message="Import successful")
@@ -243,19 +401,53 @@ def create_router(clipboard_manager):
     @router.post("/api/search", response_model=SearchResponse)
     async def search_post(request: SearchRequest):
         """Search across history and snippets (POST)."""
-        results = clipboard_manager.search_all(request.query)
+        if request.mode == "fuzzy":
+            results = await read(clipboard_manager.search_fuzzy, request.query, request.limit)
+        else:
+            results = await read(clipboard_manager.search_all, request.query)
         history = results["history"] if request.include_history else []
         snippets = results["snippets"] if request.include_snippets else []
-        return SearchResponse(
-            history=[clipboard_item_to_response(item) for item in history],
-            snippets=[clipboard_item_to_response(item) for item in snippets],
+        return search_response(history, snippets)
+
+    # Change feed (Server-Sent Events)
+    @router.get("/api/events")
+    async def stream_events(
+        after: Optional[int] = None,
+        last_event_id: Optional[str] = Header(None),
+    ):
+        """
+        Stream store changes as Server-Sent Events.
+
+        Each event has id=<seq> and a JSON body with seq, store, op and
+        clip_id/item/folder fields. Reconnect with after=<seq> (or the
+        Last-Event-ID header) to resume; an op of "resync" means the gap
+        could not be replayed and lists should be refetched.
+        """
+        if after is None and last_event_id:
+            try:
+                after = int(last_event_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+        async def stream():
+            async for event in feed.events(after, feed.heartbeat):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(event, separators=(",", ":"))
+                yield f"id: {event['seq']}\nevent: change\ndata: {data}\n\n"
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
 
     # Health endpoint for API route consistency
     @router.get("/api/health", response_model=dict)
     async def api_health():
         """Health check endpoint under /api/ path."""
-        stats = clipboard_manager.get_stats()
+        stats = await read(clipboard_manager.get_stats)
         return {"status": "healthy", "stats": stats}
 
     return router
@@ -0,0 +1,80 @@
+"""
+Off-loop execution of ClipboardManager calls for the SimpleCP API.
+
+Endpoints are async, but most manager calls are synchronous: mutations
+may save inline, folder reads may load shards from disk, and searches
+and exports scan whole stores. Running those on the event loop would
+stall every concurrent request, so endpoints hand them to a
+ManagerExecutor:
+
+- write(): mutations, on a single thread, so they stay serialized in
+  request order exactly as they were on the event loop.
+- read(): every other call that takes the store lock, on a small
+  bounded pool. Even cheap reads go here: the lock prefers writers, so
+  a read on the loop would wait behind any writer queued for it.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ManagerExecutor:
+    """Bounded thread pools for blocking manager work, with queueing stats."""
+
+    def __init__(self, max_readers: int = 4):
+        """
+        Args:
+            max_readers: Threads serving blocking reads (writes always use one)
+        """
+        if max_readers < 1:
+            raise ValueError("max_readers must be at least 1")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="simplecp-api-write")
+        self._readers = ThreadPoolExecutor(max_readers, thread_name_prefix="simplecp-api-read")
+        self._lock = threading.Lock()
+        self._stats = {
+            "reads": 0,
+            "writes": 0,
+            "in_flight": 0,
+            "max_queue_ms": 0.0,
+        }
+
+    async def read(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking read on the reader pool."""
+        return await self._submit(self._readers, "reads", fn, args, kwargs)
+
+    async def write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a mutation on the writer thread, after earlier mutations."""
+        return await self._submit(self._writer, "writes", fn, args, kwargs)
+
+    async def _submit(self, pool, kind, fn, args, kwargs):
+        queued = time.perf_counter()
+
+        def run():
+            waited = (time.perf_counter() - queued) * 1000
+            with self._lock:
+                self._stats["max_queue_ms"] = max(self._stats["max_queue_ms"], waited)
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            self._stats[kind] += 1
+            self._stats["in_flight"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, run)
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work; by default wait for queued calls to finish."""
+        self._readers.shutdown(wait=wait)
+        self._writer.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counters, calls in flight and the longest queue wait."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_queue_ms"] = round(stats["max_queue_ms"], 2)
+        return stats
@@ -0,0 +1,153 @@
+"""
+Direct JSON encoding of ClipboardItems for SimpleCP API responses.
+
+Building a ClipboardItemResponse per item and letting FastAPI validate
+and serialize it again costs more than the rest of a list request put
+together. ItemEncoder writes the same fields, in the same order, straight
+to JSON bytes and keeps each item's encoded fragment so repeat reads
+skip the content read (blob or decompression) as well. Store change
+events drop the fragments of the items they touch; the endpoints keep
+their response_model, so the OpenAPI schema is unchanged.
+"""
+
+import threading
+from collections import OrderedDict
+from json.encoder import encode_basestring
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def _optional(value: Optional[str]) -> str:
+    return "null" if value is None else encode_basestring(value)
+
+
+def encode_item(item: Any) -> bytes:
+    """One item as ClipboardItemResponse JSON, without building the model."""
+    return (
+        '{"clip_id":' + encode_basestring(item.clip_id)
+        + ',"content":' + encode_basestring(item.content)
+        + ',"timestamp":' + encode_basestring(item.timestamp_iso)
+        + ',"content_type":' + encode_basestring(item.content_type)
+        + ',"display_string":' + encode_basestring(item.display_string)
+        + ',"source_app":' + _optional(item.source_app)
+        + ',"item_type":' + encode_basestring(item.item_type)
+        + ',"has_name":' + ("true" if item.has_name else "false")
+        + ',"snippet_name":' + _optional(item.snippet_name)
+        + ',"folder_path":' + _optional(item.folder_path)
+        + ',"tags":[' + ",".join(map(encode_basestring, item.tags)) + "]}"
+    ).encode("utf-8")
+
+
+def encode_str(value: str) -> bytes:
+    """A JSON string literal."""
+    return encode_basestring(value).encode("utf-8")
+
+
+class ItemEncoder:
+    """
+    Encoder with a byte-bounded LRU of per-item JSON fragments.
+
+    Register handle_history_event / handle_snippet_event as store
+    delegates so a fragment is dropped as soon as its item changes.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, max_item_bytes: int = 64 * 1024):
+        """
+        Args:
+            max_bytes: Total size of fragments kept (0 disables caching)
+            max_item_bytes: Larger items are encoded on every read, not kept
+        """
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._lock = threading.Lock()
+        # clip_id -> (item, fragment); the item check catches a reused clip_id
+        self._fragments: "OrderedDict[str, Tuple[Any, bytes]]" = OrderedDict()
+        self._bytes = 0
+        # Bumped by every invalidation: a fragment encoded while one ran
+        # may hold the old values and is not kept
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def encode(self, item: Any) -> bytes:
+        """Fragment for one item, cached until the item changes."""
+        with self._lock:
+            entry = self._fragments.get(item.clip_id)
+            if entry is not None and entry[0] is item:
+                self._fragments.move_to_end(item.clip_id)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+            generation = self._generation
+        fragment = encode_item(item)
+        if len(fragment) <= self.max_item_bytes and len(fragment) <= self.max_bytes:
+            with self._lock:
+                if generation == self._generation:
+                    self._store(item, fragment)
+        return fragment
+
+    def _store(self, item: Any, fragment: bytes):
+        """Caller holds the lock."""
+        old = self._fragments.pop(item.clip_id, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+        self._fragments[item.clip_id] = (item, fragment)
+        self._bytes += len(fragment)
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._fragments.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._stats["evictions"] += 1
+
+    def encode_list(self, items: Iterable[Any]) -> bytes:
+        """A JSON array of items."""
+        return b"[" + b",".join(map(self.encode, items)) + b"]"
+
+    def discard(self, *items: Any):
+        """Drop the fragments of changed items."""
+        with self._lock:
+            self._generation += 1
+            for item in items:
+                entry = self._fragments.pop(item.clip_id, None)
+                if entry is not None:
+                    self._bytes -= len(entry[1])
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop every fragment."""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += len(self._fragments)
+            self._fragments.clear()
+            self._bytes = 0
+
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        if event == "did_delete":
+            self.discard(args[1])
+        elif event == "item_updated":
+            self.discard(args[0])
+        elif event in ("store_cleared", "store_loaded"):
+            self.clear()
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        if event in ("snippet_added", "snippet_updated", "snippet_deleted"):
+            self.discard(args[1])
+        elif event == "snippet_moved":
+            self.discard(args[2])
+        elif event == "folder_deleted":
+            self.discard(*args[1])
+        elif event in ("folder_renamed", "store_cleared"):
+            # Renames rewrite folder_path on every item in the folder
+            self.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, fragment count and size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._fragments)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def __repr__(self) -> str:
+        return f"ItemEncoder(entries={len(self._fragments)}, bytes={self._bytes})"
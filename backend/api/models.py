@@ -4,8 +4,8 @@ API models for SimpleCP REST API.
 Pydantic models for request/response validation.
 """
 
-from pydantic import BaseModel
-from typing import Optional, List, Any, Dict
+from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Dict, Literal
 
 
 class ClipboardItemResponse(BaseModel):
@@ -146,6 +146,8 @@ class SearchRequest(BaseModel):
     query: str
     include_history: bool = True
     include_snippets: bool = True
+    mode: Literal["exact", "fuzzy"] = "exact"
+    limit: int = Field(20, ge=1, le=500)  # Fuzzy mode only
 
 
 def clipboard_item_to_response(item: Any) -> ClipboardItemResponse:
@@ -153,7 +155,7 @@ def clipboard_item_to_response(item: Any) -> ClipboardItemResponse:
     return ClipboardItemResponse(
         clip_id=item.clip_id,
         content=item.content,
-        timestamp=item.timestamp.isoformat(),
+        timestamp=item.timestamp_iso,
         content_type=item.content_type,
         display_string=item.display_string,
         source_app=item.source_app,
@@ -0,0 +1,134 @@
+"""
+Pre-serialized response cache for hot SimpleCP read endpoints.
+
+Clients poll the same list endpoints over and over, and every poll
+used to rebuild the same JSON from the stores. ResponseCache keeps the
+encoded body (and, lazily, a gzipped copy) per endpoint and query,
+tagged with the store version it was built from. An entry is served
+only while the store is still at that version; store change events
+also drop a store's entries so stale bodies do not linger in memory.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+# Cache keys are (store, endpoint and query...) tuples
+CacheKey = Tuple[Hashable, ...]
+
+
+class CachedBody:
+    """One encoded response body plus the headers that go with it."""
+
+    __slots__ = ("version", "body", "headers", "_gzipped")
+
+    def __init__(self, version: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.version = version
+        self.body = body
+        self.headers = headers or {}
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        """Gzipped body, compressed on first use."""
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+
+class ResponseCache:
+    """
+    Bounded LRU of encoded bodies keyed by store, endpoint and query.
+
+    Register handle_history_event / handle_snippet_event as store
+    delegates so entries are dropped as soon as their store changes.
+    """
+
+    def __init__(self, max_entries: int = 128, gzip_min_bytes: int = 1024):
+        """
+        Args:
+            max_entries: Bodies kept across all endpoints (0 disables caching)
+            gzip_min_bytes: Smallest body served gzipped to clients that accept it (0 never)
+        """
+        self.max_entries = max_entries
+        self.gzip_min_bytes = gzip_min_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, CachedBody]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0, "gzip_served": 0}
+
+    def get(self, key: CacheKey, version: int) -> Optional[CachedBody]:
+        """Cached body for key if it was built at `version`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: CacheKey, entry: CachedBody) -> CachedBody:
+        """Store a freshly built body; returns it for serving."""
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return entry
+
+    def invalidate(self, store: str):
+        """Drop every entry built from `store`."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == store]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._stats["invalidations"] += len(stale)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def respond(
+        self, entry: CachedBody, headers: Dict[str, str], accept_encoding: Optional[str]
+    ) -> Response:
+        """Raw JSON response for an entry, gzipped when the client accepts it."""
+        headers = {**entry.headers, **headers}
+        body = entry.body
+        if self.gzip_min_bytes > 0 and len(body) >= self.gzip_min_bytes:
+            headers["Vary"] = "Accept-Encoding"
+            if accept_encoding and "gzip" in accept_encoding.lower():
+                body = entry.gzipped()
+                headers["Content-Encoding"] = "gzip"
+                with self._lock:
+                    self._stats["gzip_served"] += 1
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        if event != "will_insert":
+            self.invalidate("history")
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        if event != "folder_loaded":
+            self.invalidate("snippets")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, entry count and hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = sum(len(entry.body) for entry in self._entries.values())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(entries={len(self._entries)}, max={self.max_entries})"
@@ -4,13 +4,20 @@ FastAPI server for SimpleCP REST API.
 Main server configuration and startup.
 """
 import time
+from typing import Tuple
+from weakref import WeakKeyDictionary
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 
+from clipboard_backend import create_backend
 from clipboard_manager import ClipboardManager
+from api.change_feed import ChangeFeed
 from api.endpoints import create_router
+from api.executor import ManagerExecutor
+from api.item_encoder import ItemEncoder
+from api.response_cache import ResponseCache
 from settings import settings
 from logger import logger
 from monitoring import (
@@ -18,8 +25,34 @@ from monitoring import (
     track_api_request,
     capture_exception,
     get_monitoring_stats,
+    register_response_cache,
+    track_store_flush,
 )
 
+# Store listeners are attached once per manager and shared by every app
+# built on it, so repeated create_app calls don't pile up delegates
+StoreListeners = Tuple[ChangeFeed, ResponseCache, ItemEncoder]
+_store_listeners: "WeakKeyDictionary[ClipboardManager, StoreListeners]" = WeakKeyDictionary()
+
+
+def _attach_store_listeners(clipboard_manager: ClipboardManager) -> StoreListeners:
+    """Change feed, response cache and item encoder fed by the manager's stores."""
+    listeners = _store_listeners.get(clipboard_manager)
+    if listeners is None:
+        listeners = (
+            # Store changes pushed to /api/events subscribers
+            ChangeFeed(settings.change_feed_backlog, heartbeat=settings.change_feed_heartbeat),
+            # Encoded list bodies, reused until their store changes
+            ResponseCache(settings.response_cache_entries, settings.response_gzip_min_bytes),
+            # Per-item JSON fragments for list and search bodies
+            ItemEncoder(settings.item_fragment_cache_bytes),
+        )
+        for listener in listeners:
+            clipboard_manager.history_store.add_delegate(listener.handle_history_event)
+            clipboard_manager.snippet_store.add_delegate(listener.handle_snippet_event)
+        _store_listeners[clipboard_manager] = listeners
+    return listeners
+
 
 def create_app(clipboard_manager: ClipboardManager = None) -> FastAPI:
     """
@@ -125,13 +158,34 @@ def create_app(clipboard_manager: ClipboardManager = None) -> FastAPI:
 
     # Create clipboard manager if not provided
     if clipboard_manager is None:
-        clipboard_manager = ClipboardManager()
+        clipboard_manager = ClipboardManager(
+            save_delay=settings.save_delay_ms / 1000,
+            save_max_latency=settings.save_max_latency_ms / 1000,
+            compact_threshold=settings.journal_compact_bytes,
+            storage=settings.storage_backend,
+            snapshot_format=settings.snapshot_format,
+            blob_threshold=settings.blob_threshold_chars,
+            compression=settings.compression,
+            compress_threshold=settings.compress_threshold_chars,
+            clipboard=create_backend(settings.clipboard_backend),
+        )
+    clipboard_manager.persister.on_flush = track_store_flush
 
     # Store manager in app state
     app.state.clipboard_manager = clipboard_manager
 
+    # Blocking manager work runs off the event loop
+    executor = ManagerExecutor(settings.api_worker_threads)
+    app.state.executor = executor
+
+    feed, cache, encoder = _attach_store_listeners(clipboard_manager)
+    app.state.change_feed = feed
+    app.state.response_cache = cache
+    app.state.item_encoder = encoder
+    register_response_cache(cache)
+
     # Include API routes
-    router = create_router(clipboard_manager)
+    router = create_router(clipboard_manager, executor, feed, cache, encoder)
     app.include_router(router)
 
     @app.get("/")
@@ -150,7 +204,7 @@ def create_app(clipboard_manager: ClipboardManager = None) -> FastAPI:
         if not settings.health_check_enabled:
             return {"status": "disabled"}
 
-        stats = clipboard_manager.get_stats()
+        stats = await executor.read(clipboard_manager.get_stats)
         monitoring_stats = get_monitoring_stats()
 
         return {
@@ -158,6 +212,10 @@ def create_app(clipboard_manager: ClipboardManager = None) -> FastAPI:
             "version": settings.app_version,
             "environment": settings.environment,
             "clipboard_stats": stats,
+            "persistence": clipboard_manager.get_persistence_stats(),
+            "executor": executor.get_stats(),
+            "change_feed": feed.get_stats(),
+            "item_encoder": encoder.get_stats(),
             "monitoring": monitoring_stats,
         }
 
@@ -171,8 +229,10 @@ def create_app(clipboard_manager: ClipboardManager = None) -> FastAPI:
 
     @app.on_event("shutdown")
     async def shutdown_event():
-        """Log shutdown event."""
+        """Flush pending writes and log shutdown event."""
         logger.info("SimpleCP API shutting down")
+        executor.shutdown()
+        clipboard_manager.flush()
 
     return app
 
@@ -0,0 +1,350 @@
+"""
+Clipboard backends for SimpleCP.
+
+ClipboardManager reads and writes the system clipboard through a
+ClipboardBackend. pyperclip is the portable fallback, but on Linux it
+runs xclip/xsel (and on macOS pbpaste/pbcopy) once per call, so the
+daemon would fork a process on every poll. The long-lived backends avoid
+that:
+
+- PasteboardBackend: macOS NSPasteboard through pyobjc. Its change
+  count lets an unchanged clipboard be detected without reading it.
+- HelperProcessBackend: one persistent helper process (this module run
+  as a script) that owns a Tk clipboard connection and answers requests
+  over a pipe, one JSON line each way.
+- MemoryClipboard: in-process fake for headless tests and benchmarks.
+
+Running this module as a script serves a backend on stdin/stdout:
+    python clipboard_backend.py tk|memory
+"""
+
+import json
+import logging
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "pyperclip", "pasteboard", "helper", "memory")
+
+
+class ClipboardBackend:
+    """Read/write access to a clipboard."""
+
+    name = "base"
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {"reads": 0, "writes": 0, "errors": 0}
+
+    def read(self) -> str:
+        """Current clipboard text ("" when empty or not text)."""
+        raise NotImplementedError
+
+    def write(self, text: str):
+        """Replace the clipboard text."""
+        raise NotImplementedError
+
+    def change_count(self) -> Optional[int]:
+        """
+        Counter bumped on every clipboard change, or None when the
+        platform cannot tell (callers must then read and compare).
+        """
+        return None
+
+    def close(self):
+        """Release long-lived resources."""
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"backend": self.name, **self._stats}
+
+
+class PyperclipBackend(ClipboardBackend):
+    """pyperclip calls; spawns a helper tool per call on Linux and macOS."""
+
+    name = "pyperclip"
+
+    def read(self) -> str:
+        import pyperclip
+
+        self._count("reads")
+        return pyperclip.paste() or ""
+
+    def write(self, text: str):
+        import pyperclip
+
+        self._count("writes")
+        pyperclip.copy(text)
+
+
+class MemoryClipboard(ClipboardBackend):
+    """In-memory clipboard with a change counter, for tests and benchmarks."""
+
+    name = "memory"
+
+    def __init__(self, text: str = ""):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._text = text
+        self._changes = 0
+
+    def read(self) -> str:
+        self._count("reads")
+        with self._lock:
+            return self._text
+
+    def write(self, text: str):
+        self._count("writes")
+        with self._lock:
+            self._text = text
+            self._changes += 1
+
+    def change_count(self) -> Optional[int]:
+        with self._lock:
+            return self._changes
+
+
+class PasteboardBackend(ClipboardBackend):
+    """macOS general pasteboard via pyobjc (AppKit)."""
+
+    name = "pasteboard"
+
+    def __init__(self):
+        super().__init__()
+        from AppKit import NSPasteboard, NSPasteboardTypeString
+
+        self._pasteboard = NSPasteboard.generalPasteboard()
+        self._string_type = NSPasteboardTypeString
+
+    def read(self) -> str:
+        self._count("reads")
+        return self._pasteboard.stringForType_(self._string_type) or ""
+
+    def write(self, text: str):
+        self._count("writes")
+        self._pasteboard.clearContents()
+        self._pasteboard.setString_forType_(text, self._string_type)
+
+    def change_count(self) -> Optional[int]:
+        return int(self._pasteboard.changeCount())
+
+
+class HelperProcessBackend(ClipboardBackend):
+    """
+    Clipboard served by one long-lived helper process.
+
+    Requests are serialized under a lock; if the helper dies it is
+    restarted once per request before the error is raised.
+    """
+
+    name = "helper"
+
+    def __init__(self, kind: str = "tk", command: Optional[List[str]] = None):
+        """
+        Args:
+            kind: Backend the helper serves ("tk" for the X11/Wayland-via-Tk clipboard)
+            command: Helper command line (defaults to running this module)
+        """
+        super().__init__()
+        self.kind = kind
+        self.command = command or [sys.executable, __file__, kind]
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._started = False
+        self._stats["restarts"] = 0
+
+    def _start(self) -> subprocess.Popen:
+        self._stop()
+        if self._started:
+            logger.warning("Clipboard helper process exited; restarting")
+            self._count("restarts")
+        self._started = True
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="surrogatepass",
+        )
+        return self._process
+
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        line = json.dumps(message) + "\n"
+        with self._lock:
+            for attempt in range(2):
+                process = self._process
+                if process is None or process.poll() is not None:
+                    process = self._start()
+                try:
+                    process.stdin.write(line)
+                    process.stdin.flush()
+                    reply = process.stdout.readline()
+                except (BrokenPipeError, OSError):
+                    reply = ""
+                if reply:
+                    break
+                if attempt:
+                    self._count("errors")
+                    raise RuntimeError("Clipboard helper process exited")
+                self._stop()
+        response = json.loads(reply)
+        if "error" in response:
+            self._count("errors")
+            raise RuntimeError(f"Clipboard helper error: {response['error']}")
+        return response
+
+    def read(self) -> str:
+        self._count("reads")
+        return self._request({"op": "read"})["text"]
+
+    def write(self, text: str):
+        self._count("writes")
+        self._request({"op": "write", "text": text})
+
+    def change_count(self) -> Optional[int]:
+        if self.kind == "tk":
+            return None  # Tk has no change counter; skip the round trip
+        return self._request({"op": "count"}).get("count")
+
+    def _stop(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+
+class TkClipboard(ClipboardBackend):
+    """
+    Tk clipboard access. Tk is single-threaded and loses clipboard
+    ownership when its process exits, so it is only used inside the
+    helper process.
+    """
+
+    name = "tk"
+
+    def __init__(self):
+        super().__init__()
+        import tkinter
+
+        self._tkinter = tkinter
+        self.root = tkinter.Tk()
+        self.root.withdraw()
+
+    def read(self) -> str:
+        try:
+            return self.root.clipboard_get()
+        except self._tkinter.TclError:
+            return ""
+
+    def write(self, text: str):
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.root.update()
+
+
+def _handle(backend: ClipboardBackend, line: str) -> str:
+    """Answer one helper request line."""
+    try:
+        message = json.loads(line)
+        op = message["op"]
+        if op == "read":
+            response = {"text": backend.read()}
+        elif op == "write":
+            backend.write(message["text"])
+            response = {}
+        elif op == "count":
+            response = {"count": backend.change_count()}
+        else:
+            response = {"error": f"unknown op {op!r}"}
+    except Exception as e:
+        response = {"error": str(e)}
+    return json.dumps(response) + "\n"
+
+
+def serve(kind: str):
+    """Helper process main loop: answer requests until stdin closes."""
+    sys.stdin.reconfigure(encoding="utf-8", errors="surrogatepass")
+    sys.stdout.reconfigure(encoding="utf-8", errors="surrogatepass")
+    if kind != "tk":
+        backend = MemoryClipboard()
+        for line in sys.stdin:
+            sys.stdout.write(_handle(backend, line))
+            sys.stdout.flush()
+        return
+
+    try:
+        backend = TkClipboard()
+    except Exception as e:
+        # No display or no Tk: report it to the first request and exit
+        sys.stdin.readline()
+        sys.stdout.write(json.dumps({"error": f"Tk clipboard unavailable: {e}"}) + "\n")
+        sys.stdout.flush()
+        return
+    root = backend.root
+
+    # Run Tk's event loop so other applications can fetch text we own
+    def on_request(*_):
+        line = sys.stdin.readline()
+        if not line:
+            root.quit()
+            return
+        sys.stdout.write(_handle(backend, line))
+        sys.stdout.flush()
+
+    root.tk.createfilehandler(sys.stdin, backend._tkinter.READABLE, on_request)
+    root.mainloop()
+
+
+def create_backend(name: str = "auto") -> ClipboardBackend:
+    """
+    Build a clipboard backend by name.
+
+    "auto" picks the macOS pasteboard when pyobjc is installed, the Tk
+    helper process on Linux when a display is available, and pyperclip
+    otherwise.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown clipboard backend: {name}")
+    if name == "pyperclip":
+        return PyperclipBackend()
+    if name == "memory":
+        return MemoryClipboard()
+    if name == "pasteboard":
+        return PasteboardBackend()
+    if name == "helper":
+        return HelperProcessBackend()
+
+    if sys.platform == "darwin":
+        try:
+            return PasteboardBackend()
+        except ImportError:
+            logger.info("pyobjc not installed; using pyperclip for the clipboard")
+    elif sys.platform.startswith("linux"):
+        backend = HelperProcessBackend()
+        try:
+            backend.read()
+            return backend
+        except (RuntimeError, OSError, ValueError) as e:
+            backend.close()
+            logger.info(f"Clipboard helper unavailable ({e}); using pyperclip")
+    return PyperclipBackend()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else "tk")
@@ -1,30 +1,128 @@
 """ClipboardManager - Core backend service for clipboard management."""
-import pyperclip, json, os
+import heapq, os, threading
+from bisect import bisect_right
+from operator import itemgetter
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from clipboard_backend import ClipboardBackend, PyperclipBackend
+from stores.blob_store import BlobStore
 from stores.clipboard_item import ClipboardItem
+from stores.compression import METHODS, content_cache
 from stores.history_store import HistoryStore
 from stores.snippet_store import SnippetStore
+from stores.rwlock import ReadWriteLock
+from stores.write_behind import WriteBehindPersister
+from stores.journal import StoreJournal
+from stores.persistence import StorePersistence
+from stores.sqlite_storage import SQLiteStorage
 
 
 class ClipboardManager:
-    """Core clipboard manager with multi-store architecture."""
+    """
+    Core clipboard manager with multi-store architecture.
 
-    def __init__(self, data_dir: Optional[str] = None, max_history: int = 50, display_count: int = 10):
+    Thread safety: the clipboard monitor and the API threads share one
+    manager. Store mutations hold `lock` exclusively and stay in memory;
+    reads, and the reference copy at the start of save_stores, hold it
+    shared. Saves are scheduled after the exclusive hold is released and
+    serialize outside the lock, so neither serialization nor disk I/O runs
+    while writers or readers are locked out.
+    """
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        max_history: int = 50,
+        display_count: int = 10,
+        save_delay: float = 0.0,
+        save_max_latency: Optional[float] = None,
+        compact_threshold: int = 1024 * 1024,
+        storage: str = "json",
+        snapshot_format: str = "json",
+        blob_threshold: int = 64 * 1024,
+        compression: str = "none",
+        compress_threshold: int = 4096,
+        clipboard: Optional[ClipboardBackend] = None,
+    ):
+        """
+        Args:
+            data_dir: Directory for persisted stores
+            max_history: Maximum history items
+            display_count: History items shown directly
+            save_delay: Seconds of quiet before a write-behind save (0 saves on every change)
+            save_max_latency: Upper bound in seconds from first unsaved change to save
+            compact_threshold: Journal size in bytes that triggers a background snapshot
+            storage: "json" (snapshots + journal) or "sqlite" (row-level writes, FTS5 search)
+            snapshot_format: "json" (readable) or "binary" (compact, versioned) snapshot files
+            blob_threshold: Clips of at least this many characters go to the blob store (0 disables)
+            compression: "none", "zlib" or "lzma" for binary snapshots and large in-memory content
+            compress_threshold: Clips of at least this many characters are held compressed in memory
+            clipboard: System clipboard access (defaults to pyperclip)
+        """
         self.history_store = HistoryStore(max_items=max_history, display_count=display_count)
+        self.lock = ReadWriteLock()
         self.snippet_store = SnippetStore()
+        self.clipboard = clipboard or PyperclipBackend()
         self._current_clipboard = ""
+        # Backend change count last seen, and changes that happened between polls
+        self._clipboard_change_count: Optional[int] = None
+        self.missed_clipboard_changes = 0
         self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), "data")
         os.makedirs(self.data_dir, exist_ok=True)
-        self.history_file = os.path.join(self.data_dir, "history.json")
-        self.snippets_file = os.path.join(self.data_dir, "snippets.json")
+        if compression not in METHODS:
+            raise ValueError(f"Unknown compression method: {compression}")
+        self.compression = compression
+        self.compress_threshold = compress_threshold
         self.auto_save_enabled = True
+        # Large content is stored once on disk, named by digest
+        self.blob_store = BlobStore(os.path.join(self.data_dir, "blobs"))
+        self.blob_threshold = blob_threshold
+        self.snippet_store.content_hook = self._compact_content
+        # Mutations go to an append-only journal; snapshots are written on compaction
+        self.journal = StoreJournal(os.path.join(self.data_dir, "journal.jsonl"))
+        self.compact_threshold = compact_threshold
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self.database: Optional[SQLiteStorage] = None
+        if storage == "sqlite":
+            self.database = SQLiteStorage(os.path.join(self.data_dir, "simplecp.db"))
+        elif storage != "json":
+            raise ValueError(f"Unknown storage backend: {storage}")
+        self.persistence = StorePersistence(
+            self.data_dir,
+            self.history_store,
+            self.snippet_store,
+            self.lock,
+            self.journal,
+            self.blob_store,
+            database=self.database,
+            snapshot_format=snapshot_format,
+            compression=compression,
+            compact_content=(
+                self._compact_content if blob_threshold or compression != "none" else None
+            ),
+        )
+        self.history_file = self.persistence.history_file
+        self.snippets_file = self.persistence.snippets_file
+        self.persister = WriteBehindPersister(self._flush, save_delay, save_max_latency)
         self.load_stores()
+        if self.database is not None:
+            self.database.attach(self.history_store, self.snippet_store)
+        else:
+            self.history_store.add_delegate(self.journal.handle_history_event)
+            self.snippet_store.add_delegate(self.journal.handle_snippet_event)
 
     def check_clipboard(self) -> Optional[ClipboardItem]:
         """Check clipboard for changes and add to history if changed."""
         try:
-            current = pyperclip.paste()
+            count = self.clipboard.change_count()
+            if count is not None:
+                last, self._clipboard_change_count = self._clipboard_change_count, count
+                if count == last:
+                    return None
+                if last is not None and count - last > 1:
+                    self.missed_clipboard_changes += count - last - 1
+            current = self.clipboard.read()
             if current != self._current_clipboard and current.strip():
                 self._current_clipboard = current
                 return self.add_clip(current)
@@ -35,22 +133,23 @@ class ClipboardManager:
     def add_clip(self, content: str, source_app: Optional[str] = None) -> ClipboardItem:
         """Add clipboard item to history with automatic deduplication."""
         clip = ClipboardItem(content=content, source_app=source_app)
-        self.history_store.insert(clip)
-        if self.auto_save_enabled:
-            self.save_stores()
+        self._compact_content(clip)
+        with self.lock.write():
+            self.history_store.insert(clip)
+        self._schedule_save()
         return clip
 
     def copy_to_clipboard(self, clip_id: str) -> bool:
         """Copy item to system clipboard by ID."""
-        for item in self.history_store.items:
-            if item.clip_id == clip_id:
-                pyperclip.copy(item.content)
-                self._current_clipboard = item.content
-                return True
-        item = self.snippet_store.get_snippet_by_id(clip_id)
+        with self.lock.read():
+            item = self.history_store.get_item_by_id(clip_id) or self.snippet_store.get_snippet_by_id(
+                clip_id
+            )
         if item:
-            pyperclip.copy(item.content)
+            self.clipboard.write(item.content)
             self._current_clipboard = item.content
+            # Our own write is not a change to capture
+            self._clipboard_change_count = self.clipboard.change_count()
             return True
         return False
 
@@ -58,57 +157,75 @@ class ClipboardManager:
         self, clip_id: str, name: str, folder: str, tags: Optional[List[str]] = None
     ) -> Optional[ClipboardItem]:
         """Convert history item to snippet."""
-        for item in self.history_store.items:
-            if item.clip_id == clip_id:
-                snippet = item.make_snippet(name, folder, tags)
-                self.snippet_store.add_snippet(folder, snippet)
-                if self.auto_save_enabled:
-                    self.save_stores()
-                return snippet
-        return None
+        with self.lock.write():
+            item = self.history_store.get_item_by_id(clip_id)
+            if item is None:
+                return None
+            snippet = item.make_snippet(name, folder, tags)
+            self.snippet_store.add_snippet(folder, snippet)
+            # The history entry is the same object and now carries a name and tags
+            self.history_store.notify_item_updated(snippet)
+        self._schedule_save()
+        return snippet
 
     # History operations
     def get_recent_history(self) -> List[ClipboardItem]:
         """Get recent history items."""
-        return self.history_store.get_recent_items()
+        with self.lock.read():
+            return self.history_store.get_recent_items()
 
     def get_all_history(self, limit: Optional[int] = None) -> List[ClipboardItem]:
         """Get all history items."""
-        return self.history_store.get_items(limit)
+        with self.lock.read():
+            return self.history_store.get_items(limit)
+
+    def get_history_page(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[List[ClipboardItem], Optional[str]]:
+        """Keyset page of history after cursor `after`; returns (items, next_cursor)."""
+        with self.lock.read():
+            return self.history_store.get_page(after, limit)
 
     def get_history_folders(self) -> List[Dict[str, Any]]:
         """Get auto-generated history folder ranges."""
-        return self.history_store.get_auto_folders()
+        with self.lock.read():
+            return self.history_store.get_auto_folders()
 
     def clear_history(self):
         """Clear all clipboard history."""
-        self.history_store.clear()
-        if self.auto_save_enabled:
-            self.save_stores()
+        with self.lock.write():
+            self.history_store.clear()
+        self._schedule_save()
 
     def delete_history_item(self, clip_id: str) -> bool:
         """Delete specific history item by ID."""
-        for i, item in enumerate(self.history_store.items):
-            if item.clip_id == clip_id:
-                self.history_store.delete_item(i)
-                if self.auto_save_enabled:
-                    self.save_stores()
-                return True
-        return False
+        with self.lock.write():
+            deleted = self.history_store.delete_by_id(clip_id)
+        if deleted is None:
+            return False
+        self._schedule_save()
+        return True
 
     # Snippet operations
     def create_snippet_folder(self, folder_name: str) -> bool:
         """Create new snippet folder."""
-        result = self.snippet_store.create_folder(folder_name)
-        if result and self.auto_save_enabled:
-            self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.create_folder(folder_name)
+        if result:
+            self._schedule_save()
         return result
 
     def rename_snippet_folder(self, old_name: str, new_name: str) -> dict:
         """Rename snippet folder. Returns detailed result with success status and error info."""
-        result = self.snippet_store.rename_folder(old_name, new_name)
-        if result["success"] and self.auto_save_enabled:
-            self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.rename_folder(old_name, new_name)
+            if result["success"]:
+                # Snippets saved from history share the item; its folder changed too
+                renamed = self.snippet_store._sanitize_folder_name(new_name)
+                for item in self.snippet_store.get_folder_items(renamed):
+                    self.history_store.notify_item_updated(item)
+        if result["success"]:
+            self._schedule_save()
         return result
 
     def rename_snippet_folder_legacy(self, old_name: str, new_name: str) -> bool:
@@ -118,132 +235,280 @@ class ClipboardManager:
 
     def delete_snippet_folder(self, folder_name: str) -> bool:
         """Delete snippet folder."""
-        result = self.snippet_store.delete_folder(folder_name)
-        if result and self.auto_save_enabled:
-            self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.delete_folder(folder_name)
+        if result:
+            self._schedule_save()
         return result
 
     def get_snippet_folders(self) -> List[str]:
         """Get all snippet folder names."""
-        return self.snippet_store.get_folder_names()
+        with self.lock.read():
+            return self.snippet_store.get_folder_names()
 
     def get_folder_snippets(self, folder_name: str) -> List[ClipboardItem]:
         """Get all snippets in a folder."""
-        return self.snippet_store.get_folder_items(folder_name)
+        with self.lock.read():
+            return self.snippet_store.get_folder_items(folder_name)
 
     def get_all_snippets(self) -> Dict[str, List[ClipboardItem]]:
         """Get all snippets organized by folder."""
-        return self.snippet_store.get_all_snippets()
+        with self.lock.read():
+            return self.snippet_store.get_all_snippets()
+
+    def get_folder_snippets_page(
+        self, folder_name: str, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[List[ClipboardItem], Optional[str]]:
+        """Keyset page of a snippet folder; returns (items, next_cursor)."""
+        with self.lock.read():
+            return self.snippet_store.get_folder_page(folder_name, after, limit)
 
     def add_snippet_direct(self, content: str, name: str, folder: str, tags: Optional[List[str]] = None) -> ClipboardItem:
         if not content or not content.strip():
             raise ValueError("Content cannot be empty")
         snippet = ClipboardItem(content=content)
+        self._compact_content(snippet)
         snippet.make_snippet(name, folder, tags)
-        self.snippet_store.add_snippet(folder, snippet)
-        if self.auto_save_enabled: self.save_stores()
+        with self.lock.write():
+            self.snippet_store.add_snippet(folder, snippet)
+        self._schedule_save()
         return snippet
 
     def update_snippet(self, folder_name: str, clip_id: str, new_content: Optional[str] = None, new_name: Optional[str] = None, new_tags: Optional[List[str]] = None) -> bool:
-        result = self.snippet_store.update_snippet(folder_name, clip_id, new_content, new_name, new_tags)
-        if result and self.auto_save_enabled: self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.update_snippet(folder_name, clip_id, new_content, new_name, new_tags)
+            if result:
+                self.history_store.notify_item_updated(self.snippet_store.get_snippet_by_id(clip_id))
+        if result:
+            self._schedule_save()
         return result
 
     def delete_snippet(self, folder_name: str, clip_id: str) -> bool:
-        result = self.snippet_store.delete_snippet(folder_name, clip_id)
-        if result and self.auto_save_enabled: self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.delete_snippet(folder_name, clip_id)
+        if result:
+            self._schedule_save()
         return result
 
     def move_snippet(self, from_folder: str, to_folder: str, clip_id: str) -> bool:
-        result = self.snippet_store.move_snippet(from_folder, to_folder, clip_id)
-        if result and self.auto_save_enabled: self.save_stores()
+        with self.lock.write():
+            result = self.snippet_store.move_snippet(from_folder, to_folder, clip_id)
+            if result:
+                self.history_store.notify_item_updated(self.snippet_store.get_snippet_by_id(clip_id))
+        if result:
+            self._schedule_save()
         return result
 
     # Search operations
     def search_all(self, query: str) -> Dict[str, List[ClipboardItem]]:
         """Search across history and snippets."""
-        return {
-            "history": self.history_store.search(query),
-            "snippets": self.snippet_store.search(query),
-        }
+        with self.lock.read():
+            found = self.database.search(query) if self.database is not None else None
+            if found is not None:
+                history_ids, snippet_ids = found
+                return {
+                    "history": self._resolve(history_ids, self.history_store.get_item_by_id, query),
+                    "snippets": self._resolve(snippet_ids, self.snippet_store.get_snippet_by_id, query),
+                }
+            return {
+                "history": self.history_store.search(query),
+                "snippets": self.snippet_store.search(query),
+            }
+
+    def search_page(
+        self, query: str, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[Dict[str, List[ClipboardItem]], Optional[str]]:
+        """
+        Page through search_all results (history first, then snippets).
+
+        Cursors are opaque: the section plus the last item's store order
+        key (its rank, and for snippets its folder's sequence). The next
+        page starts at the first result ordered after that key, so the
+        cursor item may be deleted or re-copied between pages. Raises
+        KeyError for malformed cursors.
+        """
+        start_key = None if after is None else self._search_cursor_key(after)
+        with self.lock.read():
+            results = self.search_all(query)
+            history_key = self.history_store.order_key
+            snippet_key = self.snippet_store.order_key
+            entries = sorted(
+                [((0, history_key(item.clip_id)), "history", item) for item in results["history"]]
+                + [((1,) + snippet_key(item.clip_id), "snippets", item) for item in results["snippets"]],
+                key=itemgetter(0),
+            )
+        keys = [key for key, _, _ in entries]
+        start = 0 if start_key is None else bisect_right(keys, start_key)
+        stop = len(entries) if limit is None else start + limit
+        page: Dict[str, List[ClipboardItem]] = {"history": [], "snippets": []}
+        for _, section, item in entries[start:stop]:
+            page[section].append(item)
+        next_cursor = None
+        if stop < len(entries) and stop > start:
+            next_cursor = ":".join(map(str, keys[stop - 1]))
+        return page, next_cursor
+
+    @staticmethod
+    def _search_cursor_key(cursor: str) -> Tuple[int, ...]:
+        try:
+            key = tuple(int(part) for part in cursor.split(":"))
+        except ValueError:
+            raise KeyError(cursor) from None
+        if (key[0], len(key)) not in ((0, 2), (1, 3)):
+            raise KeyError(cursor)
+        return key
+
+    def search_fuzzy(self, query: str, limit: int = 20) -> Dict[str, List[ClipboardItem]]:
+        """Ranked, typo-tolerant search returning the best `limit` items overall."""
+        with self.lock.read():
+            candidates = [
+                (score, "history", item) for score, item in self.history_store.fuzzy_search(query, limit)
+            ] + [(score, "snippets", item) for score, item in self.snippet_store.fuzzy_search(query, limit)]
+        ranked = heapq.nlargest(limit, candidates, key=lambda entry: entry[0])
+        results: Dict[str, List[ClipboardItem]] = {"history": [], "snippets": []}
+        for _, source, item in ranked:
+            results[source].append(item)
+        return results
+
+    @staticmethod
+    def _resolve(ids: List[str], lookup, query: Optional[str] = None) -> List[ClipboardItem]:
+        """Map stored clip IDs to live items, verifying search matches."""
+        items = (lookup(clip_id) for clip_id in ids)
+        return [
+            item for item in items
+            if item is not None and (query is None or item.matches_search(query))
+        ]
 
     # Persistence operations
+    def _schedule_save(self):
+        """Mark stores dirty; the write-behind persister coalesces saves."""
+        if self.auto_save_enabled:
+            self.persister.mark_dirty()
+
+    def flush(self) -> bool:
+        """Write any pending changes now."""
+        return self.persister.flush()
+
+    def shutdown(self):
+        """Stop background persistence, flushing pending changes."""
+        self.persister.stop()
+        self.clipboard.close()
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout=30)
+        if self.database is None and self.journal.size:
+            # Fold the journal in so the next start can load folders lazily
+            self.save_stores()
+        elif self.database is not None:
+            self.persistence.collect_blobs()
+            self.database.close()
+
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """Write-behind flush counters, lag metrics and storage counters."""
+        stats = self.persister.get_stats()
+        if self.database is not None:
+            stats["storage"] = "sqlite"
+            stats["database"] = self.database.get_stats()
+        else:
+            stats["storage"] = "json"
+            stats["journal"] = self.journal.get_stats()
+        stats["blobs"] = self.blob_store.get_stats()
+        stats["content_cache"] = content_cache.get_stats()
+        stats["store_lock"] = self.lock.get_stats()
+        return stats
+
+    def _compact_content(self, item: ClipboardItem):
+        """Move large content to the blob store, or compress it in memory."""
+        if item.is_external:
+            return
+        length = item.content_length
+        if self.blob_threshold and length >= self.blob_threshold:
+            item.externalize(self.blob_store)
+        elif self.compression != "none" and length >= self.compress_threshold:
+            item.compress(self.compression)
+
+    def _flush(self):
+        """Commit SQLite writes, or append pending journal records and compact once large."""
+        if self.database is not None:
+            self.database.commit()
+            return
+        self.journal.flush()
+        if self.journal.size >= self.compact_threshold:
+            self._start_compaction()
+
+    def _start_compaction(self):
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(
+                target=self.save_stores, name="simplecp-compactor", daemon=True
+            )
+            self._compactor.start()
+
     def save_stores(self):
-        """Save all stores to disk."""
-        try:
-            history_data = [item.to_dict() for item in self.history_store.items]
-            with open(self.history_file, "w") as f:
-                json.dump(history_data, f, indent=2)
-            snippet_data = {
-                folder: [item.to_dict() for item in items]
-                for folder, items in self.snippet_store.folders.items()
-            }
-            with open(self.snippets_file, "w") as f:
-                json.dump(snippet_data, f, indent=2)
-            self.history_store.modified = False
-            self.snippet_store.modified = False
-        except Exception as e:
-            print(f"Error saving stores: {e}")
+        """Write changed stores to disk (SQLite commit, or snapshot plus journal compaction)."""
+        with self._compact_lock:
+            try:
+                self.persistence.save()
+            except Exception as e:
+                print(f"Error saving stores: {e}")
 
     def load_stores(self):
-        """Load all stores from disk."""
+        """Load persisted stores (SQLite, or JSON snapshot plus journal replay)."""
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, "r") as f:
-                    data = json.load(f)
-                self.history_store.items = [
-                    ClipboardItem.from_dict(item_data) for item_data in data
-                ]
-            if os.path.exists(self.snippets_file):
-                with open(self.snippets_file, "r") as f:
-                    data = json.load(f)
-                for folder_name, items_data in data.items():
-                    self.snippet_store.folders[folder_name] = [
-                        ClipboardItem.from_dict(item_data) for item_data in items_data
-                    ]
+            self.persistence.load()
         except Exception as e:
             print(f"Error loading stores: {e}")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get manager statistics."""
-        return {
-            "history_count": len(self.history_store),
-            "snippet_count": len(self.snippet_store),
-            "folder_count": len(self.snippet_store.folders),
-            "max_history": self.history_store.max_items,
-        }
+        with self.lock.read():
+            return {
+                "history_count": len(self.history_store),
+                "snippet_count": len(self.snippet_store),
+                "folder_count": len(self.snippet_store.folders),
+                "max_history": self.history_store.max_items,
+            }
+
+    def get_store_versions(self) -> Dict[str, int]:
+        """Change counters of the history and snippet stores (no locking needed)."""
+        return {"history": self.history_store.version, "snippets": self.snippet_store.version}
 
     def get_status(self) -> Dict[str, Any]:
         """Get monitoring status."""
-        return {
-            "monitoring": True,
-            "history_count": len(self.history_store),
-            "snippet_count": len(self.snippet_store),
-        }
+        with self.lock.read():
+            return {
+                "monitoring": True,
+                "history_count": len(self.history_store),
+                "snippet_count": len(self.snippet_store),
+            }
 
     def export_snippets(self) -> Dict[str, Any]:
         """Export all snippets."""
         all_snippets = []
-        for folder, items in self.snippet_store.folders.items():
-            for item in items:
-                all_snippets.append(item.to_dict())
+        with self.lock.read():
+            for items in self.snippet_store.get_all_snippets().values():
+                for item in items:
+                    all_snippets.append(item.to_dict(inline=True))
+            folder_count = len(self.snippet_store.folders)
         return {
             "version": "1.0",
             "export_date": datetime.now().isoformat(),
             "snippets": all_snippets,
-            "metadata": {"folder_count": len(self.snippet_store.folders)},
+            "metadata": {"folder_count": folder_count},
         }
 
     def import_snippets(self, import_data: Dict[str, Any]) -> bool:
         """Import snippets from export data."""
         try:
             snippets = import_data.get("snippets", [])
+            items = []
             for snippet_data in snippets:
                 item = ClipboardItem.from_dict(snippet_data)
-                folder = item.folder_path or "Imported"
-                self.snippet_store.add_snippet(folder, item)
-            if self.auto_save_enabled:
-                self.save_stores()
+                self._compact_content(item)
+                items.append(item)
+            with self.lock.write():
+                for item in items:
+                    self.snippet_store.add_snippet(item.folder_path or "Imported", item)
+            self._schedule_save()
             return True
         except Exception as e:
             print(f"Error importing snippets: {e}")
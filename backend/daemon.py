@@ -9,11 +9,18 @@ import time
 import signal
 import sys
 
+from clipboard_backend import create_backend
 from clipboard_manager import ClipboardManager
 from api.server import run_server
+from poll_scheduler import AdaptivePollScheduler
 from settings import settings
 from logger import logger
-from monitoring import capture_exception, track_clipboard_event
+from monitoring import (
+    capture_exception,
+    register_poll_scheduler,
+    track_clipboard_event,
+    track_clipboard_poll,
+)
 
 
 class SimpleCP_Daemon:
@@ -23,7 +30,9 @@ class SimpleCP_Daemon:
         self,
         host: str = None,
         port: int = None,
-        check_interval: int = None,
+        check_interval: float = None,
+        min_check_interval: float = None,
+        max_check_interval: float = None,
     ):
         """
         Initialize daemon.
@@ -31,12 +40,37 @@ class SimpleCP_Daemon:
         Args:
             host: API server host (defaults to settings.api_host)
             port: API server port (defaults to settings.api_port)
-            check_interval: Clipboard check interval in seconds (defaults to settings)
+            check_interval: Baseline clipboard check interval in seconds
+                (defaults to settings.clipboard_check_interval)
+            min_check_interval: Clipboard check interval in seconds right after a change
+                (defaults to settings.clipboard_poll_floor)
+            max_check_interval: Longest clipboard check interval in seconds, reached
+                when idle (defaults to settings.clipboard_poll_ceiling)
         """
-        self.clipboard_manager = ClipboardManager()
+        self.clipboard_manager = ClipboardManager(
+            save_delay=settings.save_delay_ms / 1000,
+            save_max_latency=settings.save_max_latency_ms / 1000,
+            compact_threshold=settings.journal_compact_bytes,
+            storage=settings.storage_backend,
+            snapshot_format=settings.snapshot_format,
+            blob_threshold=settings.blob_threshold_chars,
+            compression=settings.compression,
+            compress_threshold=settings.compress_threshold_chars,
+            clipboard=create_backend(settings.clipboard_backend),
+        )
         self.host = host or settings.api_host
         self.port = port or settings.api_port
         self.check_interval = check_interval or settings.clipboard_check_interval
+        # The baseline sits between the floor and the idle ceiling
+        floor = min(min_check_interval or settings.clipboard_poll_floor, self.check_interval)
+        ceiling = max(max_check_interval or settings.clipboard_poll_ceiling, self.check_interval)
+        self.poll_scheduler = AdaptivePollScheduler(
+            floor=floor,
+            ceiling=ceiling,
+            backoff=settings.clipboard_poll_backoff,
+        )
+        register_poll_scheduler(self.poll_scheduler)
+        self._stop_event = threading.Event()
         self.running = False
         self.clipboard_thread = None
         self.api_thread = None
@@ -44,9 +78,13 @@ class SimpleCP_Daemon:
     def clipboard_monitor_loop(self):
         """Background clipboard monitoring loop."""
         logger.info(
-            f"Clipboard monitoring started (checking every {self.check_interval}s)"
+            "Clipboard monitoring started (checking every "
+            f"{self.poll_scheduler.floor}-{self.poll_scheduler.ceiling}s, adaptive)"
         )
         while self.running:
+            new_item = None
+            missed = self.clipboard_manager.missed_clipboard_changes
+            start = time.perf_counter()
             try:
                 new_item = self.clipboard_manager.check_clipboard()
                 if new_item:
@@ -60,7 +98,11 @@ class SimpleCP_Daemon:
                 logger.error(f"Error in clipboard monitor: {e}", exc_info=True)
                 capture_exception(e, context={"component": "clipboard_monitor"})
 
-            time.sleep(self.check_interval)
+            cost = time.perf_counter() - start
+            track_clipboard_poll(cost * 1000)
+            missed = self.clipboard_manager.missed_clipboard_changes - missed
+            delay = self.poll_scheduler.record(new_item is not None, cost, missed)
+            self._stop_event.wait(delay)
 
     def start_api_server(self):
         """Start API server in thread."""
@@ -118,6 +160,9 @@ class SimpleCP_Daemon:
         """Stop daemon gracefully."""
         logger.info("Stopping SimpleCP daemon...")
         self.running = False
+        self._stop_event.set()
+        logger.info(f"Clipboard polling: {self.poll_scheduler.get_stats()}")
+        logger.info(f"Clipboard backend: {self.clipboard_manager.clipboard.get_stats()}")
 
         # Wait for threads to finish
         if self.clipboard_thread and self.clipboard_thread.is_alive():
@@ -125,7 +170,8 @@ class SimpleCP_Daemon:
 
         logger.info("Saving data...")
         try:
-            self.clipboard_manager.save_stores()
+            # Stops the write-behind thread and flushes anything pending
+            self.clipboard_manager.shutdown()
             logger.info("Data saved successfully")
         except Exception as e:
             logger.error(f"Error saving data: {e}", exc_info=True)
@@ -157,9 +203,21 @@ def main():
     )
     parser.add_argument(
         "--interval",
-        type=int,
+        type=float,
+        default=None,
+        help=f"Baseline clipboard check interval in seconds (default: {settings.clipboard_check_interval})",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=None,
+        help=f"Check interval right after a change in seconds (default: {settings.clipboard_poll_floor})",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
         default=None,
-        help=f"Clipboard check interval in seconds (default: {settings.clipboard_check_interval})",
+        help=f"Longest check interval when idle in seconds (default: {settings.clipboard_poll_ceiling})",
     )
 
     args = parser.parse_args()
@@ -170,7 +228,11 @@ def main():
 
     # Create and start daemon
     daemon = SimpleCP_Daemon(
-        host=args.host, port=args.port, check_interval=args.interval
+        host=args.host,
+        port=args.port,
+        check_interval=args.interval,
+        min_check_interval=args.min_interval,
+        max_check_interval=args.max_interval,
     )
 
     daemon.start()
@@ -89,6 +89,10 @@ class UsageAnalytics:
 # Global instances
 performance_tracker = PerformanceTracker()
 usage_analytics = UsageAnalytics()
+# Clipboard poll scheduler of the running daemon, if any
+_poll_scheduler = None
+# Response cache of the running API server, if any
+_response_cache = None
 
 
 def initialize_sentry():
@@ -217,6 +221,30 @@ def track_clipboard_event(event_type: str, **kwargs):
         usage_analytics.track_event("clipboard_events", clipboard_event_type=event_type, **kwargs)
 
 
+def track_store_flush(lag_ms: float):
+    """Track write-behind flush lag (first unsaved change -> data on disk)."""
+    if settings.enable_performance_tracking:
+        performance_tracker.record("store_flush_lag", lag_ms)
+
+
+def track_clipboard_poll(duration_ms: float):
+    """Track the cost of one clipboard check."""
+    if settings.enable_performance_tracking:
+        performance_tracker.record("clipboard_poll", duration_ms)
+
+
+def register_poll_scheduler(scheduler: Any):
+    """Report the daemon's poll scheduler stats in get_monitoring_stats()."""
+    global _poll_scheduler
+    _poll_scheduler = scheduler
+
+
+def register_response_cache(cache: Any):
+    """Report the API response cache's hit/miss counters in get_monitoring_stats()."""
+    global _response_cache
+    _response_cache = cache
+
+
 def capture_exception(error: Exception, context: Optional[dict] = None):
     """Capture exception to Sentry and logs."""
     logger.error(f"Exception captured: {str(error)}", exc_info=True, extra=context or {})
@@ -254,9 +282,14 @@ def add_breadcrumb(message: str, category: str = "default", level: str = "info",
 
 def get_monitoring_stats() -> dict:
     """Get all monitoring statistics."""
-    return {
+    stats = {
         "performance": performance_tracker.get_stats(),
         "usage": usage_analytics.get_stats(),
         "sentry_enabled": settings.enable_sentry,
         "environment": settings.environment,
     }
+    if _poll_scheduler is not None:
+        stats["clipboard_polling"] = _poll_scheduler.get_stats()
+    if _response_cache is not None:
+        stats["response_cache"] = _response_cache.get_stats()
+    return stats
@@ -0,0 +1,80 @@
+"""
+Adaptive clipboard polling for SimpleCP.
+
+The daemon asks the scheduler how long to wait before the next
+clipboard check. Right after a change it polls at the floor interval,
+so bursts of copies are caught; each idle poll multiplies the interval
+by the backoff factor up to the ceiling, so an idle clipboard costs
+few checks.
+"""
+
+import threading
+from typing import Any, Dict
+
+
+class AdaptivePollScheduler:
+    """
+    Exponential-backoff poll interval with capture and cost metrics.
+
+    Metrics:
+        polls: clipboard checks made
+        captured: checks that found a new clipboard value
+        late_captures: captures made after backing off past the floor
+            (an intermediate copy could have been overwritten unseen)
+        missed: changes known to have been skipped, when the clipboard
+            backend can tell (e.g. from a change counter)
+        avg_poll_ms / max_poll_ms: time spent inside a check
+    """
+
+    def __init__(self, floor: float = 0.1, ceiling: float = 1.0, backoff: float = 2.0):
+        """
+        Args:
+            floor: Seconds between checks right after a change
+            ceiling: Maximum seconds between checks when idle
+            backoff: Interval multiplier applied after each idle check
+        """
+        if floor <= 0 or ceiling < floor or backoff < 1:
+            raise ValueError("Poll intervals need 0 < floor <= ceiling and backoff >= 1")
+        self.floor = floor
+        self.ceiling = ceiling
+        self.backoff = backoff
+        self.interval = floor
+        self._lock = threading.Lock()
+        self._polls = 0
+        self._captured = 0
+        self._late = 0
+        self._missed = 0
+        self._poll_seconds = 0.0
+        self._max_poll_seconds = 0.0
+
+    def record(self, changed: bool, cost: float, missed: int = 0) -> float:
+        """Account for one check taking `cost` seconds; returns the delay before the next."""
+        with self._lock:
+            self._polls += 1
+            self._poll_seconds += cost
+            self._max_poll_seconds = max(self._max_poll_seconds, cost)
+            self._missed += missed
+            if changed:
+                self._captured += 1
+                if self.interval > self.floor:
+                    self._late += 1
+                self.interval = self.floor
+            else:
+                self.interval = min(self.ceiling, self.interval * self.backoff)
+            return self.interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Capture counters, poll cost and the current interval."""
+        with self._lock:
+            polls = self._polls
+            return {
+                "polls": polls,
+                "captured": self._captured,
+                "late_captures": self._late,
+                "missed": self._missed,
+                "avg_poll_ms": round(self._poll_seconds * 1000 / polls, 3) if polls else 0.0,
+                "max_poll_ms": round(self._max_poll_seconds * 1000, 3),
+                "interval_ms": round(self.interval * 1000, 1),
+                "floor_ms": round(self.floor * 1000, 1),
+                "ceiling_ms": round(self.ceiling * 1000, 1),
+            }
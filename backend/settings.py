@@ -22,15 +22,33 @@ class Settings(BaseSettings):
     api_host: str = "127.0.0.1"
     api_port: int = 8000
     api_reload: bool = False  # Auto-reload for development
+    api_worker_threads: int = 4  # Threads for blocking reads (mutations use one more)
+    change_feed_backlog: int = 1000  # /api/events: changes kept for clients resuming
+    change_feed_heartbeat: float = 15.0  # /api/events: seconds of silence before a keep-alive
+    response_cache_entries: int = 128  # Encoded list responses kept per server (0 disables)
+    response_gzip_min_bytes: int = 1024  # Gzip cached responses at least this large (0 never)
+    item_fragment_cache_bytes: int = 8388608  # Item JSON kept for list/search bodies (0 disables)
 
     # Clipboard Configuration
-    clipboard_check_interval: int = 1  # seconds
+    clipboard_check_interval: float = 1.0  # seconds; baseline poll interval
+    clipboard_poll_floor: float = 0.1  # seconds; poll interval right after a change
+    clipboard_poll_ceiling: float = 5.0  # seconds; longest poll interval once idle
+    clipboard_poll_backoff: float = 2.0  # idle interval multiplier per unchanged poll
+    clipboard_backend: str = "auto"  # auto, pasteboard (macOS), helper (Linux/Tk), pyperclip
     max_history_items: int = 50
     display_count: int = 10
     display_length: int = 50
 
     # Data Storage
     data_dir: str = "./data"
+    storage_backend: str = "json"  # json (snapshots + journal) or sqlite
+    snapshot_format: str = "json"  # json (readable) or binary (compact, versioned; opt-in)
+    blob_threshold_chars: int = 65536  # clips this large are stored once on disk (0 disables)
+    compression: str = "none"  # none, zlib or lzma for binary snapshots and large clips in memory
+    compress_threshold_chars: int = 4096  # clips this large are kept compressed in memory
+    save_delay_ms: int = 500  # Write-behind: quiet period before saving
+    save_max_latency_ms: int = 5000  # Write-behind: max delay after first change
+    journal_compact_bytes: int = 1048576  # Snapshot + truncate journal past this size
 
     # Monitoring & Error Tracking
     sentry_dsn: Optional[str] = None  # Set via SENTRY_DSN env var
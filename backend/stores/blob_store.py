@@ -0,0 +1,154 @@
+"""
+BlobStore for SimpleCP.
+
+Content-addressed on-disk storage for large clip content. Each blob is
+a UTF-8 file named by the clip's content digest, so identical content
+in history and snippets is stored once. Items keep a BlobRef (digest,
+length and a short preview) instead of the content; the full text is
+read back through a read-only memory map only when it is needed.
+
+Blobs are written atomically before any snapshot or journal record
+refers to them. Unreferenced blobs are removed by collect(), which
+keeps anything written or re-referenced since the collection started.
+"""
+
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Characters kept in memory for display and search
+PREVIEW_CHARS = 512
+# Slack for coarse filesystem timestamps when comparing mtimes in collect()
+MTIME_SLACK_SECONDS = 2.0
+
+
+class BlobRef:
+    """In-memory handle on a stored blob."""
+
+    __slots__ = ("store", "digest", "length", "preview")
+
+    def __init__(self, store: "BlobStore", digest: str, length: int, preview: str):
+        self.store = store
+        self.digest = digest
+        self.length = length
+        self.preview = preview
+
+    def read(self) -> str:
+        """Full content of the blob."""
+        return self.store.read(self.digest)
+
+    def __repr__(self) -> str:
+        return f"BlobRef(digest='{self.digest}', length={self.length})"
+
+
+class BlobStore:
+    """Digest-named blob files under a directory, fanned out by prefix."""
+
+    def __init__(self, path: str, preview_chars: int = PREVIEW_CHARS):
+        self.path = path
+        self.preview_chars = preview_chars
+        self._lock = threading.Lock()
+        # Makes "is it stale?" plus removal atomic against reuse in put()
+        self._gc_lock = threading.Lock()
+        self._stats = {
+            "blobs_written": 0,
+            "bytes_written": 0,
+            "blobs_reused": 0,
+            "reads": 0,
+            "bytes_read": 0,
+            "collected": 0,
+        }
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], digest)
+
+    def put(self, content: str, digest: str) -> BlobRef:
+        """Store content under digest (once) and return a reference."""
+        path = self.path_for(digest)
+        with self._gc_lock:
+            try:
+                # Refresh mtime so a collection already in progress keeps it
+                os.utime(path)
+                reused = True
+            except FileNotFoundError:
+                reused = False
+        if reused:
+            self._count("blobs_reused")
+        else:
+            data = content.encode("utf-8", "surrogatepass")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._count("blobs_written")
+            self._count("bytes_written", len(data))
+        return self.ref(digest, len(content), content[: self.preview_chars])
+
+    def ref(self, digest: str, length: int, preview: str) -> BlobRef:
+        """Reference to an already stored blob (used when loading)."""
+        return BlobRef(self, digest, length, preview)
+
+    def read(self, digest: str) -> str:
+        """Decode a blob straight from a read-only memory map."""
+        with open(self.path_for(digest), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                content = ""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    content = str(mapped, "utf-8", "surrogatepass")
+        self._count("reads")
+        self._count("bytes_read", size)
+        return content
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def collect(self, live: Iterable[str], started: Optional[float] = None) -> int:
+        """
+        Delete blobs whose digest is not in live.
+
+        Blobs modified at or after `started` (default: now), less a small
+        slack for coarse filesystem clocks, are kept, so content stored
+        while the live set was being gathered survives.
+        """
+        started = (time.time() if started is None else started) - MTIME_SLACK_SECONDS
+        live = set(live)
+        removed = 0
+        if not os.path.isdir(self.path):
+            return 0
+        for prefix in os.listdir(self.path):
+            directory = os.path.join(self.path, prefix)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name in live:
+                    continue
+                path = os.path.join(directory, name)
+                with self._gc_lock:
+                    try:
+                        if os.path.getmtime(path) >= started:
+                            continue
+                        os.remove(path)
+                        removed += 1
+                    except OSError as e:
+                        logger.warning(f"Could not collect blob {name}: {e}")
+        self._count("collected", removed)
+        return removed
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Write, reuse, read and collection counters."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,244 @@
+"""
+ClipList for SimpleCP.
+
+Ordered container of clipboard items keyed by clip_id.
+A doubly linked list plus an ID map gives O(1) insert-at-front,
+move-to-front, delete-by-id and eviction from the tail. Each node also
+carries a rank that increases from front to back, which page cursors
+compare against so deleting or moving the cursor item never breaks a walk.
+"""
+
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from stores.clipboard_item import ClipboardItem
+
+# Gap between the ranks of items added at either end; a middle insert
+# takes the midpoint of its neighbours and renumbers only when none is left
+RANK_STEP = 1 << 20
+
+
+class _Node:
+    """Linked list node holding one item."""
+
+    __slots__ = ("item", "prev", "next", "rank")
+
+    def __init__(self, item: Optional[ClipboardItem]):
+        self.item = item
+        self.rank = 0
+        self.prev: "_Node" = self
+        self.next: "_Node" = self
+
+
+class ClipList:
+    """
+    Ordered, clip_id-keyed item container.
+
+    Positional access (item_at, slice) walks from the nearer end, so
+    reading the first N items costs O(N) regardless of total size.
+    """
+
+    def __init__(self, items: Optional[List[ClipboardItem]] = None):
+        self._head = _Node(None)  # Sentinel: head.next is first, head.prev is last
+        self._nodes: Dict[str, _Node] = {}
+        for item in items or []:
+            self.push_back(item)
+
+    def _link_after(self, anchor: _Node, item: ClipboardItem):
+        existing = self._nodes.get(item.clip_id)
+        if existing is not None:
+            # Keys are unique; re-adding an ID replaces the old entry
+            if existing is anchor:
+                anchor = existing.prev
+            self._unlink(existing)
+        node = _Node(item)
+        node.prev = anchor
+        node.next = anchor.next
+        anchor.next.prev = node
+        anchor.next = node
+        self._nodes[item.clip_id] = node
+        self._rank(node)
+
+    def _rank(self, node: _Node):
+        """Give a freshly linked node a rank between its neighbours."""
+        prev, nxt = node.prev, node.next
+        if prev is self._head and nxt is self._head:
+            node.rank = 0
+        elif prev is self._head:
+            node.rank = nxt.rank - RANK_STEP
+        elif nxt is self._head:
+            node.rank = prev.rank + RANK_STEP
+        else:
+            node.rank = (prev.rank + nxt.rank) // 2
+            if node.rank == prev.rank:
+                self._renumber()
+
+    def _renumber(self):
+        # Outstanding cursors may skip or repeat items across a renumber
+        node = self._head.next
+        rank = 0
+        while node is not self._head:
+            node.rank = rank
+            rank += RANK_STEP
+            node = node.next
+
+    @staticmethod
+    def _unlink(node: _Node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _node_at(self, index: int) -> _Node:
+        size = len(self._nodes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ClipList index out of range")
+        if index < size // 2:
+            node = self._head.next
+            for _ in range(index):
+                node = node.next
+        else:
+            node = self._head.prev
+            for _ in range(size - 1 - index):
+                node = node.prev
+        return node
+
+    def push_front(self, item: ClipboardItem):
+        """Insert item at the front."""
+        self._link_after(self._head, item)
+
+    def push_back(self, item: ClipboardItem):
+        """Append item at the back."""
+        self._link_after(self._head.prev, item)
+
+    def insert(self, index: int, item: ClipboardItem):
+        """Insert item at position (O(1) at either end)."""
+        if index <= 0:
+            self.push_front(item)
+        elif index >= len(self._nodes):
+            self.push_back(item)
+        else:
+            self._link_after(self._node_at(index).prev, item)
+
+    def move_to_front(self, clip_id: str) -> Optional[ClipboardItem]:
+        """Move item with clip_id to the front."""
+        node = self._nodes.get(clip_id)
+        if node is None:
+            return None
+        if self._head.next is not node:
+            self._unlink(node)
+            node.prev = self._head
+            node.next = self._head.next
+            self._head.next.prev = node
+            self._head.next = node
+            node.rank = node.next.rank - RANK_STEP
+        return node.item
+
+    def remove(self, clip_id: str) -> Optional[ClipboardItem]:
+        """Remove and return item with clip_id."""
+        node = self._nodes.pop(clip_id, None)
+        if node is None:
+            return None
+        self._unlink(node)
+        return node.item
+
+    def pop_back(self) -> Optional[ClipboardItem]:
+        """Remove and return the last item."""
+        if not self._nodes:
+            return None
+        return self.remove(self._head.prev.item.clip_id)
+
+    def get(self, clip_id: str) -> Optional[ClipboardItem]:
+        """Get item by clip_id."""
+        node = self._nodes.get(clip_id)
+        return None if node is None else node.item
+
+    def rank(self, clip_id: str) -> int:
+        """Rank of clip_id; ranks increase from front to back."""
+        return self._nodes[clip_id].rank
+
+    def item_at(self, index: int) -> ClipboardItem:
+        """Get item at position (supports negative indexes)."""
+        return self._node_at(index).item
+
+    def index_of(self, clip_id: str) -> int:
+        """Position of clip_id, or -1. O(n); avoid on hot paths."""
+        if clip_id not in self._nodes:
+            return -1
+        for i, item in enumerate(self):
+            if item.clip_id == clip_id:
+                return i
+        return -1
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> List[ClipboardItem]:
+        """Items in [start, stop), walking only as far as needed."""
+        return list(islice(self, start, stop))
+
+    def page(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[List[ClipboardItem], Optional[str]]:
+        """
+        Keyset page of items following cursor `after` (from the front if None).
+
+        Cursors are "<rank>:<clip_id>". Resuming compares ranks rather than
+        looking the item up, so a cursor item that was deleted or moved to
+        the front since still continues where the previous page ended.
+        Cost is O(limit) while the cursor item is in place.
+
+        Returns:
+            (items, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            KeyError: if `after` is not a cursor
+        """
+        node = self._head.next if after is None else self._resume(after)
+        items: List[ClipboardItem] = []
+        while node is not self._head and (limit is None or len(items) < limit):
+            items.append(node.item)
+            node = node.next
+        if node is self._head or not items:
+            return items, None
+        last = node.prev
+        return items, f"{last.rank}:{last.item.clip_id}"
+
+    def _resume(self, cursor: str) -> _Node:
+        """First node ranked after cursor."""
+        rank_text, _, clip_id = cursor.partition(":")
+        try:
+            rank = int(rank_text)
+        except ValueError:
+            raise KeyError(cursor) from None
+        node = self._nodes.get(clip_id)
+        if node is not None and node.rank == rank:
+            return node.next
+        # The cursor item is gone or has moved: seek by rank from the nearer end
+        first, last = self._head.next, self._head.prev
+        if rank - first.rank <= last.rank - rank:
+            node = first
+            while node is not self._head and node.rank <= rank:
+                node = node.next
+            return node
+        node = last
+        while node is not self._head and node.rank > rank:
+            node = node.prev
+        return node.next
+
+    def clear(self):
+        """Remove all items."""
+        self._head.next = self._head.prev = self._head
+        self._nodes.clear()
+
+    def __iter__(self) -> Iterator[ClipboardItem]:
+        node = self._head.next
+        while node is not self._head:
+            next_node = node.next
+            yield node.item
+            node = next_node
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, clip_id: object) -> bool:
+        return clip_id in self._nodes
+
+    def __repr__(self) -> str:
+        return f"ClipList(items={len(self._nodes)})"
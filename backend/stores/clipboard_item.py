@@ -6,9 +6,30 @@ Enhanced with Flycut patterns for robust clipboard management.
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 import hashlib
 import re
+import sys
+
+from stores.blob_store import BlobStore
+from stores.compression import CompressedText
+from stores.content_classifier import classify_content
+
+# Shared by every item without tags
+_NO_TAGS: Tuple[str, ...] = ()
+_NON_SPACE = re.compile(r"\S")
+
+
+def content_digest(content: str) -> str:
+    """Return a stable hex digest of clip content (used as dedup key)."""
+    return hashlib.blake2b(
+        content.encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern low-cardinality labels so items share one copy."""
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class ClipboardItem:
@@ -30,9 +51,43 @@ class ClipboardItem:
         has_name: Whether this is a named snippet
         snippet_name: Name of the snippet
         folder_path: Folder containing this snippet
-        tags: List of tags for organization
+        tags: Tuple of tags for organization
+
+    Items are kept compact for large histories: attributes live in
+    __slots__, the timestamp is held as epoch seconds, labels are
+    interned, untagged items share one empty tuple and the display
+    string is derived on read from a bounded prefix rather than stored
+    (compressed items keep theirs, so listing them never inflates).
+
+    Items loaded with from_dict hydrate lazily: the persisted timestamp
+    string is parsed, and the content digest computed, only when first
+    read.
+
+    Large content can be moved to a BlobStore with externalize(); the
+    item then keeps only a preview, the length and the digest, and
+    reads the content back from disk when `content` is accessed.
+    Display and search use the preview. Content can instead be kept
+    compressed in memory with compress().
     """
 
+    __slots__ = (
+        "_content",
+        "_blob",
+        "_display",
+        "_epoch",
+        "_timestamp_raw",
+        "source_app",
+        "item_type",
+        "display_length",
+        "content_type",
+        "_content_digest",
+        "clip_id",
+        "has_name",
+        "snippet_name",
+        "_folder_path",
+        "_tags",
+    )
+
     def __init__(
         self,
         content: str,
@@ -45,13 +100,16 @@ class ClipboardItem:
     ):
         self.content = content
         self.timestamp = timestamp or datetime.now()
-        self.source_app = source_app
+        self.source_app = _intern(source_app)
         self.item_type = item_type
 
+        # Content digest for O(1) deduplication; also seeds the clip ID
+        # and keys the content-type cache
+        self._content_digest = content_digest(content)
+
         # Display properties (from Flycut)
         self.display_length = display_length
-        self.content_type = content_type or self._detect_content_type()
-        self.display_string = self._create_display_string()
+        self.content_type = _intern(content_type) or self._detect_content_type()
 
         # Unique ID for tracking
         self.clip_id = clip_id or self._generate_id()
@@ -59,85 +117,178 @@ class ClipboardItem:
         # Snippet properties (from Flycut's clipHasName pattern)
         self.has_name = False
         self.snippet_name: Optional[str] = None
-        self.folder_path: Optional[str] = None
-        self.tags: List[str] = []
+        self._folder_path: Optional[str] = None
+        self._tags = _NO_TAGS
+
+    @property
+    def content(self) -> str:
+        """Full text (read from the blob store, or decompressed, as needed)."""
+        if self._blob is not None:
+            return self._blob.read()
+        content = self._content
+        if content.__class__ is CompressedText:
+            return content.text()
+        return content
+
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+        self._blob = None
+        self._content_digest = None
+        self._display = None
+
+    @property
+    def is_external(self) -> bool:
+        """Whether content lives in a blob store rather than in memory."""
+        return self._blob is not None
+
+    @property
+    def is_compressed(self) -> bool:
+        """Whether content is held compressed in memory."""
+        return self._content.__class__ is CompressedText
+
+    @property
+    def content_length(self) -> int:
+        """Length of content in characters, without reading or inflating it."""
+        if self._blob is not None:
+            return self._blob.length
+        content = self._content
+        if content.__class__ is CompressedText:
+            return content.length
+        return len(content)
+
+    @property
+    def search_text(self) -> str:
+        """
+        Text held in memory: the content, or its preview when externalized.
+
+        Display and persistence use it; search and indexing read the
+        full content.
+        """
+        if self._blob is None:
+            return self.content
+        return self._blob.preview
+
+    def externalize(self, blobs: BlobStore):
+        """Move content into blobs, keeping only a reference in memory."""
+        if self._blob is None:
+            digest = self.content_digest
+            self._blob = blobs.put(self.content, digest)
+            self._content = None
+            self._content_digest = digest
+
+    def compress(self, method: str = "zlib"):
+        """Hold content compressed in memory; it is inflated on access."""
+        if self._blob is None and self._content.__class__ is str:
+            self._display = self._create_display_string()
+            self._content = CompressedText.from_text(self._content, self.content_digest, method)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time (parsed from the persisted string on first read)."""
+        epoch = self._epoch
+        if epoch is None:
+            raw = self._timestamp_raw
+            if raw is None:
+                # Another reader hydrated it between the two loads
+                return datetime.fromtimestamp(self._epoch)
+            parsed = datetime.fromisoformat(raw)
+            if parsed.tzinfo is not None:
+                return parsed  # aware values keep their original string
+            self.timestamp = parsed
+            epoch = self._epoch
+        return datetime.fromtimestamp(epoch)
+
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        if value.tzinfo is None:
+            self._epoch = value.timestamp()
+            self._timestamp_raw = None
+        else:
+            self._epoch = None
+            self._timestamp_raw = value.isoformat()
+
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO timestamp, without parsing a persisted value."""
+        epoch = self._epoch
+        if epoch is None:
+            raw = self._timestamp_raw
+            if raw is not None:
+                return raw
+            epoch = self._epoch  # hydrated concurrently
+        return datetime.fromtimestamp(epoch).isoformat()
+
+    @property
+    def display_string(self) -> str:
+        """Processed string for UI display (derived from content on read)."""
+        if self._display is not None:
+            return self._display
+        display = self._create_display_string()
+        if self.is_compressed:
+            self._display = display
+        return display
+
+    @property
+    def content_digest(self) -> str:
+        """Digest of content (hashed on first read)."""
+        if self._content_digest is None:
+            self._content_digest = content_digest(self.content)
+        return self._content_digest
+
+    @property
+    def folder_path(self) -> Optional[str]:
+        """Folder containing this snippet."""
+        return self._folder_path
+
+    @folder_path.setter
+    def folder_path(self, value: Optional[str]):
+        self._folder_path = _intern(value)
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        """Tags for organization."""
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Optional[Sequence[str]]):
+        self._tags = tuple(value) if value else _NO_TAGS
+
+    @property
+    def is_hydrated(self) -> bool:
+        """Whether the timestamp is parsed and the digest computed."""
+        return self._epoch is not None and self._content_digest is not None
 
     def _detect_content_type(self) -> str:
-        """Detect content type with enhanced auto-categorization."""
-        content = self.content.strip()
-
-        # URL detection (enhanced)
-        if re.match(r"^https?://", content) or re.match(r"^www\.", content):
-            return "url"
-
-        # Email detection (enhanced)
-        if re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", content):
-            return "email"
-
-        # JSON detection
-        if (content.startswith("{") and content.endswith("}")) or (
-            content.startswith("[") and content.endswith("]")
-        ):
-            try:
-                import json
-
-                json.loads(content)
-                return "json"
-            except Exception:
-                pass
-
-        # SQL detection
-        sql_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP"]
-        if any(kw in content.upper() for kw in sql_keywords):
-            return "sql"
-
-        # Shell command detection
-        if content.startswith("$") or content.startswith("sudo "):
-            return "shell"
-
-        # Code detection (enhanced heuristics)
-        code_indicators = [
-            "def ",
-            "class ",
-            "function ",
-            "import ",
-            "const ",
-            "var ",
-            "let ",
-            "<?php",
-            "public ",
-            "private ",
-            "return ",
-        ]
-        if any(indicator in content for indicator in code_indicators):
-            return "code"
-
-        # Numeric/calculation detection
-        if re.match(r"^\d+(\.\d+)?$", content):
-            return "number"
-
-        # Path detection (file/directory paths)
-        if "/" in content and " " not in content:
-            return "path"
-
-        return "text"
+        """Detect content type with the bounded classifier pipeline."""
+        return classify_content(self.content, self.content_digest)
 
     def _generate_id(self) -> str:
-        """Generate unique ID from content and timestamp."""
-        data = f"{self.content}{self.timestamp.isoformat()}"
-        return hashlib.md5(data.encode()).hexdigest()[:16]
+        """Generate unique ID from content digest and timestamp."""
+        data = f"{self.content_digest}{self.timestamp_iso}"
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
 
     def _create_display_string(self) -> str:
         """
         Create display string for UI.
         Flycut's display string logic adapted for Python.
         """
-        clean_text = self.content.replace("\n", " ").replace("\t", " ").strip()
-
-        if len(clean_text) <= self.display_length:
-            return clean_text
-
-        return clean_text[: self.display_length - 3] + "..."
+        # Only the displayed window is sliced, so long content is never
+        # copied whole to strip it
+        text = self.search_text
+        first = _NON_SPACE.search(text)
+        if first is None:
+            return ""
+        start = first.start()
+        end = len(text)
+        while text[end - 1].isspace():
+            end -= 1
+
+        if end - start <= self.display_length:
+            return text[start:end].replace("\n", " ").replace("\t", " ")
+
+        head = text[start : start + self.display_length - 3]
+        return head.replace("\n", " ").replace("\t", " ") + "..."
 
     def make_snippet(
         self, name: str, folder: str, tags: Optional[List[str]] = None
@@ -149,7 +300,7 @@ class ClipboardItem:
         Args:
             name: Name for the snippet
             folder: Folder path to store snippet
-            tags: Optional list of tags
+            tags: Optional sequence of tags
 
         Returns:
             Self (for chaining)
@@ -157,21 +308,29 @@ class ClipboardItem:
         self.has_name = True
         self.snippet_name = name
         self.folder_path = folder
-        self.tags = tags or []
+        self.tags = tags
         self.item_type = "snippet"
         return self
 
+    def set_content(self, new_content: str):
+        """Replace content; the digest is rebuilt on next read."""
+        self.content = new_content
+        self._content_digest = None
+
     def update_display_length(self, new_length: int):
-        """Update display length and regenerate display string."""
+        """Update display length used by the display string."""
         self.display_length = new_length
-        self.display_string = self._create_display_string()
+        self._display = None
 
     def matches_search(self, query: str) -> bool:
         """Check if item matches search query."""
         query_lower = query.lower()
 
-        # Search in content
-        if query_lower in self.content.lower():
+        # Search in content; an externalized item's preview is a prefix of
+        # its content, so the blob is read only when the preview misses
+        if query_lower in self.search_text.lower():
+            return True
+        if self._blob is not None and query_lower in self.content.lower():
             return True
 
         # Search in snippet name if exists
@@ -184,11 +343,16 @@ class ClipboardItem:
 
         return False
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "content": self.content,
-            "timestamp": self.timestamp.isoformat(),
+    def to_dict(self, inline: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization.
+
+        Externalized items store their preview as content plus "blob"
+        and "content_length" keys, unless inline is set (e.g. exports).
+        """
+        data = {
+            "content": self.content if inline else self.search_text,
+            "timestamp": self.timestamp_iso,
             "clip_id": self.clip_id,
             "content_type": self.content_type,
             "display_length": self.display_length,
@@ -198,21 +362,39 @@ class ClipboardItem:
             "has_name": self.has_name,
             "snippet_name": self.snippet_name,
             "folder_path": self.folder_path,
-            "tags": self.tags,
+            "tags": list(self.tags),
         }
+        if self._blob is not None and not inline:
+            data["blob"] = self._blob.digest
+            data["content_length"] = self._blob.length
+        return data
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ClipboardItem":
-        """Create ClipboardItem from dictionary."""
-        item = cls(
-            content=data["content"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            source_app=data.get("source_app"),
-            item_type=data.get("item_type", "history"),
-            content_type=data.get("content_type"),
-            display_length=data.get("display_length", 50),
-            clip_id=data.get("clip_id"),
-        )
+    def from_dict(cls, data: Dict[str, Any], blobs: Optional[BlobStore] = None) -> "ClipboardItem":
+        """
+        Create ClipboardItem from dictionary.
+
+        The persisted content type is trusted, the display string is
+        derived on read, and the timestamp and digest are only
+        materialized when first read, so loading a snapshot does no
+        per-item parsing. Blob references are resolved against blobs.
+        """
+        item = cls.__new__(cls)
+        item.content = data["content"]
+        digest = data.get("blob")
+        if digest:
+            if blobs is None:
+                raise ValueError(f"Item {data.get('clip_id')} references a blob but no blob store was given")
+            item._blob = blobs.ref(digest, data["content_length"], data["content"])
+            item._content = None
+            item._content_digest = digest
+        item._epoch = None
+        item._timestamp_raw = data["timestamp"]
+        item.source_app = _intern(data.get("source_app"))
+        item.item_type = _intern(data.get("item_type", "history"))
+        item.display_length = data.get("display_length", 50)
+        item.content_type = _intern(data.get("content_type")) or item._detect_content_type()
+        item.clip_id = data.get("clip_id") or item._generate_id()
 
         # Restore snippet properties
         item.has_name = data.get("has_name", False)
@@ -242,4 +424,7 @@ class ClipboardItem:
         """Check equality based on content."""
         if not isinstance(other, ClipboardItem):
             return False
-        return self.content == other.content
+        if self._content.__class__ is str and other._content.__class__ is str:
+            return self._content == other._content
+        # Compare digests rather than reading blobs back or inflating
+        return self.content_digest == other.content_digest
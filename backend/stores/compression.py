@@ -0,0 +1,122 @@
+"""
+Compression helpers for SimpleCP.
+
+Stdlib zlib/lzma compression used for binary snapshots and for the
+in-memory content of large clips. Compressed clip content is held as a
+CompressedText; reading it decompresses through a small LRU of hot
+contents (bounded by total characters), so repeatedly displayed or
+fetched clips are not inflated on every access.
+"""
+
+import lzma
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict
+
+# Method name -> id stored in snapshot headers and CompressedText
+METHODS = {"none": 0, "zlib": 1, "lzma": 2}
+# Total characters of decompressed content kept by content_cache
+CACHE_CHARS = 8 * 1024 * 1024
+
+
+def compress(data: bytes, method: str) -> bytes:
+    """Compress data with a method from METHODS."""
+    if method == "zlib":
+        return zlib.compress(data, 6)
+    if method == "lzma":
+        return lzma.compress(data)
+    if method == "none":
+        return data
+    raise ValueError(f"Unknown compression method: {method}")
+
+
+def decompress(data: bytes, method_id: int) -> bytes:
+    """Inverse of compress, given the method's id; corrupt data raises ValueError."""
+    try:
+        if method_id == METHODS["zlib"]:
+            return zlib.decompress(data)
+        if method_id == METHODS["lzma"]:
+            return lzma.decompress(data)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"Corrupt compressed data: {e}") from e
+    if method_id == METHODS["none"]:
+        return data
+    raise ValueError(f"Unknown compression id: {method_id}")
+
+
+class DecompressedCache:
+    """Thread-safe LRU of decompressed texts, bounded by total characters."""
+
+    def __init__(self, max_chars: int = CACHE_CHARS):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str, load: Callable[[], str]) -> str:
+        """Cached text for key, loading (and caching) it on a miss."""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return text
+            self._misses += 1
+        text = load()
+        if len(text) <= self.max_chars:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = text
+                    self._chars += len(text)
+                    while self._chars > self.max_chars:
+                        _, evicted = self._entries.popitem(last=False)
+                        self._chars -= len(evicted)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+                "chars": self._chars,
+            }
+
+
+content_cache = DecompressedCache()
+
+
+class CompressedText:
+    """Compressed clip content, decompressed on access via content_cache."""
+
+    __slots__ = ("method_id", "data", "length", "key")
+
+    def __init__(self, method_id: int, data: bytes, length: int, key: str):
+        self.method_id = method_id
+        self.data = data
+        self.length = length
+        self.key = key  # content digest
+
+    @classmethod
+    def from_text(cls, text: str, key: str, method: str = "zlib") -> "CompressedText":
+        data = compress(text.encode("utf-8", "surrogatepass"), method)
+        return cls(METHODS[method], data, len(text), key)
+
+    def text(self) -> str:
+        """Decompressed content (from the LRU when hot)."""
+        return content_cache.get(self.key, self._inflate)
+
+    def _inflate(self) -> str:
+        return decompress(self.data, self.method_id).decode("utf-8", "surrogatepass")
+
+    def __repr__(self) -> str:
+        return f"CompressedText(length={self.length}, compressed={len(self.data)})"
@@ -0,0 +1,219 @@
+"""
+Content-type classifier for SimpleCP.
+
+Detects the content type of a clip (url, email, json, sql, shell,
+code, number, path, text) with an ordered pipeline of rules. Every
+rule sees a bounded Sample of the clip: the first SNIFF_CHARS of the
+stripped text plus its length and last character, so classifying a
+multi-megabyte clip costs about the same as a short one. Rules that
+need the whole text (email, number, path, full JSON parsing) only run
+when the clip is short enough for that to be cheap.
+
+Results are cached by content digest, since the same content is often
+copied again. Extra rules can be registered on a ContentClassifier;
+the first matching rule wins.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Characters of the stripped clip that rules may inspect
+SNIFF_CHARS = 4096
+# Bracketed payloads up to this size are parsed to confirm JSON
+JSON_PARSE_CHARS = 256 * 1024
+# Digest -> content type entries kept by the result cache
+CACHE_SIZE = 4096
+
+_LEADING_SPACE = re.compile(r"\s*")
+_URL = re.compile(r"https?://|www\.")
+_EMAIL = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+_NUMBER = re.compile(r"\d+(\.\d+)?")
+# Substring sets are scanned with str's fast search, which beats a
+# regex alternation on every position of the window
+_SQL_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP")
+_CODE_INDICATORS = (
+    "def ",
+    "class ",
+    "function ",
+    "import ",
+    "const ",
+    "var ",
+    "let ",
+    "<?php",
+    "public ",
+    "private ",
+    "return ",
+)
+# Opening of a JSON document too large to parse while classifying
+_JSON_OPENING = re.compile(r'\{\s*["}]|\[\s*(?:[\[\]{"\-\d]|true|false|null)')
+
+
+class Sample(NamedTuple):
+    """Bounded view of a clip's stripped text."""
+
+    content: str  # the original clip
+    head: str  # first SNIFF_CHARS characters
+    length: int  # length of the whole stripped text
+    last: str  # last character ("" when empty)
+
+    @property
+    def complete(self) -> bool:
+        """Whether head holds the whole stripped text."""
+        return self.length <= len(self.head)
+
+    def text(self) -> str:
+        """The whole stripped text (copies it for long clips)."""
+        return self.head if self.complete else self.content.strip()
+
+
+Rule = Callable[[Sample], bool]
+
+
+def sample(content: str, window: int = SNIFF_CHARS) -> Sample:
+    """Build a Sample without copying more than `window` characters."""
+    start = _LEADING_SPACE.match(content).end()
+    if start == len(content):
+        return Sample(content, "", 0, "")
+    tail = content[-window:]
+    trimmed = tail.rstrip()
+    if trimmed:
+        end = len(content) - (len(tail) - len(trimmed))
+    else:
+        end = len(content.rstrip())
+    head = content[start : min(end, start + window)]
+    return Sample(content, head, end - start, content[end - 1])
+
+
+def _is_url(s: Sample) -> bool:
+    return _URL.match(s.head) is not None
+
+
+def _is_email(s: Sample) -> bool:
+    return s.complete and _EMAIL.fullmatch(s.head) is not None
+
+
+def _is_json(s: Sample) -> bool:
+    if not s.head:
+        return False
+    opening, closing = s.head[0], s.last
+    if not ((opening == "{" and closing == "}") or (opening == "[" and closing == "]")):
+        return False
+    if s.length > JSON_PARSE_CHARS:
+        return _JSON_OPENING.match(s.head) is not None
+    try:
+        json.loads(s.text())
+    except (ValueError, RecursionError):
+        return False
+    return True
+
+
+def _is_sql(s: Sample) -> bool:
+    upper = s.head.upper()
+    return any(keyword in upper for keyword in _SQL_KEYWORDS)
+
+
+def _is_shell(s: Sample) -> bool:
+    return s.head.startswith("$") or s.head.startswith("sudo ")
+
+
+def _is_code(s: Sample) -> bool:
+    head = s.head
+    return any(indicator in head for indicator in _CODE_INDICATORS)
+
+
+def _is_number(s: Sample) -> bool:
+    return s.complete and _NUMBER.fullmatch(s.head) is not None
+
+
+def _is_path(s: Sample) -> bool:
+    return s.complete and "/" in s.head and " " not in s.head
+
+
+class ContentClassifier:
+    """
+    Ordered rule pipeline with a digest-keyed result cache.
+
+    Each rule takes a Sample and returns True when the clip is of its
+    type. Cheap anchored checks (url, email) come first, matching the
+    original detection precedence; unmatched clips are "text".
+    """
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._rules: List[Tuple[str, Rule]] = [
+            ("url", _is_url),
+            ("email", _is_email),
+            ("json", _is_json),
+            ("sql", _is_sql),
+            ("shell", _is_shell),
+            ("code", _is_code),
+            ("number", _is_number),
+            ("path", _is_path),
+        ]
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def register(self, content_type: str, rule: Rule, before: Optional[str] = None):
+        """Add a rule, ahead of the rule for `before` if given (else last)."""
+        position = len(self._rules)
+        if before is not None:
+            names = [name for name, _ in self._rules]
+            if before not in names:
+                raise ValueError(f"Unknown content type '{before}'")
+            position = names.index(before)
+        self._rules.insert(position, (content_type, rule))
+        self.clear_cache()
+
+    def classify(self, content: str, digest: Optional[str] = None) -> str:
+        """Content type of content; cached when its digest is given."""
+        if digest is not None:
+            with self._lock:
+                cached = self._cache.get(digest)
+                if cached is not None:
+                    self._cache.move_to_end(digest)
+                    self._hits += 1
+                    return cached
+                self._misses += 1
+
+        content_type = self._run(content)
+
+        if digest is not None:
+            with self._lock:
+                self._cache[digest] = content_type
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return content_type
+
+    def _run(self, content: str) -> str:
+        s = sample(content)
+        for content_type, rule in self._rules:
+            if rule(s):
+                return content_type
+        return "text"
+
+    def clear_cache(self):
+        """Forget cached results (e.g. after rules change)."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache counters."""
+        with self._lock:
+            return {
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "cache_size": len(self._cache),
+            }
+
+
+default_classifier = ContentClassifier()
+
+
+def classify_content(content: str, digest: Optional[str] = None) -> str:
+    """Classify content with the shared default classifier."""
+    return default_classifier.classify(content, digest)
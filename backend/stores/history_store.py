@@ -6,8 +6,11 @@ size limits, and auto-generated folder ranges.
 Based on Flycut's FlycutStore pattern.
 """
 
-from typing import List, Optional, Callable, Dict, Any
+from itertools import islice
+from typing import Iterator, List, Optional, Callable, Dict, Any, Tuple
 from stores.clipboard_item import ClipboardItem
+from stores.clip_list import ClipList
+from stores.search_index import SearchIndex
 
 
 class HistoryStore:
@@ -21,6 +24,11 @@ class HistoryStore:
     - Auto-generated folder ranges (11-20, 21-30, etc.)
     - Delegate pattern for UI updates
     - Modified flag for persistence tracking
+    - Version counter that increases on every change (for HTTP ETags)
+
+    Items live in a ClipList, so insert-at-front, move-to-front,
+    delete-by-id and tail eviction are O(1). Delegates receive None
+    in place of a position when it is not known without a scan.
     """
 
     def __init__(
@@ -42,57 +50,102 @@ class HistoryStore:
         self.display_count = display_count
         self.display_length = display_length
 
-        # Storage
-        self.items: List[ClipboardItem] = []
+        # Storage (ordered, clip_id-keyed)
+        self._items = ClipList()
+
+        # Content digest -> item, so duplicate detection is a dict lookup;
+        # None until first needed after a bulk load (see _digest_map)
+        self._digest_index: Optional[Dict[str, ClipboardItem]] = {}
 
         # Dirty flag for persistence (Flycut's modifiedSinceLastSaveStore)
         self.modified = False
 
+        # Bumped on every change; unlike `modified` it is never reset
+        self.version = 0
+
         # Delegate callbacks for UI updates (Flycut's delegate pattern)
         self._delegates: List[Callable] = []
 
+        # Inverted index kept current through the delegate callbacks
+        self.search_index = SearchIndex()
+        self.add_delegate(self.search_index.handle_history_event)
+
+    @property
+    def items(self) -> List[ClipboardItem]:
+        """Snapshot of all items, most recent first."""
+        return list(self._items)
+
     def insert(self, item: ClipboardItem, index: int = 0) -> bool:
         """Insert item with duplicate handling. Returns True if inserted."""
         # Check for duplicates (Flycut's removeDuplicates)
-        duplicate_index = self.find_duplicate(item)
-        if duplicate_index >= 0:
-            self.move_to_top(duplicate_index)
+        duplicate = self.get_duplicate(item)
+        if duplicate is not None:
+            self._move_item_to_top(duplicate, None)
             return False
 
         self._notify_delegates("will_insert", index, item)
-        self.items.insert(index, item)
-        self.modified = True
+        self._items.insert(index, item)
+        self._digest_map()[item.content_digest] = item
+        self._changed()
 
         # Enforce size limit
-        if len(self.items) > self.max_items:
-            removed = self.items.pop()
-            self._notify_delegates("did_delete", len(self.items), removed)
+        if len(self._items) > self.max_items:
+            removed = self._items.pop_back()
+            self._unindex(removed)
+            self._notify_delegates("did_delete", len(self._items), removed)
 
         self._notify_delegates("did_insert", index, item)
         return True
 
+    def get_duplicate(self, item: ClipboardItem) -> Optional[ClipboardItem]:
+        """Find stored item with the same content via the digest index."""
+        existing = self._digest_map().get(item.content_digest)
+        # Guard against stale entries (content edited in place resets the
+        # digest); digests are compared so externalized content stays on disk
+        if existing is not None and existing.content_digest == item.content_digest:
+            return existing
+        return None
+
     def find_duplicate(self, item: ClipboardItem) -> int:
         """Find duplicate by content. Returns index or -1."""
-        for i, existing_item in enumerate(self.items):
-            if existing_item.content == item.content:
-                return i
-        return -1
+        duplicate = self.get_duplicate(item)
+        return -1 if duplicate is None else self._items.index_of(duplicate.clip_id)
 
     def move_to_top(self, index: int):
         """Move item at index to top."""
-        if 0 <= index < len(self.items):
-            item = self.items.pop(index)
-            self.items.insert(0, item)
-            self.modified = True
-            self._notify_delegates("item_moved", index, 0, item)
+        if 0 <= index < len(self._items):
+            self._move_item_to_top(self._items.item_at(index), index)
+
+    def _move_item_to_top(self, item: ClipboardItem, index: Optional[int]):
+        self._items.move_to_front(item.clip_id)
+        self._changed()
+        self._notify_delegates("item_moved", index, 0, item)
+
+    def get_item_by_id(self, clip_id: str) -> Optional[ClipboardItem]:
+        """Get item by clip ID."""
+        return self._items.get(clip_id)
+
+    def order_key(self, clip_id: str) -> int:
+        """Sort key of an item; increases from the most recent item down."""
+        return self._items.rank(clip_id)
 
     def get_items(self, limit: Optional[int] = None) -> List[ClipboardItem]:
         """Get history items with optional limit."""
-        return self.items.copy() if limit is None else self.items[:limit]
+        if limit is not None and limit < 0:
+            return self.items[:limit]
+        return self._items.slice(0, limit)
+
+    def get_page(
+        self, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[List[ClipboardItem], Optional[str]]:
+        """Keyset page after cursor `after`; returns (items, next_cursor)."""
+        if after is None and limit is not None and limit < 0:
+            return self.get_items(limit), None
+        return self._items.page(after, limit)
 
     def get_recent_items(self) -> List[ClipboardItem]:
         """Get items for direct display."""
-        return self.items[: self.display_count]
+        return self._items.slice(0, self.display_count)
 
     def get_auto_folders(self) -> List[Dict[str, Any]]:
         """
@@ -103,48 +156,104 @@ class HistoryStore:
             List of folder dictionaries with name and items
         """
         folders = []
-        total_items = len(self.items)
+        if self.display_count <= 0:
+            return folders
 
         # Skip first display_count items (they show directly)
         start_index = self.display_count
+        remaining = islice(self._items, start_index, None)
 
-        while start_index < total_items:
-            end_index = min(start_index + self.display_count - 1, total_items - 1)
-            folder_name = f"{start_index + 1}-{end_index + 1}"
-            folder_items = self.items[start_index : end_index + 1]
-
+        while True:
+            folder_items = list(islice(remaining, self.display_count))
+            if not folder_items:
+                break
+            end_index = start_index + len(folder_items) - 1
             folders.append(
                 {
-                    "name": folder_name,
+                    "name": f"{start_index + 1}-{end_index + 1}",
                     "start_index": start_index,
                     "end_index": end_index,
                     "items": folder_items,
                     "count": len(folder_items),
                 }
             )
-
             start_index = end_index + 1
 
         return folders
 
     def delete_item(self, index: int) -> Optional[ClipboardItem]:
         """Delete item at index."""
-        if 0 <= index < len(self.items):
-            item = self.items.pop(index)
-            self.modified = True
-            self._notify_delegates("did_delete", index, item)
+        if 0 <= index < len(self._items):
+            item = self._items.item_at(index)
+            self._remove(item, index)
             return item
         return None
 
+    def delete_by_id(self, clip_id: str) -> Optional[ClipboardItem]:
+        """Delete item by clip ID."""
+        item = self._items.get(clip_id)
+        if item is not None:
+            self._remove(item, None)
+        return item
+
+    def _remove(self, item: ClipboardItem, index: Optional[int]):
+        self._items.remove(item.clip_id)
+        self._unindex(item)
+        self._changed()
+        self._notify_delegates("did_delete", index, item)
+
     def clear(self):
         """Clear all history items."""
-        self.items.clear()
-        self.modified = True
+        self._items.clear()
+        self._digest_index = {}
+        self._changed()
         self._notify_delegates("store_cleared")
 
+    def load_items(self, items: List[ClipboardItem]):
+        """Replace store contents with persisted items; indexes build on first use."""
+        self._items = ClipList(items)
+        self._digest_index = None
+        self.modified = False
+        self.version += 1
+        self._notify_delegates("store_loaded", items)
+
+    def notify_item_updated(self, item: ClipboardItem):
+        """Tell delegates a stored item's searchable fields changed in place."""
+        if self._items.get(item.clip_id) is item:
+            self._changed()
+            self._notify_delegates("item_updated", item)
+
     def search(self, query: str) -> List[ClipboardItem]:
-        """Search items matching query."""
-        return [item for item in self.items if item.matches_search(query)]
+        """Search items matching query, most recent first."""
+        matches = self.search_index.matches(query)
+        if matches is None:
+            return [item for item in self._items if item.matches_search(query)]
+        return sorted(matches, key=self.search_index.stamp, reverse=True)
+
+    def fuzzy_search(self, query: str, limit: int) -> List[Tuple[float, ClipboardItem]]:
+        """Top-`limit` fuzzy matches as (score, item), best first."""
+        return self.search_index.fuzzy_search(query, limit)
+
+    def _changed(self):
+        """Flag unsaved changes and advance the version."""
+        self.modified = True
+        self.version += 1
+
+    def _digest_map(self) -> Dict[str, ClipboardItem]:
+        """Digest index, built from the stored items on first use."""
+        if self._digest_index is None:
+            # Iterate oldest first so the most recent copy of any content wins
+            self._digest_index = {
+                item.content_digest: item for item in reversed(list(self._items))
+            }
+        return self._digest_index
+
+    def _unindex(self, item: ClipboardItem):
+        """Drop item from the digest index if it is the indexed entry."""
+        if self._digest_index is None:
+            return  # rebuilt from the remaining items when next needed
+        if self._digest_index.get(item.content_digest) is item:
+            del self._digest_index[item.content_digest]
 
     def add_delegate(self, callback: Callable):
         """Add delegate callback for store updates."""
@@ -164,13 +273,19 @@ class HistoryStore:
             except Exception:
                 pass  # Don't let delegate errors break the store
 
+    def __iter__(self) -> Iterator[ClipboardItem]:
+        """Iterate items, most recent first."""
+        return iter(self._items)
+
     def __len__(self) -> int:
         """Return number of items in store."""
-        return len(self.items)
+        return len(self._items)
 
     def __getitem__(self, index: int) -> ClipboardItem:
         """Get item by index."""
-        return self.items[index]
+        if isinstance(index, slice):
+            return self.items[index]
+        return self._items.item_at(index)
 
     def __repr__(self) -> str:
-        return f"HistoryStore(items={len(self.items)}, max={self.max_items})"
+        return f"HistoryStore(items={len(self._items)}, max={self.max_items})"
@@ -0,0 +1,255 @@
+"""
+StoreJournal for SimpleCP.
+
+Append-only operation log for the history and snippet stores.
+Each store mutation becomes one JSON line carrying a sequence number,
+so saving a change costs I/O proportional to the change rather than
+to the total data. Records are buffered and written with one fsync
+per flush; the write-behind persister decides when that happens.
+
+On load the latest snapshot (history.json / snippets.json) is read
+and every record newer than the snapshot's last_seq is replayed on
+top of it. Operations are idempotent upserts/removals keyed by
+clip_id, so replaying a record the snapshot already reflects is
+harmless.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StoreJournal:
+    """
+    Buffered, fsync-batched operation journal.
+
+    Register handle_history_event / handle_snippet_event as store
+    delegates; call flush() to make buffered records durable and
+    truncate() after a snapshot to drop records it already covers.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize journal.
+
+        Args:
+            path: Journal file (JSON lines)
+        """
+        self.path = path
+        self.seq = 0
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self._pending: List[str] = []
+        # _lock guards the buffer; _write_lock orders file writes
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stats = {"records": 0, "flushes": 0, "bytes_written": 0, "compactions": 0}
+
+    def record(self, op: str, **fields: Any):
+        """Buffer one operation record."""
+        with self._lock:
+            self.seq += 1
+            fields["seq"] = self.seq
+            fields["op"] = op
+            self._pending.append(json.dumps(fields, separators=(",", ":")) + "\n")
+            self._stats["records"] += 1
+
+    def flush(self) -> int:
+        """Append buffered records with a single fsync. Returns records written."""
+        with self._write_lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        with self._lock:
+            lines, self._pending = self._pending, []
+        if not lines:
+            return 0
+        data = "".join(lines)
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            # Keep the records so the next flush retries them
+            with self._lock:
+                self._pending = lines + self._pending
+            raise
+        self.size += len(data)
+        self._stats["flushes"] += 1
+        self._stats["bytes_written"] += len(data)
+        return len(lines)
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Records on disk, oldest first, up to the first torn or corrupt line."""
+        records: List[Dict[str, Any]] = []
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Journal {self.path}: ignoring records from line {line_no}")
+                    break
+        return records
+
+    def truncate(self, last_seq: int):
+        """Drop records with seq <= last_seq (already in a snapshot)."""
+        with self._write_lock:
+            self._flush_locked()
+            keep = [
+                json.dumps(record, separators=(",", ":")) + "\n"
+                for record in self.read()
+                if record.get("seq", 0) > last_seq
+            ]
+            data = "".join(keep)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.size = len(data)
+            self._stats["compactions"] += 1
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered, not yet durable records."""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Journal counters."""
+        stats = dict(self._stats)
+        stats["seq"] = self.seq
+        stats["size_bytes"] = self.size
+        stats["pending"] = len(self._pending)
+        return stats
+
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        if event == "did_insert":
+            self.record("h_insert", index=args[0], item=args[1].to_dict())
+        elif event == "did_delete":
+            self.record("h_delete", clip_id=args[1].clip_id)
+        elif event == "item_moved":
+            self.record("h_move", clip_id=args[2].clip_id)
+        elif event == "item_updated":
+            self.record("h_update", item=args[0].to_dict())
+        elif event == "store_cleared":
+            self.record("h_clear")
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        if event == "folder_created":
+            self.record("s_folder_create", folder=args[0])
+        elif event == "folder_renamed":
+            self.record("s_folder_rename", old=args[0], new=args[1])
+        elif event == "folder_deleted":
+            self.record("s_folder_delete", folder=args[0])
+        elif event == "snippet_added":
+            self.record("s_add", folder=args[0], item=args[1].to_dict())
+        elif event == "snippet_updated":
+            self.record("s_update", folder=args[0], item=args[1].to_dict())
+        elif event == "snippet_deleted":
+            self.record("s_delete", folder=args[0], clip_id=args[1].clip_id)
+        elif event == "snippet_moved":
+            self.record("s_move", old=args[0], new=args[1], clip_id=args[2].clip_id)
+        elif event == "store_cleared":
+            self.record("s_clear")
+
+    def __repr__(self) -> str:
+        return f"StoreJournal(path={self.path!r}, seq={self.seq}, size={self.size})"
+
+
+def replay(
+    history_data: List[Dict[str, Any]],
+    snippet_data: Dict[str, List[Dict[str, Any]]],
+    records: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Apply journal records to snapshot data.
+
+    Works on the serialized dicts so loading builds each store once.
+    Returns (history_data, snippet_data) in the snapshot file layout.
+    """
+    history: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(
+        (data["clip_id"], data) for data in history_data
+    )
+    folders: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {
+        name: OrderedDict((data["clip_id"], data) for data in items)
+        for name, items in snippet_data.items()
+    }
+    locations = {clip_id: name for name, items in folders.items() for clip_id in items}
+
+    def put_snippet(folder: str, data: Dict[str, Any]):
+        # Mirrors SnippetStore.add_snippet: relocate and append
+        previous = locations.get(data["clip_id"])
+        if previous is not None and previous in folders:
+            folders[previous].pop(data["clip_id"], None)
+        folders.setdefault(folder, OrderedDict())[data["clip_id"]] = data
+        locations[data["clip_id"]] = folder
+
+    for record in records:
+        op = record.get("op")
+        if op == "h_insert":
+            data = record["item"]
+            history.pop(data["clip_id"], None)
+            history[data["clip_id"]] = data
+            if record.get("index", 0) <= 0:
+                history.move_to_end(data["clip_id"], last=False)
+            elif record["index"] < len(history) - 1:
+                ordered = list(history.items())
+                ordered.insert(record["index"], ordered.pop())
+                history = OrderedDict(ordered)
+        elif op == "h_delete":
+            history.pop(record["clip_id"], None)
+        elif op == "h_move":
+            if record["clip_id"] in history:
+                history.move_to_end(record["clip_id"], last=False)
+        elif op == "h_update":
+            if record["item"]["clip_id"] in history:
+                history[record["item"]["clip_id"]] = record["item"]
+        elif op == "h_clear":
+            history.clear()
+        elif op == "s_folder_create":
+            folders.setdefault(record["folder"], OrderedDict())
+        elif op == "s_folder_rename":
+            if record["old"] in folders and record["new"] not in folders:
+                folders[record["new"]] = folders.pop(record["old"])
+                for clip_id, data in folders[record["new"]].items():
+                    data["folder_path"] = record["new"]
+                    locations[clip_id] = record["new"]
+        elif op == "s_folder_delete":
+            for clip_id in folders.pop(record["folder"], ()):
+                locations.pop(clip_id, None)
+        elif op == "s_add":
+            put_snippet(record["folder"], record["item"])
+        elif op == "s_update":
+            clip_id = record["item"]["clip_id"]
+            if locations.get(clip_id) == record["folder"]:
+                folders[record["folder"]][clip_id] = record["item"]
+        elif op == "s_delete":
+            if locations.get(record["clip_id"]) == record["folder"]:
+                folders[record["folder"]].pop(record["clip_id"], None)
+                del locations[record["clip_id"]]
+        elif op == "s_move":
+            source = folders.get(record["old"], {})
+            data = source.get(record["clip_id"]) if locations.get(record["clip_id"]) == record["old"] else None
+            if data is not None:
+                data["folder_path"] = record["new"]
+                put_snippet(record["new"], data)
+        elif op == "s_clear":
+            folders.clear()
+            locations.clear()
+        else:
+            logger.warning(f"Journal: skipping unknown op {op!r} (seq {record.get('seq')})")
+
+    return (
+        list(history.values()),
+        {name: list(items.values()) for name, items in folders.items()},
+    )
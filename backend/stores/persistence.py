@@ -0,0 +1,348 @@
+"""
+StorePersistence for SimpleCP.
+
+Reads and writes the history and snippet stores on disk.
+With the JSON backend the stores are saved as snapshot files (one
+history file plus a shard per snippet folder, listed in a manifest)
+in either the readable JSON or the compact binary format, and the
+journal holds every change since the last snapshot. Saving writes the
+changed parts and truncates the journal; loading reads the snapshot,
+replays newer journal records and registers unchanged folders to load
+on first access. With the SQLite backend the database is the source,
+and existing JSON files are imported into it once.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from stores.blob_store import BlobStore
+from stores.clipboard_item import ClipboardItem
+from stores.history_store import HistoryStore
+from stores.journal import StoreJournal, replay
+from stores.rwlock import ReadWriteLock
+from stores.snapshot_codec import decode_items, encode_items
+from stores.snippet_store import SnippetStore
+from stores.sqlite_storage import SQLiteStorage
+
+SNAPSHOT_FORMATS = ("binary", "json")
+
+
+class StorePersistence:
+    """
+    Snapshot, shard and migration handling for one pair of stores.
+
+    save() and load() raise on I/O errors; the caller decides how to
+    report them. save() holds the shared store lock only to copy item
+    references and the journal position; serializing and writing happen
+    after it is released, so a waiting writer (and the readers queued
+    behind it) is not held up for the length of a save.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        history_store: HistoryStore,
+        snippet_store: SnippetStore,
+        lock: ReadWriteLock,
+        journal: StoreJournal,
+        blob_store: BlobStore,
+        database: Optional[SQLiteStorage] = None,
+        snapshot_format: str = "json",
+        compression: str = "none",
+        compact_content: Optional[Callable[[ClipboardItem], None]] = None,
+    ):
+        """
+        Initialize persistence.
+
+        Args:
+            data_dir: Directory holding the snapshot files
+            history_store: Store to save and load history into
+            snippet_store: Store to save and load snippets into
+            lock: Store lock; saves serialize under its shared side
+            journal: Journal of changes since the last snapshot
+            blob_store: Store for externalized clip content
+            database: SQLite mirror; when set it replaces the snapshot files
+            snapshot_format: "json" (readable) or "binary" (compact, versioned)
+            compression: Compression method for binary snapshots
+            compact_content: Called on each loaded item to externalize or compress it
+        """
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format: {snapshot_format}")
+        self.data_dir = data_dir
+        self.history_store = history_store
+        self.snippet_store = snippet_store
+        self.lock = lock
+        self.journal = journal
+        self.blob_store = blob_store
+        self.database = database
+        self.snapshot_format = snapshot_format
+        self.compression = compression
+        self.compact_content = compact_content
+        self._snapshot_ext = ".snap" if snapshot_format == "binary" else ".json"
+        self.history_file = os.path.join(data_dir, "history" + self._snapshot_ext)
+        # Legacy single-file snippets; superseded by per-folder shards plus a manifest
+        self.snippets_file = os.path.join(data_dir, "snippets.json")
+        self.snippets_dir = os.path.join(data_dir, "snippets")
+        self.snippet_manifest_file = os.path.join(self.snippets_dir, "manifest.json")
+        self.snapshot_meta_file = os.path.join(data_dir, "snapshot_meta.json")
+        # Folder -> shard file currently holding it (kept for folders not yet loaded)
+        self._shard_files: Dict[str, str] = {}
+        # Folder -> blob digests its shard refers to, from the manifest
+        self._shard_blobs: Dict[str, List[str]] = {}
+
+    # File helpers
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_json_atomic(self, path: str, data: Any):
+        self._write_atomic(path, json.dumps(data, indent=2).encode("utf-8"))
+
+    def _write_items(self, path: str, data: List[Dict[str, Any]]):
+        """Write a snapshot file of item dicts in the configured format."""
+        if self.snapshot_format == "binary":
+            self._write_atomic(path, encode_items(data, self.compression))
+        else:
+            self._write_json_atomic(path, data)
+
+    @staticmethod
+    def _read_items(path: str) -> List[Dict[str, Any]]:
+        """Read a snapshot file in either format."""
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            return decode_items(f.read())
+
+    @staticmethod
+    def _read_json(path: str, default: Any) -> Any:
+        if not os.path.exists(path):
+            return default
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _history_source(self) -> str:
+        """History snapshot to load: the configured format, else the other one."""
+        if os.path.exists(self.history_file):
+            return self.history_file
+        other = ".json" if self._snapshot_ext == ".snap" else ".snap"
+        return os.path.join(self.data_dir, "history" + other)
+
+    # Saving
+    def save(self):
+        """Write changed stores and snippet folders to the snapshot and compact the journal."""
+        if self.database is not None:
+            # Every change is already a row write; just make it durable
+            self.database.commit()
+            return
+        # Copy item references under the shared lock; serialize them after.
+        # An item changed in between may be written in its newer state,
+        # which is harmless: its journal record has a seq above last_seq,
+        # survives truncation and is replayed over the snapshot on load.
+        with self.lock.read():
+            last_seq = self.journal.seq
+            # Reset dirty state while copying so later changes stay flagged
+            history_items = None
+            if self.history_store.modified or not os.path.exists(self.history_file):
+                history_items = list(self.history_store)
+            self.history_store.modified = False
+            write_manifest = self.snippet_store.modified or not os.path.exists(
+                self.snippet_manifest_file
+            )
+            dirty_folders = self.snippet_store.take_dirty_folders()
+            shards = self._snapshot_snippet_shards(dirty_folders) if write_manifest else None
+        if history_items is not None:
+            previous = self._history_source()
+            self._write_items(self.history_file, [item.to_dict() for item in history_items])
+            if previous != self.history_file and os.path.exists(previous):
+                # Switched formats; keep the old file only as a backup
+                os.replace(previous, previous + ".bak")
+        if shards is not None:
+            self._save_snippet_shards(*shards)
+        # Written last: a crash before this point replays idempotent records
+        self._write_json_atomic(self.snapshot_meta_file, {"last_seq": last_seq})
+        self.journal.truncate(last_seq)
+        self.collect_blobs()
+
+    def _shard_file_name(self, folder_name: str) -> str:
+        """Filesystem-safe, collision-free shard name for a folder."""
+        slug = re.sub(r"[^\w.-]", "_", folder_name)[:40]
+        digest = hashlib.blake2b(folder_name.encode("utf-8", "surrogatepass"), digest_size=6).hexdigest()
+        return f"{slug}-{digest}{self._snapshot_ext}"
+
+    def _snapshot_snippet_shards(self, dirty_folders) -> Tuple[List[Tuple[str, list]], List[Dict[str, Any]]]:
+        """Items of shards that need rewriting, plus manifest entries (hold the read lock)."""
+        writes = []
+        entries = []
+        for folder_name, items in self.snippet_store.folders.items():
+            loaded = self.snippet_store.is_folder_loaded(folder_name)
+            file_name = self._shard_file_name(folder_name)
+            if not loaded:
+                # Unloaded folders stay in the shard they were registered from
+                file_name = self._shard_files.get(folder_name, file_name)
+            path = os.path.join(self.snippets_dir, file_name)
+            if loaded and (folder_name in dirty_folders or not os.path.exists(path)):
+                writes.append((path, list(items)))
+            entry = {
+                "name": folder_name,
+                "file": file_name,
+                "count": self.snippet_store.folder_count(folder_name),
+            }
+            if loaded:
+                entry["blobs"] = sorted({item.content_digest for item in items if item.is_external})
+            elif folder_name in self._shard_blobs:
+                entry["blobs"] = self._shard_blobs[folder_name]
+            entries.append(entry)
+        return writes, entries
+
+    def _save_snippet_shards(self, writes: List[Tuple[str, list]], entries: List[Dict[str, Any]]):
+        """Write snapshotted shards and the manifest, and drop stale shards."""
+        os.makedirs(self.snippets_dir, exist_ok=True)
+        for path, items in writes:
+            self._write_items(path, [item.to_dict() for item in items])
+        self._write_json_atomic(self.snippet_manifest_file, {"version": 1, "folders": entries})
+        self._register_shards(entries)
+        live = set(self._shard_files.values())
+        for file_name in os.listdir(self.snippets_dir):
+            if file_name.endswith((".json", ".snap")) and file_name != "manifest.json" and file_name not in live:
+                os.remove(os.path.join(self.snippets_dir, file_name))
+        if os.path.exists(self.snippets_file):
+            # Migrated to shards; keep the old file only as a backup
+            os.replace(self.snippets_file, self.snippets_file + ".bak")
+
+    # Blob collection
+    def _live_blobs(self) -> set:
+        """Digests of every blob still referenced by history or snippets."""
+        live = {item.content_digest for item in self.history_store if item.is_external}
+        for folder_name, items in list(self.snippet_store.folders.items()):
+            if self.snippet_store.is_folder_loaded(folder_name):
+                live.update(item.content_digest for item in items if item.is_external)
+            elif folder_name in self._shard_files:
+                blobs = self._shard_blobs.get(folder_name)
+                if blobs is None:
+                    # Manifest predates blob lists: read the shard once
+                    entry = {"file": self._shard_files[folder_name]}
+                    blobs = [data["blob"] for data in self._read_shard(entry) if data.get("blob")]
+                    self._shard_blobs[folder_name] = blobs
+                live.update(blobs)
+        return live
+
+    def collect_blobs(self):
+        """Remove blobs no item refers to any more."""
+        started = time.time()
+        with self.lock.read():
+            live = self._live_blobs()
+        self.blob_store.collect(live, started)
+
+    # Loading
+    def _register_shards(self, entries: List[Dict[str, Any]]):
+        self._shard_files = {entry["name"]: entry["file"] for entry in entries}
+        self._shard_blobs = {entry["name"]: entry["blobs"] for entry in entries if "blobs" in entry}
+
+    def _read_manifest(self) -> Optional[List[Dict[str, Any]]]:
+        manifest = self._read_json(self.snippet_manifest_file, None)
+        return None if manifest is None else manifest["folders"]
+
+    def _read_shard(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self._read_items(os.path.join(self.snippets_dir, entry["file"]))
+
+    def _load_shard(self, entry: Dict[str, Any]) -> List[ClipboardItem]:
+        return self._load_items(self._read_shard(entry))
+
+    def _load_items(self, items_data: List[Dict[str, Any]]) -> List[ClipboardItem]:
+        """Items from persisted dicts, with large content moved to blobs or compressed."""
+        items = [ClipboardItem.from_dict(item_data, self.blob_store) for item_data in items_data]
+        if self.compact_content is not None:
+            for item in items:
+                self.compact_content(item)
+        return items
+
+    def _read_snippet_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        """All snippet folders from shards, or the legacy snippets.json."""
+        entries = self._read_manifest()
+        if entries is None:
+            return self._read_json(self.snippets_file, {})
+        return {entry["name"]: self._read_shard(entry) for entry in entries}
+
+    def _journal_records(self) -> List[Dict[str, Any]]:
+        """Journal records newer than the snapshot; advances journal.seq past them."""
+        last_seq = self._read_json(self.snapshot_meta_file, {}).get("last_seq", 0)
+        records = [r for r in self.journal.read() if r.get("seq", 0) > last_seq]
+        if records:
+            last_seq = max(last_seq, records[-1]["seq"])
+        self.journal.seq = max(self.journal.seq, last_seq)
+        return records
+
+    def _read_snapshot(self) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """Snapshot file data with newer journal records replayed on top."""
+        history_data = self._read_items(self._history_source())
+        snippet_data = self._read_snippet_data()
+        records = self._journal_records()
+        if records:
+            history_data, snippet_data = replay(history_data, snippet_data, records)
+        return history_data, snippet_data
+
+    def _populate(
+        self,
+        history_data: List[Dict[str, Any]],
+        snippet_data: Dict[str, List[Dict[str, Any]]],
+    ):
+        self.history_store.load_items(self._load_items(history_data))
+        for folder_name, items_data in snippet_data.items():
+            self.snippet_store.load_folder(folder_name, self._load_items(items_data))
+
+    def _load_json_stores(self):
+        """Load history and snippet shards, replaying the journal on top."""
+        history_data = self._read_items(self._history_source())
+        records = self._journal_records()
+        entries = self._read_manifest()
+        self._register_shards(entries or [])
+        if entries is not None and not any(r.get("op", "").startswith("s_") for r in records):
+            # Snippets are unchanged since the snapshot: load each folder on first access
+            if records:
+                history_data, _ = replay(history_data, {}, records)
+            self._populate(history_data, {})
+            for entry in entries:
+                self.snippet_store.add_lazy_folder(
+                    entry["name"], partial(self._load_shard, entry), entry.get("count", 0)
+                )
+        else:
+            snippet_data = self._read_snippet_data()
+            if records:
+                history_data, snippet_data = replay(history_data, snippet_data, records)
+            self._populate(history_data, snippet_data)
+            if records or entries is None:
+                # Replayed or legacy folders must reach the shards on the next save
+                self.snippet_store.mark_dirty(*snippet_data)
+        if records:
+            self.history_store.modified = True
+
+    def _load_database(self):
+        """Load from SQLite, importing JSON snapshots and upgrading the index once."""
+        if self.database.get_meta("json_migrated") is None:
+            # One-shot migration of existing history.json / snippets.json
+            self.database.import_data(*self._read_snapshot(), blobs=self.blob_store)
+            self.database.set_meta("json_migrated", datetime.now().isoformat())
+            self.database.commit()
+        if self.database.get_meta("fts_full_text") is None:
+            # Older databases indexed only the preview of large clips
+            self.database.reindex_external(self.blob_store)
+            self.database.set_meta("fts_full_text", datetime.now().isoformat())
+            self.database.commit()
+        self._populate(*self.database.load())
+
+    def load(self):
+        """Load persisted stores (SQLite, or JSON snapshot plus journal replay)."""
+        if self.database is not None:
+            self._load_database()
+        else:
+            self._load_json_stores()
@@ -0,0 +1,113 @@
+"""
+ReadWriteLock for SimpleCP.
+
+The clipboard monitor thread, the API writer thread and the API read
+pool all touch the same stores. Store reads are many and cheap, writes
+are rare and short (disk I/O happens outside the lock), so readers
+share the lock and a writer takes it exclusively.
+
+The lock is writer-preferring: once a writer is waiting, new readers
+queue behind it, so a steady stream of polls cannot starve a
+mutation. Both sides are reentrant per thread, and the thread holding
+the write lock may also take the read lock, so manager methods can
+call each other freely.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+
+class ReadWriteLock:
+    """Shared/exclusive lock with writer preference and per-thread reentrancy."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        # Per-thread read depth, so nested reads never queue behind a writer
+        self._local = threading.local()
+        self._stats = {"reads": 0, "writes": 0, "read_waits": 0, "write_waits": 0}
+
+    def acquire_read(self):
+        """Take the lock shared."""
+        depth = getattr(self._local, "depth", 0)
+        me = threading.get_ident()
+        with self._cond:
+            self._stats["reads"] += 1
+            if depth == 0 and self._writer != me:
+                if self._writer is not None or self._waiting_writers:
+                    self._stats["read_waits"] += 1
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+            self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self):
+        """Release a shared hold."""
+        self._local.depth -= 1
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        """Take the lock exclusively."""
+        me = threading.get_ident()
+        with self._cond:
+            self._stats["writes"] += 1
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, "depth", 0):
+                raise RuntimeError("cannot upgrade a read lock to a write lock")
+            if self._writer is not None or self._readers:
+                self._stats["write_waits"] += 1
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """Release an exclusive hold."""
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Context manager holding the lock shared."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Context manager holding the lock exclusively."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Acquisition counters and how many had to wait."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["active_readers"] = self._readers
+            stats["writer_active"] = self._writer is not None
+            stats["waiting_writers"] = self._waiting_writers
+        return stats
+
+    def __repr__(self) -> str:
+        return f"ReadWriteLock(readers={self._readers}, writer={self._writer is not None})"
@@ -0,0 +1,342 @@
+"""
+SearchIndex for SimpleCP.
+
+Incrementally maintained inverted indexes (word tokens and trigrams)
+over item content, snippet names and tags. Kept current through the
+stores' delegate callbacks so searches touch only candidate items.
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from stores.clipboard_item import ClipboardItem
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Fuzzy ranking: minimum share of query trigrams a candidate must contain,
+# and score weights for exact substring hits, snippet-name hits and recency
+FUZZY_MIN_OVERLAP = 0.5
+FUZZY_EXACT_WEIGHT = 1.0
+FUZZY_NAME_WEIGHT = 0.5
+FUZZY_RECENCY_WEIGHT = 0.25
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split lowercased text into word tokens."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def fold(text: str) -> str:
+    """Casefold text (after lower(), which matches_search uses)."""
+    return text.lower().casefold()
+
+
+def trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of already folded text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _fields(item: ClipboardItem) -> List[str]:
+    # Full content: an externalized item's blob is read once, when it is indexed
+    fields = [item.content]
+    if item.snippet_name:
+        fields.append(item.snippet_name)
+    fields.extend(item.tags)
+    return fields
+
+
+def item_tokens(item: ClipboardItem) -> FrozenSet[str]:
+    """All searchable tokens of an item (content, snippet name, tags)."""
+    tokens: Set[str] = set()
+    for field in _fields(item):
+        tokens |= tokenize(field)
+    return frozenset(tokens)
+
+
+def item_trigrams(item: ClipboardItem) -> FrozenSet[str]:
+    """All folded trigrams of an item's searchable fields."""
+    grams: Set[str] = set()
+    for field in _fields(item):
+        grams |= trigrams(fold(field))
+    return frozenset(grams)
+
+
+class SearchIndex:
+    """
+    Inverted index with exact substring semantics.
+
+    Queries of three or more characters use the trigram postings: a
+    matching item must contain every trigram of the folded query, so
+    intersecting those posting lists (smallest first) yields a small
+    candidate set even for punctuation-heavy queries like "ttp://".
+
+    Shorter queries use the word-token postings. Every word run in a
+    query is a substring of some word run in a matching field, so
+    candidates are items holding, for each query token, a vocabulary
+    token that contains it.
+
+    Candidates are always verified with ClipboardItem.matches_search.
+    Short queries without word characters cannot be narrowed and
+    return None.
+
+    Bulk loads (store_loaded, folder_loaded) only stamp items and queue
+    them; their postings are built on the first query, so startup does
+    not pay for tokenizing every persisted item.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._item_tokens: Dict[str, FrozenSet[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._item_trigrams: Dict[str, FrozenSet[str]] = {}
+        self._items: Dict[str, ClipboardItem] = {}
+        # Items stamped but not yet tokenized (see add_lazy)
+        self._pending: Dict[str, ClipboardItem] = {}
+        # Monotonic placement stamps so callers can restore store order
+        self._stamps: Dict[str, int] = {}
+        self._counter = 0
+        self._build_lock = threading.Lock()
+
+    def add(self, item: ClipboardItem):
+        """Index item (re-indexes if already present)."""
+        clip_id = item.clip_id
+        if clip_id in self._items:
+            self._drop_postings(clip_id)
+            self._pending.pop(clip_id, None)
+        self._index_postings(item)
+        self._items[clip_id] = item
+        self.touch(item)
+
+    def add_lazy(self, item: ClipboardItem):
+        """Stamp item now and defer tokenizing it until the next query."""
+        clip_id = item.clip_id
+        if clip_id in self._items:
+            self._drop_postings(clip_id)
+        self._items[clip_id] = item
+        self._pending[clip_id] = item
+        self.touch(item)
+
+    def _ensure_built(self):
+        """Build postings for items queued by add_lazy."""
+        if not self._pending:
+            return
+        # Queries may run concurrently under a shared lock; one builds, the rest wait
+        with self._build_lock:
+            for item in self._pending.values():
+                self._index_postings(item)
+            self._pending.clear()
+
+    def _index_postings(self, item: ClipboardItem):
+        clip_id = item.clip_id
+        tokens = item_tokens(item)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(clip_id)
+        self._item_tokens[clip_id] = tokens
+        grams = item_trigrams(item)
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(clip_id)
+        self._item_trigrams[clip_id] = grams
+
+    def reindex(self, item: ClipboardItem):
+        """Refresh tokens of an indexed item, keeping its stamp."""
+        if item.clip_id not in self._items or item.clip_id in self._pending:
+            return  # pending items are tokenized from their current fields
+        stamp = self._stamps[item.clip_id]
+        self.add(item)
+        self._stamps[item.clip_id] = stamp
+
+    def discard(self, item: ClipboardItem):
+        """Remove item from the index."""
+        clip_id = item.clip_id
+        if self._items.get(clip_id) is not item:
+            return
+        self._drop_postings(clip_id)
+        self._pending.pop(clip_id, None)
+        del self._items[clip_id]
+        del self._stamps[clip_id]
+
+    def touch(self, item: ClipboardItem):
+        """Mark item as most recently placed."""
+        self._counter += 1
+        self._stamps[item.clip_id] = self._counter
+
+    def clear(self):
+        """Drop all entries."""
+        self._postings.clear()
+        self._item_tokens.clear()
+        self._trigrams.clear()
+        self._item_trigrams.clear()
+        self._items.clear()
+        self._pending.clear()
+        self._stamps.clear()
+
+    def rebuild(self, items: Iterable[ClipboardItem]):
+        """Index items from scratch, in placement order."""
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    @property
+    def pending(self) -> int:
+        """Number of items awaiting tokenization."""
+        return len(self._pending)
+
+    def stamp(self, item: ClipboardItem) -> int:
+        """Placement stamp of an indexed item (higher is newer)."""
+        return self._stamps.get(item.clip_id, 0)
+
+    def _drop_postings(self, clip_id: str):
+        for token in self._item_tokens.pop(clip_id, ()):
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(clip_id)
+                if not posting:
+                    del self._postings[token]
+        for gram in self._item_trigrams.pop(clip_id, ()):
+            posting = self._trigrams.get(gram)
+            if posting is not None:
+                posting.discard(clip_id)
+                if not posting:
+                    del self._trigrams[gram]
+
+    def _trigram_candidates(self, folded_query: str) -> Set[str]:
+        """IDs of items containing every trigram of the query."""
+        postings = []
+        for gram in trigrams(folded_query):
+            posting = self._trigrams.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def _token_candidates(self, query_token: str) -> Set[str]:
+        """IDs of items holding a token that contains query_token."""
+        result = set(self._postings.get(query_token, ()))
+        for token, posting in self._postings.items():
+            if query_token in token and token != query_token:
+                result |= posting
+        return result
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """Candidate clip IDs for query, or None if it cannot be narrowed."""
+        self._ensure_built()
+        folded_query = fold(query)
+        if len(folded_query) >= 3:
+            return self._trigram_candidates(folded_query)
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return None
+        # Rarest-looking (longest) tokens first to shrink the set early
+        result: Optional[Set[str]] = None
+        for query_token in sorted(query_tokens, key=len, reverse=True):
+            found = self._token_candidates(query_token)
+            result = found if result is None else result & found
+            if not result:
+                break
+        return result
+
+    def matches(self, query: str) -> Optional[List[ClipboardItem]]:
+        """Verified matches for query (unordered), or None to fall back to a scan."""
+        ids = self.candidates(query)
+        if ids is None:
+            return None
+        items = (self._items[clip_id] for clip_id in ids)
+        return [item for item in items if item.matches_search(query)]
+
+    def fuzzy_search(self, query: str, limit: int) -> List[Tuple[float, ClipboardItem]]:
+        """
+        Rank items by fuzzy match quality, keeping only the top `limit`.
+
+        Candidates share at least FUZZY_MIN_OVERLAP of the query's
+        trigrams, which tolerates a typo or two. Score combines that
+        overlap with bonuses for an exact substring hit, a snippet-name
+        hit and recency. Returns (score, item) pairs, best first.
+        """
+        folded_query = fold(query.strip())
+        if not folded_query or limit <= 0:
+            return []
+        self._ensure_built()
+
+        query_grams = trigrams(folded_query)
+        if query_grams:
+            hits: Counter = Counter()
+            for gram in query_grams:
+                hits.update(self._trigrams.get(gram, ()))
+            threshold = max(1, math.ceil(len(query_grams) * FUZZY_MIN_OVERLAP))
+            overlap = {
+                clip_id: count / len(query_grams)
+                for clip_id, count in hits.items()
+                if count >= threshold
+            }
+        else:
+            # Too short for trigrams: only exact token candidates qualify
+            overlap = dict.fromkeys(self.candidates(query) or (), 1.0)
+
+        newest = self._counter or 1
+
+        def scored():
+            for clip_id, quality in overlap.items():
+                item = self._items[clip_id]
+                score = quality + FUZZY_RECENCY_WEIGHT * self._stamps[clip_id] / newest
+                if item.matches_search(query):
+                    score += FUZZY_EXACT_WEIGHT
+                if item.snippet_name and folded_query in fold(item.snippet_name):
+                    score += FUZZY_NAME_WEIGHT
+                yield score, item
+
+        return heapq.nlargest(limit, scored(), key=lambda pair: pair[0])
+
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        if event == "did_insert":
+            self.add(args[1])
+        elif event == "did_delete":
+            self.discard(args[1])
+        elif event == "item_moved":
+            self.touch(args[2])
+        elif event == "item_updated":
+            self.reindex(args[0])
+        elif event == "store_loaded":
+            # Items arrive most recent first; stamp oldest first
+            self.clear()
+            for item in reversed(args[0]):
+                self.add_lazy(item)
+        elif event == "store_cleared":
+            self.clear()
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        if event == "snippet_added":
+            self.add(args[1])
+        elif event == "snippet_deleted":
+            self.discard(args[1])
+        elif event == "snippet_updated":
+            self.reindex(args[1])
+        elif event == "snippet_moved":
+            self.touch(args[2])
+        elif event == "folder_loaded":
+            for item in args[1]:
+                self.add_lazy(item)
+        elif event == "folder_deleted":
+            for item in args[1]:
+                self.discard(item)
+        elif event == "store_cleared":
+            self.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchIndex(items={len(self._items)}, pending={len(self._pending)}, "
+            f"tokens={len(self._postings)}, trigrams={len(self._trigrams)})"
+        )
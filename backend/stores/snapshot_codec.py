@@ -0,0 +1,106 @@
+"""
+Snapshot codec for SimpleCP.
+
+Compact, versioned on-disk format for store snapshots (history and
+snippet folder shards). A snapshot is a small header followed by the
+items as positional rows under a single field list, so field names are
+stored once rather than per item.
+
+    b"SCPS" | format version (1 byte) | codec (1 byte) | compression (1 byte) | payload
+
+The payload is encoded with orjson when it is installed and falls back
+to compact stdlib json otherwise (or for content orjson rejects, such
+as lone surrogates), then optionally zlib or lzma compressed. Version 1
+files have no compression byte. Files without the header are read as
+plain JSON, so older snapshots keep loading. Exports stay plain JSON.
+"""
+
+import json
+from typing import Any, Dict, List, Sequence
+
+from stores.compression import METHODS, compress, decompress
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+MAGIC = b"SCPS"
+FORMAT_VERSION = 2
+CODEC_JSON = 1
+CODEC_ORJSON = 2
+
+# Row layout; matches ClipboardItem.to_dict keys
+ITEM_FIELDS = (
+    "content",
+    "timestamp",
+    "clip_id",
+    "content_type",
+    "display_length",
+    "display_string",
+    "source_app",
+    "item_type",
+    "has_name",
+    "snippet_name",
+    "folder_path",
+    "tags",
+)
+# Only present for items whose content lives in the blob store; added to
+# the field list only when some item in the snapshot has them
+OPTIONAL_FIELDS = ("blob", "content_length")
+
+
+class SnapshotFormatError(ValueError):
+    """Raised for snapshots with an unknown version or codec."""
+
+
+def encode_items(items: Sequence[Dict[str, Any]], compression: str = "none") -> bytes:
+    """Encode item dicts as a binary snapshot, optionally compressed."""
+    fields = ITEM_FIELDS
+    if any(OPTIONAL_FIELDS[0] in item for item in items):
+        fields = ITEM_FIELDS + OPTIONAL_FIELDS
+    body = [list(fields), [[item.get(field) for field in fields] for item in items]]
+    codec, payload = CODEC_JSON, None
+    if ORJSON_AVAILABLE:
+        try:
+            codec, payload = CODEC_ORJSON, orjson.dumps(body)
+        except TypeError:
+            pass  # orjson.JSONEncodeError subclasses TypeError; use the lenient codec
+    if payload is None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    header = MAGIC + bytes((FORMAT_VERSION, codec, METHODS[compression]))
+    return header + compress(payload, compression)
+
+
+def decode_items(data: bytes) -> List[Dict[str, Any]]:
+    """Decode a snapshot (binary, or legacy plain JSON) into item dicts."""
+    if not data.startswith(MAGIC):
+        return json.loads(data)
+    version, codec = data[4], data[5]
+    if version == 1:
+        payload = data[6:]
+    elif version == FORMAT_VERSION:
+        try:
+            payload = decompress(data[7:], data[6])
+        except ValueError as e:
+            raise SnapshotFormatError(f"Unreadable snapshot payload: {e}") from e
+    else:
+        raise SnapshotFormatError(f"Unsupported snapshot version {version}")
+    if codec not in (CODEC_JSON, CODEC_ORJSON):
+        raise SnapshotFormatError(f"Unknown snapshot codec {codec}")
+    if codec == CODEC_ORJSON and ORJSON_AVAILABLE:
+        fields, rows = orjson.loads(payload)
+    else:
+        # orjson output is standard JSON, so stdlib json reads either codec
+        fields, rows = json.loads(payload)
+    items = [dict(zip(fields, row)) for row in rows]
+    optional = [field for field in OPTIONAL_FIELDS if field in fields]
+    if optional:
+        for item in items:
+            for field in optional:
+                if item[field] is None:
+                    del item[field]
+    return items
@@ -5,10 +5,14 @@ Manages organized snippet folders for reusable text clips.
 Based on Flycut's favorites store pattern with folder organization.
 """
 
+import itertools
 import logging
 import re
-from typing import Dict, List, Optional, Callable
+import threading
+from typing import Dict, List, Optional, Callable, Set, Tuple
 from stores.clipboard_item import ClipboardItem
+from stores.clip_list import ClipList
+from stores.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -24,24 +28,53 @@ class SnippetStore:
     - Folder management (create, rename, delete)
     - Search across all snippets
     - Delegate pattern for UI updates
-    - Modified flag for persistence tracking
+    - Modified flag and per-folder dirty set for persistence tracking
+    - Version counter that increases on every change (for HTTP ETags)
+    - Lazy folders, loaded from persistence on first access
     """
 
     def __init__(self):
         """Initialize SnippetStore."""
-        self.folders: Dict[str, List[ClipboardItem]] = {}
+        # Folder name -> ordered, clip_id-keyed snippets
+        self.folders: Dict[str, ClipList] = {}
+        # clip_id -> folder name, for O(1) by-ID lookups across folders
+        self._locations: Dict[str, str] = {}
+        # Folder name -> placement sequence; folder order follows it, and
+        # unlike a position it does not shift when another folder goes
+        self._folder_seq: Dict[str, int] = {}
+        self._folder_counter = itertools.count()
         self.modified = False
+        # Bumped on every change; lazy loads do not count as changes
+        self.version = 0
+        # Folders changed since the last take_dirty_folders()
+        self.dirty_folders: Set[str] = set()
+        # Folder name -> (loader, item count) for folders not yet loaded
+        self._lazy: Dict[str, Tuple[Callable[[], List[ClipboardItem]], int]] = {}
+        # Serializes lazy loads, which may run under a shared (read) manager lock
+        self._load_lock = threading.RLock()
         self._delegates: List[Callable] = []
+        # Called with an item after its content changes, before delegates
+        # hear about it (the manager uses it to move large content to blobs)
+        self.content_hook: Optional[Callable[[ClipboardItem], None]] = None
+
+        # Inverted index kept current through the delegate callbacks
+        self.search_index = SearchIndex()
+        self.add_delegate(self.search_index.handle_snippet_event)
 
     def create_folder(self, folder_name: str) -> bool:
         """Create new folder."""
         if folder_name in self.folders:
             return False
-        self.folders[folder_name] = []
-        self.modified = True
+        self._place_folder(folder_name, ClipList())
+        self.mark_dirty(folder_name)
         self._notify_delegates("folder_created", folder_name)
         return True
 
+    def _place_folder(self, folder_name: str, folder: ClipList):
+        """Add a folder at the end of the folder order."""
+        self.folders[folder_name] = folder
+        self._folder_seq[folder_name] = next(self._folder_counter)
+
     def _sanitize_folder_name(self, name: str) -> str:
         """Sanitize folder name to prevent issues with special characters."""
         if not name:
@@ -75,10 +108,14 @@ class SnippetStore:
             return {"success": False, "error": "TARGET_EXISTS", "message": f"Folder '{new_name}' already exists"}
 
         try:
-            self.folders[new_name] = self.folders.pop(old_name)
+            self._ensure_loaded(old_name)
+            self._place_folder(new_name, self.folders.pop(old_name))
+            del self._folder_seq[old_name]
             for item in self.folders[new_name]:
                 item.folder_path = new_name
-            self.modified = True
+                self._locations[item.clip_id] = new_name
+            self.dirty_folders.discard(old_name)
+            self.mark_dirty(new_name)
             self._notify_delegates("folder_renamed", old_name, new_name)
             logger.info(f"rename_folder: SUCCESS - '{old_name}' -> '{new_name}'")
             return {"success": True, "message": f"Folder renamed from '{old_name}' to '{new_name}'"}
@@ -94,34 +131,47 @@ class SnippetStore:
         """Delete folder and all its snippets."""
         if folder_name not in self.folders:
             return False
-        del self.folders[folder_name]
+        # An unloaded folder has nothing indexed; drop it without reading it
+        self._lazy.pop(folder_name, None)
+        removed = list(self.folders.pop(folder_name))
+        del self._folder_seq[folder_name]
+        for item in removed:
+            self._locations.pop(item.clip_id, None)
+        self.dirty_folders.discard(folder_name)
         self.modified = True
-        self._notify_delegates("folder_deleted", folder_name)
+        self.version += 1
+        self._notify_delegates("folder_deleted", folder_name, removed)
         return True
 
     def add_snippet(self, folder_name: str, item: ClipboardItem) -> bool:
         """Add snippet to folder."""
         if folder_name not in self.folders:
             self.create_folder(folder_name)
+        self._ensure_loaded(folder_name)
         if not item.has_name:
             item.make_snippet(name=item.snippet_name or item.display_string, folder=folder_name)
+        # Clip IDs are unique across folders; re-adding relocates the snippet
+        previous_folder = self._locations.get(item.clip_id)
+        if previous_folder is not None:
+            self.folders[previous_folder].remove(item.clip_id)
+            self.mark_dirty(previous_folder)
         item.folder_path = folder_name
-        self.folders[folder_name].append(item)
-        self.modified = True
+        self.folders[folder_name].push_back(item)
+        self._locations[item.clip_id] = folder_name
+        self.mark_dirty(folder_name)
         self._notify_delegates("snippet_added", folder_name, item)
         return True
 
     def delete_snippet(self, folder_name: str, clip_id: str) -> bool:
         """Delete snippet by ID."""
-        if folder_name not in self.folders:
+        self._ensure_loaded(folder_name)
+        if self._locations.get(clip_id) != folder_name:
             return False
-        for i, item in enumerate(self.folders[folder_name]):
-            if item.clip_id == clip_id:
-                deleted_item = self.folders[folder_name].pop(i)
-                self.modified = True
-                self._notify_delegates("snippet_deleted", folder_name, deleted_item)
-                return True
-        return False
+        deleted_item = self.folders[folder_name].remove(clip_id)
+        del self._locations[clip_id]
+        self.mark_dirty(folder_name)
+        self._notify_delegates("snippet_deleted", folder_name, deleted_item)
+        return True
 
     def update_snippet(
         self, folder_name: str, clip_id: str,
@@ -130,37 +180,37 @@ class SnippetStore:
         new_tags: Optional[List[str]] = None,
     ) -> bool:
         """Update snippet properties."""
-        if folder_name not in self.folders:
+        self._ensure_loaded(folder_name)
+        if self._locations.get(clip_id) != folder_name:
             return False
-        for item in self.folders[folder_name]:
-            if item.clip_id == clip_id:
-                if new_content is not None:
-                    item.content = new_content
-                    item.display_string = item._create_display_string()
-                if new_name is not None:
-                    item.snippet_name = new_name
-                if new_tags is not None:
-                    item.tags = new_tags
-                self.modified = True
-                self._notify_delegates("snippet_updated", folder_name, item)
-                return True
-        return False
+        item = self.folders[folder_name].get(clip_id)
+        if new_content is not None:
+            item.set_content(new_content)
+            if self.content_hook is not None:
+                self.content_hook(item)
+        if new_name is not None:
+            item.snippet_name = new_name
+        if new_tags is not None:
+            item.tags = new_tags
+        self.mark_dirty(folder_name)
+        self._notify_delegates("snippet_updated", folder_name, item)
+        return True
 
     def move_snippet(self, from_folder: str, to_folder: str, clip_id: str) -> bool:
         """Move snippet between folders."""
-        if from_folder not in self.folders:
+        self._ensure_loaded(from_folder)
+        self._ensure_loaded(to_folder)
+        if self._locations.get(clip_id) != from_folder:
             return False
-        for i, item in enumerate(self.folders[from_folder]):
-            if item.clip_id == clip_id:
-                snippet = self.folders[from_folder].pop(i)
-                snippet.folder_path = to_folder
-                if to_folder not in self.folders:
-                    self.create_folder(to_folder)
-                self.folders[to_folder].append(snippet)
-                self.modified = True
-                self._notify_delegates("snippet_moved", from_folder, to_folder, snippet)
-                return True
-        return False
+        snippet = self.folders[from_folder].remove(clip_id)
+        snippet.folder_path = to_folder
+        if to_folder not in self.folders:
+            self.create_folder(to_folder)
+        self.folders[to_folder].push_back(snippet)
+        self._locations[clip_id] = to_folder
+        self.mark_dirty(from_folder, to_folder)
+        self._notify_delegates("snippet_moved", from_folder, to_folder, snippet)
+        return True
 
     def get_folder_names(self) -> List[str]:
         """Get list of all folder names."""
@@ -168,26 +218,147 @@ class SnippetStore:
 
     def get_folder_items(self, folder_name: str) -> List[ClipboardItem]:
         """Get all snippets in a folder."""
-        return self.folders.get(folder_name, []).copy()
+        self._ensure_loaded(folder_name)
+        return list(self.folders.get(folder_name, ()))
+
+    def get_folder_page(
+        self, folder_name: str, after: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[List[ClipboardItem], Optional[str]]:
+        """
+        Keyset page of a folder after cursor `after`.
+
+        Returns:
+            (items, next_cursor)
+
+        Raises:
+            KeyError: if `after` is not a cursor
+        """
+        self._ensure_loaded(folder_name)
+        folder = self.folders.get(folder_name)
+        if folder is None:
+            if after is not None:
+                raise KeyError(after)
+            return [], None
+        return folder.page(after, limit)
 
     def get_all_snippets(self) -> Dict[str, List[ClipboardItem]]:
         """Get all snippets organized by folder."""
-        return {folder: items.copy() for folder, items in self.folders.items()}
+        self.load_all()
+        return {folder: list(items) for folder, items in self.folders.items()}
 
     def search(self, query: str) -> List[ClipboardItem]:
-        """Search all snippets matching query."""
-        results = []
-        for items in self.folders.values():
-            results.extend([item for item in items if item.matches_search(query)])
-        return results
+        """Search all snippets matching query, in folder order."""
+        self.load_all()
+        matches = self.search_index.matches(query)
+        if matches is None:
+            results = []
+            for items in self.folders.values():
+                results.extend([item for item in items if item.matches_search(query)])
+            return results
+        folder_rank = {name: rank for rank, name in enumerate(self.folders)}
+        return sorted(
+            matches,
+            key=lambda item: (
+                folder_rank.get(self._locations.get(item.clip_id), -1),
+                self.search_index.stamp(item),
+            ),
+        )
+
+    def fuzzy_search(self, query: str, limit: int) -> List[Tuple[float, ClipboardItem]]:
+        """Top-`limit` fuzzy matches as (score, item), best first."""
+        self.load_all()
+        return self.search_index.fuzzy_search(query, limit)
+
+    def order_key(self, clip_id: str) -> Tuple[int, int]:
+        """Sort key of a snippet: folder order, then position in the folder."""
+        folder_name = self._locations[clip_id]
+        return self._folder_seq[folder_name], self.folders[folder_name].rank(clip_id)
 
     def get_snippet_by_id(self, clip_id: str) -> Optional[ClipboardItem]:
         """Find snippet by ID across all folders."""
-        for items in self.folders.values():
-            for item in items:
-                if item.clip_id == clip_id:
-                    return item
-        return None
+        if clip_id not in self._locations:
+            self.load_all()
+        folder_name = self._locations.get(clip_id)
+        if folder_name is None:
+            return None
+        return self.folders[folder_name].get(clip_id)
+
+    def get_snippet_folder(self, clip_id: str) -> Optional[str]:
+        """Return the folder holding a snippet, or None."""
+        if clip_id not in self._locations:
+            self.load_all()
+        return self._locations.get(clip_id)
+
+    def load_folder(self, folder_name: str, items: List[ClipboardItem]):
+        """Populate a folder from persisted items."""
+        folder = self.folders.get(folder_name)
+        if folder is None:
+            folder = ClipList()
+            self._place_folder(folder_name, folder)
+        for item in items:
+            folder.push_back(item)
+            self._locations[item.clip_id] = folder_name
+        self._notify_delegates("folder_loaded", folder_name, items)
+
+    def add_lazy_folder(
+        self, folder_name: str, loader: Callable[[], List[ClipboardItem]], count: int = 0
+    ):
+        """Register a persisted folder whose items are loaded on first access."""
+        if folder_name in self.folders:
+            return
+        self._place_folder(folder_name, ClipList())
+        self._lazy[folder_name] = (loader, count)
+
+    def _ensure_loaded(self, folder_name: str):
+        if folder_name not in self._lazy:
+            return
+        with self._load_lock:
+            entry = self._lazy.get(folder_name)
+            if entry is not None:
+                self.load_folder(folder_name, entry[0]())
+                # Dropped only once loaded, so concurrent readers wait above
+                del self._lazy[folder_name]
+
+    def load_all(self):
+        """Load every lazy folder."""
+        if not self._lazy:
+            return
+        with self._load_lock:
+            for folder_name in list(self._lazy):
+                self._ensure_loaded(folder_name)
+
+    def is_folder_loaded(self, folder_name: str) -> bool:
+        """Whether a folder's items are in memory."""
+        return folder_name in self.folders and folder_name not in self._lazy
+
+    def folder_count(self, folder_name: str) -> int:
+        """Number of snippets in a folder, without loading it."""
+        if folder_name in self._lazy:
+            return self._lazy[folder_name][1]
+        return len(self.folders.get(folder_name, ()))
+
+    def mark_dirty(self, *folder_names: str):
+        """Flag folders as changed since the last save."""
+        self.dirty_folders.update(folder_names)
+        self.modified = True
+        self.version += 1
+
+    def take_dirty_folders(self) -> Set[str]:
+        """Return and reset the changed-folder set (call before serializing)."""
+        dirty, self.dirty_folders = self.dirty_folders, set()
+        self.modified = False
+        return dirty
+
+    def clear(self):
+        """Remove all folders and snippets."""
+        self.folders.clear()
+        self._folder_seq.clear()
+        self._locations.clear()
+        self._lazy.clear()
+        self.dirty_folders.clear()
+        self.modified = True
+        self.version += 1
+        self._notify_delegates("store_cleared")
 
     def add_delegate(self, callback: Callable):
         """Add delegate callback for store updates."""
@@ -209,7 +380,7 @@ class SnippetStore:
 
     def __len__(self) -> int:
         """Return total number of snippets across all folders."""
-        return sum(len(items) for items in self.folders.values())
+        return len(self._locations) + sum(count for _, count in self._lazy.values())
 
     def __repr__(self) -> str:
         return f"SnippetStore(folders={len(self.folders)}, snippets={len(self)})"
@@ -0,0 +1,344 @@
+"""
+SQLiteStorage for SimpleCP.
+
+Optional SQLite persistence for the history and snippet stores.
+Items live in one indexed table, so each mutation is a row-level
+write instead of a file rewrite, and an FTS5 trigram index answers
+substring searches. The in-memory stores stay the full working set; this class
+mirrors them through the same delegate callbacks the journal uses, so
+it lowers write and search cost, not memory use.
+
+Writes happen immediately inside an open transaction and become
+durable on commit(), which the write-behind persister calls.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from stores.blob_store import BlobStore
+from stores.clipboard_item import ClipboardItem
+
+logger = logging.getLogger(__name__)
+
+HISTORY = "history"
+SNIPPET = "snippet"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    clip_id TEXT NOT NULL,
+    folder TEXT,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (kind, clip_id)
+);
+CREATE INDEX IF NOT EXISTS clips_order ON clips (kind, folder, position);
+CREATE TABLE IF NOT EXISTS folders (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS clips_fts
+USING fts5(content, snippet_name, tags, tokenize='trigram');
+"""
+
+
+class SQLiteStorage:
+    """
+    Row-level store persistence with FTS5 search.
+
+    History rows are ordered by descending position (most recent
+    first); snippet rows and folders by ascending position, matching
+    the in-memory stores. The FTS table shares rowids with clips.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # One connection shared by API, monitor and persister threads
+        self._lock = threading.RLock()
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 or trigram (pre 3.34) keep in-memory search
+            logger.warning(f"FTS5 trigram search unavailable: {e}")
+            self.fts_enabled = False
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT MAX(p) FROM (SELECT MAX(position) AS p FROM clips "
+            "UNION ALL SELECT MAX(position) FROM folders)"
+        ).fetchone()
+        self._position = row[0] or 0
+        self._history_store = None
+
+    # Lifecycle
+    def attach(self, history_store, snippet_store):
+        """Follow store mutations through their delegate callbacks."""
+        self._history_store = history_store
+        history_store.add_delegate(self.handle_history_event)
+        snippet_store.add_delegate(self.handle_snippet_event)
+
+    def commit(self):
+        """Make pending writes durable."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        """Commit and close the connection."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a metadata value."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        """Write a metadata value."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    # Loading and migration
+    def load(self) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """All persisted data as (history_data, snippet_data), snapshot layout."""
+        with self._lock:
+            history = [
+                json.loads(data)
+                for (data,) in self._conn.execute(
+                    "SELECT data FROM clips WHERE kind = ? AND folder IS NULL "
+                    "ORDER BY position DESC",
+                    (HISTORY,),
+                )
+            ]
+            snippets: Dict[str, List[Dict[str, Any]]] = {
+                name: [] for (name,) in self._conn.execute("SELECT name FROM folders ORDER BY position")
+            }
+            for folder, data in self._conn.execute(
+                "SELECT folder, data FROM clips WHERE kind = ? ORDER BY folder, position",
+                (SNIPPET,),
+            ):
+                snippets.setdefault(folder, []).append(json.loads(data))
+        return history, snippets
+
+    def import_data(
+        self,
+        history_data: List[Dict[str, Any]],
+        snippet_data: Dict[str, List[Dict[str, Any]]],
+        blobs: Optional[BlobStore] = None,
+    ):
+        """Bulk-load snapshot-layout data (used for the JSON migration)."""
+        with self._lock:
+            for data in reversed(history_data):
+                self._put(HISTORY, ClipboardItem.from_dict(data, blobs), None)
+            for folder, items in snippet_data.items():
+                self._create_folder(folder)
+                for data in items:
+                    self._put(SNIPPET, ClipboardItem.from_dict(data, blobs), folder)
+            self._conn.commit()
+
+    def reindex_external(self, blobs: BlobStore) -> int:
+        """
+        Rebuild FTS rows of externalized items from their full content.
+
+        Databases written before full-text indexing only hold the
+        preview of such items. Returns the number of rows reindexed.
+        """
+        if not self.fts_enabled:
+            return 0
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM clips").fetchall()
+            count = 0
+            for rowid, data in rows:
+                item_data = json.loads(data)
+                if "blob" in item_data:
+                    self._index(rowid, ClipboardItem.from_dict(item_data, blobs), replace=True)
+                    count += 1
+        return count
+
+    # Queries
+    def search(self, query: str) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Candidate (history_ids, snippet_ids) for a substring query via FTS5.
+
+        Returns None when FTS cannot answer (no FTS5, or fewer than three
+        characters, which trigrams cannot match); callers fall back to
+        the in-memory search. Candidates should still be verified.
+        """
+        if not self.fts_enabled or len(query) < 3:
+            return None
+        phrase = '"' + query.replace('"', '""') + '"'
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.kind, c.clip_id FROM clips_fts JOIN clips c ON c.id = clips_fts.rowid "
+                "WHERE clips_fts MATCH ? "
+                "ORDER BY c.kind, "
+                "(SELECT position FROM folders WHERE name = c.folder), "
+                "CASE WHEN c.kind = ? THEN -c.position ELSE c.position END",
+                (phrase, HISTORY),
+            ).fetchall()
+        history = [clip_id for kind, clip_id in rows if kind == HISTORY]
+        snippets = [clip_id for kind, clip_id in rows if kind == SNIPPET]
+        return history, snippets
+
+    def count(self, kind: str) -> int:
+        """Number of stored rows of a kind."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM clips WHERE kind = ?", (kind,)).fetchone()[0]
+
+    # Writes
+    def _next_position(self) -> int:
+        self._position += 1
+        return self._position
+
+    def _put(self, kind: str, item: ClipboardItem, folder: Optional[str], position: Optional[int] = None):
+        """Insert or replace a row, moving it to a new position."""
+        if position is None:
+            position = self._next_position()
+        data = json.dumps(item.to_dict())
+        row = self._conn.execute(
+            "SELECT id FROM clips WHERE kind = ? AND clip_id = ?", (kind, item.clip_id)
+        ).fetchone()
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO clips (kind, clip_id, folder, position, data) VALUES (?, ?, ?, ?, ?)",
+                (kind, item.clip_id, folder, position, data),
+            )
+            rowid = cursor.lastrowid
+        else:
+            rowid = row[0]
+            self._conn.execute(
+                "UPDATE clips SET folder = ?, position = ?, data = ? WHERE id = ?",
+                (folder, position, data, rowid),
+            )
+        self._index(rowid, item, replace=row is not None)
+
+    def _update(self, kind: str, item: ClipboardItem):
+        """Rewrite a row's data in place."""
+        row = self._conn.execute(
+            "SELECT id FROM clips WHERE kind = ? AND clip_id = ?", (kind, item.clip_id)
+        ).fetchone()
+        if row is None:
+            return
+        self._conn.execute(
+            "UPDATE clips SET data = ? WHERE id = ?", (json.dumps(item.to_dict()), row[0])
+        )
+        self._index(row[0], item, replace=True)
+
+    def _index(self, rowid: int, item: ClipboardItem, replace: bool):
+        if not self.fts_enabled:
+            return
+        if replace:
+            self._conn.execute("DELETE FROM clips_fts WHERE rowid = ?", (rowid,))
+        self._conn.execute(
+            "INSERT INTO clips_fts (rowid, content, snippet_name, tags) VALUES (?, ?, ?, ?)",
+            (rowid, item.content, item.snippet_name or "", " ".join(item.tags)),
+        )
+
+    def _delete_where(self, where: str, params: tuple):
+        if self.fts_enabled:
+            self._conn.execute(
+                f"DELETE FROM clips_fts WHERE rowid IN (SELECT id FROM clips WHERE {where})", params
+            )
+        self._conn.execute(f"DELETE FROM clips WHERE {where}", params)
+
+    def _create_folder(self, name: str):
+        self._conn.execute(
+            "INSERT OR IGNORE INTO folders (name, position) VALUES (?, ?)",
+            (name, self._next_position()),
+        )
+
+    def _renumber_history(self):
+        """Rewrite history positions from the store order (rare inserts mid-list)."""
+        items = list(self._history_store)
+        for item in reversed(items):
+            self._conn.execute(
+                "UPDATE clips SET position = ? WHERE kind = ? AND clip_id = ?",
+                (self._next_position(), HISTORY, item.clip_id),
+            )
+
+    # Delegate callbacks
+    def handle_history_event(self, event: str, *args):
+        """HistoryStore delegate callback."""
+        with self._lock:
+            if event == "did_insert":
+                self._put(HISTORY, args[1], None)
+                if args[0] and self._history_store is not None:
+                    self._renumber_history()
+            elif event == "did_delete":
+                self._delete_where("kind = ? AND clip_id = ?", (HISTORY, args[1].clip_id))
+            elif event == "item_moved":
+                self._conn.execute(
+                    "UPDATE clips SET position = ? WHERE kind = ? AND clip_id = ?",
+                    (self._next_position(), HISTORY, args[2].clip_id),
+                )
+            elif event == "item_updated":
+                self._update(HISTORY, args[0])
+            elif event == "store_cleared":
+                self._delete_where("kind = ?", (HISTORY,))
+
+    def handle_snippet_event(self, event: str, *args):
+        """SnippetStore delegate callback."""
+        with self._lock:
+            if event == "folder_created":
+                self._create_folder(args[0])
+            elif event == "folder_renamed":
+                old, new = args
+                self._conn.execute(
+                    "UPDATE folders SET name = ?, position = ? WHERE name = ?",
+                    (new, self._next_position(), old),
+                )
+                self._conn.execute(
+                    "UPDATE clips SET folder = ?, data = json_set(data, '$.folder_path', ?) "
+                    "WHERE kind = ? AND folder = ?",
+                    (new, new, SNIPPET, old),
+                )
+            elif event == "folder_deleted":
+                self._conn.execute("DELETE FROM folders WHERE name = ?", (args[0],))
+                self._delete_where("kind = ? AND folder = ?", (SNIPPET, args[0]))
+            elif event == "snippet_added":
+                self._put(SNIPPET, args[1], args[0])
+            elif event == "snippet_updated":
+                self._update(SNIPPET, args[1])
+            elif event == "snippet_deleted":
+                self._delete_where("kind = ? AND clip_id = ?", (SNIPPET, args[1].clip_id))
+            elif event == "snippet_moved":
+                self._create_folder(args[1])
+                self._put(SNIPPET, args[2], args[1])
+            elif event == "store_cleared":
+                self._conn.execute("DELETE FROM folders")
+                self._delete_where("kind = ?", (SNIPPET,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Row counts and FTS availability."""
+        return {
+            "path": self.path,
+            "history_rows": self.count(HISTORY),
+            "snippet_rows": self.count(SNIPPET),
+            "fts_enabled": self.fts_enabled,
+        }
+
+    def __repr__(self) -> str:
+        return f"SQLiteStorage(path={self.path!r}, fts={self.fts_enabled})"
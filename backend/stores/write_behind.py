@@ -0,0 +1,175 @@
+"""
+WriteBehindPersister for SimpleCP.
+
+Coalesces bursts of store mutations into a single save.
+Mutations mark the stores dirty; a background thread flushes once
+the stores have been quiet for `delay` seconds, or at the latest
+`max_latency` seconds after the first unsaved change.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a failed flush is retried in the background
+RETRY_DELAY = 1.0
+
+
+class WriteBehindPersister:
+    """
+    Debounced, bounded-latency flush scheduler.
+
+    With delay <= 0 every mark_dirty() flushes inline, which matches
+    the old save-per-mutation behaviour.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[], None],
+        delay: float = 0.0,
+        max_latency: Optional[float] = None,
+        on_flush: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Initialize persister.
+
+        Args:
+            flush: Callable that writes the stores to disk
+            delay: Quiet period (seconds) before flushing
+            max_latency: Upper bound (seconds) from first change to flush
+            on_flush: Optional callback receiving each flush lag in ms
+        """
+        self._flush_fn = flush
+        self.delay = delay
+        self.max_latency = max(delay, max_latency if max_latency is not None else delay * 10)
+        self.on_flush = on_flush
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._dirty_since: Optional[float] = None
+        self._last_dirty: Optional[float] = None
+        # No background flush before this time (set after a failure)
+        self._retry_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._stats: Dict[str, Any] = {
+            "mutations": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "last_flush_lag_ms": 0.0,
+            "max_flush_lag_ms": 0.0,
+        }
+
+    def mark_dirty(self):
+        """Record a mutation and schedule a flush."""
+        with self._cond:
+            now = time.monotonic()
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._last_dirty = now
+            self._stats["mutations"] += 1
+            background = self.delay > 0 and not self._stopped
+            if background:
+                self._ensure_thread()
+                self._cond.notify()
+        if not background:
+            self.flush()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="simplecp-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                if self._dirty_since is None:
+                    self._cond.wait()
+                    continue
+                deadline = max(
+                    min(self._last_dirty + self.delay, self._dirty_since + self.max_latency),
+                    self._retry_at,
+                )
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                # Write outside the condition so mutators never wait on disk I/O
+                self._cond.release()
+                try:
+                    self.flush()
+                finally:
+                    self._cond.acquire()
+
+    def flush(self) -> bool:
+        """Write pending changes now. Returns True if anything was flushed."""
+        with self._flush_lock:
+            with self._cond:
+                dirty_since = self._dirty_since
+                if dirty_since is None:
+                    return False
+                self._dirty_since = self._last_dirty = None
+            try:
+                self._flush_fn()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}", exc_info=True)
+                self._stats["failed_flushes"] += 1
+                self._reschedule(dirty_since)
+                return False
+            self._retry_at = 0.0
+            lag_ms = (time.monotonic() - dirty_since) * 1000
+            self._stats["flushes"] += 1
+            self._stats["last_flush_lag_ms"] = lag_ms
+            self._stats["max_flush_lag_ms"] = max(self._stats["max_flush_lag_ms"], lag_ms)
+        if self.on_flush is not None:
+            try:
+                self.on_flush(lag_ms)
+            except Exception as e:
+                logger.error(f"Flush callback error: {e}", exc_info=True)
+        return True
+
+    def _reschedule(self, dirty_since: float):
+        """Mark the failed changes pending again and retry after RETRY_DELAY."""
+        with self._cond:
+            now = time.monotonic()
+            self._dirty_since = dirty_since
+            self._last_dirty = self._last_dirty or now
+            self._retry_at = now + max(self.delay, RETRY_DELAY)
+            if self.delay > 0 and not self._stopped:
+                self._ensure_thread()
+                self._cond.notify()
+
+    def stop(self):
+        """Stop the background thread and flush anything pending."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are unflushed changes."""
+        return self._dirty_since is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Flush counters and lag metrics."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = self._dirty_since is not None
+            stats["pending_age_ms"] = (
+                (time.monotonic() - self._dirty_since) * 1000 if self._dirty_since else 0.0
+            )
+        stats["delay_ms"] = self.delay * 1000
+        stats["max_latency_ms"] = self.max_latency * 1000
+        return stats
+
+    def __repr__(self) -> str:
+        return f"WriteBehindPersister(delay={self.delay}, max_latency={self.max_latency})"
@@ -48,6 +48,40 @@ def test_get_history_empty(client):
     assert response.json() == []
 
 
+def test_get_history_cursor_pagination(client):
+    """Test keyset pagination is stable across inserts at the front."""
+    test_client, manager = client
+    for i in range(5):
+        manager.add_clip(f"page item {i}")
+
+    first = test_client.get("/api/history?limit=2")
+    assert [i["content"] for i in first.json()] == ["page item 4", "page item 3"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    manager.add_clip("inserted meanwhile")
+    second = test_client.get(f"/api/history?after={cursor}&limit=2")
+    assert [i["content"] for i in second.json()] == ["page item 2", "page item 1"]
+
+    last = test_client.get(f"/api/history?after={second.headers['X-Next-Cursor']}&limit=2")
+    assert [i["content"] for i in last.json()] == ["page item 0"]
+    assert "X-Next-Cursor" not in last.headers
+
+    assert test_client.get("/api/history?after=missing").status_code == 400
+
+
+def test_history_cursor_survives_deleting_its_item(client):
+    """Test deleting the cursor item mid-walk continues after it."""
+    test_client, manager = client
+    for i in range(5):
+        manager.add_clip(f"page item {i}")
+
+    first = test_client.get("/api/history?limit=2")
+    test_client.delete(f"/api/history/{first.json()[-1]['clip_id']}")
+    second = test_client.get(f"/api/history?after={first.headers['X-Next-Cursor']}&limit=2")
+    assert second.status_code == 200
+    assert [i["content"] for i in second.json()] == ["page item 2", "page item 1"]
+
+
 def test_get_recent_history(client):
     """Test getting recent history."""
     test_client, manager = client
@@ -88,3 +88,102 @@ def test_import_snippets(client):
     import_data = {"version": "1.0", "snippets": []}
     response = test_client.post("/api/import", json=import_data)
     assert response.status_code == 200
+
+
+def test_search_fuzzy_ranked(client):
+    """Test fuzzy search tolerates typos and ranks snippet names first."""
+    test_client, manager = client
+    for i in range(30):
+        manager.add_clip(f"unrelated clip {i}")
+    manager.add_clip("reset password link")
+    manager.add_snippet_direct("hunter2", "Password", "Secrets", [])
+
+    response = test_client.get("/api/search?q=pasword&mode=fuzzy&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [s["snippet_name"] for s in data["snippets"]] == ["Password"]
+    assert [h["content"] for h in data["history"]] == ["reset password link"]
+
+    response = test_client.get("/api/search?q=pasword&mode=fuzzy&limit=1")
+    data = response.json()
+    assert len(data["history"]) + len(data["snippets"]) == 1
+
+    response = test_client.get("/api/search?q=x&mode=bogus")
+    assert response.status_code == 422
+
+
+def test_search_cursor_pagination(client):
+    """Test exact search pages through history then snippets."""
+    test_client, manager = client
+    for i in range(3):
+        manager.add_clip(f"needle history {i}")
+    manager.add_snippet_direct("needle snippet", "Needle", "Folder", [])
+
+    seen = []
+    after = None
+    while True:
+        params = {"q": "needle", "limit": 2}
+        if after:
+            params["after"] = after
+        response = test_client.get("/api/search", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen += [i["content"] for i in data["history"] + data["snippets"]]
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+
+    assert seen == [f"needle history {i}" for i in (2, 1, 0)] + ["needle snippet"]
+    response = test_client.get("/api/search", params={"q": "needle", "after": "history:nope"})
+    assert response.status_code == 400
+
+
+def test_search_cursor_survives_deleting_and_recopying(client):
+    """Test search cursors resume by store order, not by looking up the item."""
+    test_client, manager = client
+    for i in range(5):
+        manager.add_clip(f"needle history {i}")
+    manager.add_snippet_direct("needle snippet", "Needle", "Folder", [])
+
+    first = test_client.get("/api/search", params={"q": "needle", "limit": 2})
+    assert [i["content"] for i in first.json()["history"]] == ["needle history 4", "needle history 3"]
+    test_client.delete(f"/api/history/{first.json()['history'][-1]['clip_id']}")
+    manager.add_clip("needle history 4")
+
+    params = {"q": "needle", "limit": 2, "after": first.headers["X-Next-Cursor"]}
+    second = test_client.get("/api/search", params=params)
+    assert second.status_code == 200
+    assert [i["content"] for i in second.json()["history"]] == ["needle history 2", "needle history 1"]
+
+    params["after"] = second.headers["X-Next-Cursor"]
+    last = test_client.get("/api/search", params=params).json()
+    assert [i["content"] for i in last["history"] + last["snippets"]] == [
+        "needle history 0", "needle snippet"
+    ]
+
+
+def test_endpoints_with_sqlite_storage():
+    """Test the API works unchanged on the SQLite backend."""
+    import tempfile
+    import shutil
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        manager = ClipboardManager(data_dir=temp_dir, storage="sqlite")
+        test_client = TestClient(create_app(manager))
+        for i in range(3):
+            manager.add_clip(f"sqlite clip {i}")
+        manager.add_snippet_direct("sqlite snippet", "Snip", "Folder", [])
+
+        response = test_client.get("/api/history", params={"limit": 2})
+        assert [h["content"] for h in response.json()] == ["sqlite clip 2", "sqlite clip 1"]
+        assert response.headers.get("X-Next-Cursor")
+
+        response = test_client.get("/api/search", params={"q": "SQLite sn"})
+        assert [s["content"] for s in response.json()["snippets"]] == ["sqlite snippet"]
+
+        response = test_client.get("/api/snippets/Folder")
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
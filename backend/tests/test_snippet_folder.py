@@ -278,3 +278,21 @@ def test_folder_delegate_error_handling(client):
 
     # Clean up
     manager.snippet_store.remove_delegate(bad_delegate)
+
+
+def test_folder_snippets_cursor_pagination(client):
+    """Test paging through a snippet folder."""
+    test_client, manager = client
+    for i in range(3):
+        manager.add_snippet_direct(f"body {i}", f"S{i}", "Paged", [])
+
+    first = test_client.get("/api/snippets/Paged?limit=2")
+    assert [s["snippet_name"] for s in first.json()] == ["S0", "S1"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = test_client.get(f"/api/snippets/Paged?after={cursor}&limit=2")
+    assert [s["snippet_name"] for s in second.json()] == ["S2"]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert test_client.get("/api/snippets/Missing?after=x").status_code == 400
+    assert test_client.get("/api/snippets/Missing").json() == []
@@ -14,6 +14,7 @@ os.environ["ENVIRONMENT"] = "test"
 os.environ["LOG_TO_FILE"] = "false"
 os.environ["ENABLE_SENTRY"] = "false"
 
+from clipboard_backend import MemoryClipboard
 from clipboard_manager import ClipboardManager
 from stores.clipboard_item import ClipboardItem
 from api.server import create_app
@@ -60,6 +61,30 @@ def api_client(clipboard_manager) -> TestClient:
     return TestClient(app)
 
 
+@pytest.fixture
+def manager(tmp_path) -> Generator[ClipboardManager, None, None]:
+    """
+    ClipboardManager with its own data dir and an in-memory clipboard.
+
+    Unlike clipboard_manager, nothing is shared between tests.
+    """
+    manager = ClipboardManager(data_dir=str(tmp_path), clipboard=MemoryClipboard())
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def app(manager):
+    """FastAPI app serving `manager`."""
+    return create_app(manager)
+
+
+@pytest.fixture
+def client(app) -> TestClient:
+    """Test client for `app`."""
+    return TestClient(app)
+
+
 @pytest.fixture
 def mock_clipboard_content():
     """Sample clipboard content for testing."""
@@ -80,9 +105,8 @@ def reset_clipboard_manager(clipboard_manager):
         clipboard_manager.history_store.clear()
     except Exception:
         pass
-    # SnippetStore doesn't have a clear() method, clear folders manually
     try:
-        clipboard_manager.snippet_store.folders.clear()
+        clipboard_manager.snippet_store.clear()
     except Exception:
         pass
 
@@ -0,0 +1,96 @@
+"""
+Unit tests for conditional GETs driven by store version counters.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from api.server import create_app
+
+
+@pytest.mark.unit
+class TestStoreVersions:
+    """Test that every change advances the store version."""
+
+    def test_history_version_advances(self, manager):
+        versions = [manager.history_store.version]
+        clip = manager.add_clip("one")
+        versions.append(manager.history_store.version)
+        manager.add_clip("one")  # duplicate moves to top
+        versions.append(manager.history_store.version)
+        manager.delete_history_item(clip.clip_id)
+        versions.append(manager.history_store.version)
+        manager.clear_history()
+        versions.append(manager.history_store.version)
+        assert versions == sorted(set(versions))
+
+    def test_snippet_version_advances(self, manager):
+        before = manager.snippet_store.version
+        snippet = manager.add_snippet_direct("body", "name", "A")
+        after_add = manager.snippet_store.version
+        manager.update_snippet("A", snippet.clip_id, new_name="renamed")
+        after_update = manager.snippet_store.version
+        manager.delete_snippet_folder("A")
+        assert before < after_add < after_update < manager.snippet_store.version
+
+
+@pytest.mark.api
+class TestConditionalGets:
+    """Test ETag / If-None-Match handling."""
+
+    @pytest.mark.parametrize(
+        "path, store",
+        [
+            ("/api/history", "history"),
+            ("/api/history/recent", "history"),
+            ("/api/history/folders", "history"),
+            ("/api/snippets", "snippets"),
+            ("/api/snippets/folders", "snippets"),
+            ("/api/snippets/Work", "snippets"),
+        ],
+    )
+    def test_unchanged_store_returns_304(self, client, manager, path, store):
+        manager.add_clip("hello")
+        manager.add_snippet_direct("body", "name", "Work")
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+
+        repeat = client.get(path, headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat.headers["etag"] == etag
+
+        # A change to the other store keeps the tag; a change to this one does not
+        if store == "history":
+            manager.add_snippet_direct("more", "other", "Work")
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+            manager.add_clip("changed")
+        else:
+            manager.add_clip("changed")
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+            manager.add_snippet_direct("more", "other", "Work")
+        changed = client.get(path, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_304_does_not_touch_the_stores(self, client, manager, monkeypatch):
+        manager.add_clip("hello")
+        etag = client.get("/api/history/recent").headers["etag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("store read on a 304")
+
+        monkeypatch.setattr(manager, "get_recent_history", fail)
+        assert client.get("/api/history/recent", headers={"If-None-Match": etag}).status_code == 304
+
+    def test_if_none_match_lists_and_weak_tags(self, client, manager):
+        manager.add_clip("hello")
+        etag = client.get("/api/history").headers["etag"]
+        for header in (f'"other", {etag}', f"W/{etag}", "*"):
+            assert client.get("/api/history", headers={"If-None-Match": header}).status_code == 304
+        assert client.get("/api/history", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_tags_differ_between_server_instances(self, manager):
+        first = TestClient(create_app(manager)).get("/api/history").headers["etag"]
+        second = TestClient(create_app(manager)).get("/api/history").headers["etag"]
+        assert first != second
@@ -0,0 +1,88 @@
+"""
+Unit tests for running blocking manager work off the API event loop.
+"""
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+from api.executor import ManagerExecutor
+
+
+@pytest.mark.api
+class TestManagerExecutor:
+    """Test that slow saves do not stall other requests."""
+
+    @pytest.mark.asyncio
+    async def test_reads_stay_responsive_during_save(self, manager, app):
+        """A writer queued behind a real save does not stall the event loop."""
+        for i in range(2_000):
+            manager.add_clip(f"clip {i} " * 20)
+
+        # Hold save_stores open while it has the store lock shared
+        holding = threading.Event()
+        release = threading.Event()
+        take_dirty_folders = manager.snippet_store.take_dirty_folders
+
+        def held_take_dirty_folders():
+            holding.set()
+            release.wait(10)
+            return take_dirty_folders()
+
+        manager.snippet_store.take_dirty_folders = held_take_dirty_folders
+        saver = threading.Thread(target=manager.save_stores)
+        saver.start()
+        # A read on the loop would block the loop, and with it this test's release
+        safety = threading.Timer(5, release.set)
+        safety.start()
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                assert holding.wait(5)
+                clip_id = manager.history_store[0].clip_id
+                delete = asyncio.create_task(client.delete(f"/api/history/{clip_id}"))
+                while not manager.lock.get_stats()["waiting_writers"]:
+                    await asyncio.sleep(0.01)
+
+                # These all take the store lock, so they queue behind the writer
+                paths = [
+                    "/api/history", "/api/history/recent", "/api/history/folders",
+                    "/api/snippets/folders", "/api/folders", "/api/stats", "/api/status",
+                ]
+                reads = [asyncio.create_task(client.get(path)) for path in paths]
+                start = time.perf_counter()
+                root = await client.get("/")
+                elapsed = time.perf_counter() - start
+                assert not delete.done()
+                assert not any(read.done() for read in reads)
+
+                release.set()
+                assert (await delete).status_code == 200
+                assert [(await read).status_code for read in reads] == [200] * len(paths)
+        finally:
+            release.set()
+            safety.cancel()
+            saver.join(timeout=10)
+
+        assert root.status_code == 200
+        assert elapsed < 1
+        stats = app.state.executor.get_stats()
+        assert stats["writes"] == 1 and stats["reads"] == len(paths)
+        app.state.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_writes_run_in_order(self):
+        executor = ManagerExecutor(max_readers=2)
+        seen = []
+
+        def record(value):
+            time.sleep(0.01 * (3 - value))
+            seen.append(value)
+
+        await asyncio.gather(*(executor.write(record, i) for i in range(3)))
+        assert seen == [0, 1, 2]
+        executor.shutdown()
+
+    def test_invalid_pool_size(self):
+        with pytest.raises(ValueError):
+            ManagerExecutor(max_readers=0)
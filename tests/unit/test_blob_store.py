@@ -0,0 +1,181 @@
+"""
+Unit tests for the content-addressed blob store.
+"""
+import os
+import time
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.blob_store import BlobStore
+from stores.clipboard_item import ClipboardItem
+
+BIG = "log line with payload\n" * 1000  # 22,000 characters
+
+
+def _blob_files(manager):
+    return [
+        name
+        for _, _, names in os.walk(manager.blob_store.path)
+        for name in names
+        if not name.endswith(".tmp")
+    ]
+
+
+def _age_blobs(manager, seconds=60):
+    """Backdate blob mtimes so collection treats them as old."""
+    past = time.time() - seconds
+    for root, _, names in os.walk(manager.blob_store.path):
+        for name in names:
+            os.utime(os.path.join(root, name), (past, past))
+
+
+@pytest.mark.unit
+class TestBlobStore:
+    """Test blob storage and item externalization."""
+
+    def test_put_and_read(self, tmp_path):
+        """Blobs are written once and read back through mmap."""
+        store = BlobStore(str(tmp_path / "blobs"))
+        item = ClipboardItem(BIG + "\ud800")
+        ref = store.put(item.content, item.content_digest)
+        store.put(item.content, item.content_digest)
+        assert ref.read() == item.content
+        assert ref.length == len(item.content)
+        stats = store.get_stats()
+        assert stats["blobs_written"] == 1
+        assert stats["blobs_reused"] == 1
+
+    def test_externalized_item_keeps_preview(self, tmp_path):
+        """Externalized items hold a preview and serialize a reference."""
+        store = BlobStore(str(tmp_path / "blobs"))
+        item = ClipboardItem(BIG)
+        digest = item.content_digest
+        item.externalize(store)
+
+        assert item.is_external
+        assert item.content_length == len(BIG)
+        assert item.content_digest == digest
+        assert item.display_string == ClipboardItem(BIG).display_string
+        assert item.content == BIG
+
+        data = item.to_dict()
+        assert data["blob"] == digest
+        assert len(data["content"]) < len(BIG)
+        assert item.to_dict(inline=True)["content"] == BIG
+        restored = ClipboardItem.from_dict(data, store)
+        assert restored.content == BIG
+        assert restored == item
+        with pytest.raises(ValueError):
+            ClipboardItem.from_dict(data)
+
+
+@pytest.mark.unit
+class TestClipboardManagerBlobs:
+    """Test manager use of the blob store."""
+
+    def test_large_clips_stored_once(self, tmp_path):
+        """History and snippets with identical large content share a blob."""
+        manager = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        clip = manager.add_clip(BIG)
+        manager.add_clip("small clip")
+        snippet = manager.add_snippet_direct(BIG, "Log", "Work")
+        assert clip.is_external and snippet.is_external
+        assert not manager.history_store[0].is_external
+        assert len(_blob_files(manager)) == 1
+        assert manager.journal.size < 4096
+        manager.shutdown()
+        assert os.path.getsize(manager.history_file) < 4096
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        loaded = reloaded.history_store.get_item_by_id(clip.clip_id)
+        assert loaded.is_external
+        assert loaded.content == BIG
+        assert reloaded.get_folder_snippets("Work")[0].content == BIG
+        assert reloaded.search_all("payload")["history"] == [loaded]
+        assert reloaded.export_snippets()["snippets"][0]["content"] == BIG
+
+    def test_unreferenced_blobs_are_collected(self, tmp_path):
+        """Compaction removes blobs once no item refers to them."""
+        manager = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        first = manager.add_clip(BIG)
+        manager.add_snippet_direct("other " + BIG, "Other", "Work")
+        manager.save_stores()
+        _age_blobs(manager)
+
+        manager.delete_history_item(first.clip_id)
+        manager.save_stores()
+        assert len(_blob_files(manager)) == 1
+        assert manager.get_persistence_stats()["blobs"]["collected"] == 1
+
+    def test_blobs_referenced_by_unloaded_folders_survive(self, tmp_path):
+        """Collection reads references from shards that are not loaded."""
+        manager = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        manager.add_snippet_direct(BIG, "Log", "Work")
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        assert not reloaded.snippet_store.is_folder_loaded("Work")
+        _age_blobs(reloaded)
+        reloaded.add_clip("trigger")
+        reloaded.save_stores()
+        assert len(_blob_files(reloaded)) == 1
+        assert reloaded.get_folder_snippets("Work")[0].content == BIG
+
+    def test_collection_reads_blob_lists_from_the_manifest(self, tmp_path):
+        """Unloaded shards are not opened to find their blob references."""
+        manager = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        manager.add_snippet_direct(BIG, "Log", "Work")
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), blob_threshold=1024)
+        persistence = reloaded.persistence
+        reads = []
+        read_shard = persistence._read_shard
+        persistence._read_shard = lambda entry: reads.append(entry) or read_shard(entry)
+        _age_blobs(reloaded)
+        reloaded.add_clip("trigger")
+        reloaded.save_stores()
+        reloaded.save_stores()
+        assert reads == []
+        assert len(_blob_files(reloaded)) == 1
+        assert reloaded.get_folder_snippets("Work")[0].content == BIG
+
+    def test_sqlite_backend_uses_blobs(self, tmp_path):
+        """Row data holds blob references; content reloads intact."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite", blob_threshold=1024)
+        clip = manager.add_clip(BIG)
+        snippet = manager.add_snippet_direct("short", "Log", "Work")
+        manager.update_snippet("Work", snippet.clip_id, new_content=BIG + "tail")
+        assert manager.snippet_store.get_snippet_by_id(snippet.clip_id).is_external
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), storage="sqlite", blob_threshold=1024)
+        assert reloaded.history_store.get_item_by_id(clip.clip_id).content == BIG
+        assert reloaded.get_folder_snippets("Work")[0].content == BIG + "tail"
+        assert len(_blob_files(reloaded)) == 2
+
+    @pytest.mark.parametrize("storage", ["json", "sqlite"])
+    def test_search_matches_beyond_the_preview(self, tmp_path, storage):
+        """Externalized clips are searched on their full content, not the preview."""
+        content = "x" * 70_000 + "NEEDLE"
+        manager = ClipboardManager(data_dir=str(tmp_path), storage=storage, blob_threshold=1024)
+        clip = manager.add_clip(content)
+        assert clip.is_external and "NEEDLE" not in clip.search_text
+        assert clip.matches_search("needle")
+        assert manager.search_all("NEEDLE")["history"] == [clip]
+        assert [item for _, item in manager.history_store.fuzzy_search("NEEDLE", 5)] == [clip]
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), storage=storage, blob_threshold=1024)
+        assert [item.clip_id for item in reloaded.search_all("NEEDLE")["history"]] == [clip.clip_id]
+
+    def test_sqlite_reindexes_preview_only_fts_rows(self, tmp_path):
+        """Databases that indexed only the preview get full-text rows on the next start."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite", blob_threshold=1024)
+        clip = manager.add_clip("x" * 70_000 + "NEEDLE")
+        conn = manager.database._conn
+        conn.execute("UPDATE clips_fts SET content = ?", (clip.search_text,))
+        conn.execute("DELETE FROM meta WHERE key = 'fts_full_text'")
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), storage="sqlite", blob_threshold=1024)
+        assert reloaded.database.search("NEEDLE") == ([clip.clip_id], [])
@@ -0,0 +1,149 @@
+"""
+Unit tests for the push change feed and the /api/events stream.
+"""
+import asyncio
+import json
+import threading
+import pytest
+from api.change_feed import ChangeFeed
+
+
+async def _take(iterator, count, timeout=5):
+    """Next `count` events from an async iterator."""
+    return [await asyncio.wait_for(iterator.__anext__(), timeout) for _ in range(count)]
+
+
+async def _read_stream(app, path, count, headers=()):
+    """Drive the ASGI app directly until `count` SSE events arrive, then disconnect."""
+    body = bytearray()
+    done = asyncio.Event()
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if body.count(b"event: change") >= count:
+                done.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path.split("?")[0],
+        "raw_path": path.split("?")[0].encode(),
+        "query_string": path.partition("?")[2].encode(),
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.decode().splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.mark.unit
+class TestChangeFeed:
+    """Test sequencing, resume and resync."""
+
+    @pytest.mark.asyncio
+    async def test_store_events_become_compact_sequenced_events(self, manager):
+        feed = ChangeFeed()
+        manager.history_store.add_delegate(feed.handle_history_event)
+        manager.snippet_store.add_delegate(feed.handle_snippet_event)
+        events = feed.events(after=feed.seq)
+        first = manager.add_clip("first")
+        manager.add_clip("second")
+        manager.add_clip("first")  # duplicate moves to top
+        manager.delete_history_item(first.clip_id)
+        manager.add_snippet_direct("body", "name", "Folder")
+
+        received = await _take(events, 6)
+        assert [(e["store"], e["op"]) for e in received] == [
+            ("history", "insert"),
+            ("history", "insert"),
+            ("history", "move"),
+            ("history", "delete"),
+            ("snippets", "folder_create"),
+            ("snippets", "insert"),
+        ]
+        seqs = [e["seq"] for e in received]
+        assert seqs == sorted(seqs) and len(set(seqs)) == 6
+        assert received[0]["item"]["content"] == "first"
+        assert received[3]["clip_id"] == first.clip_id
+        assert received[5]["folder"] == "Folder"
+        await events.aclose()
+        assert feed.get_stats()["subscribers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_only_missed_events(self):
+        feed = ChangeFeed()
+        start = feed.seq
+        for i in range(5):
+            feed.publish("history", "delete", clip_id=str(i))
+        events = feed.events(after=start + 2)
+        replayed = await _take(events, 3)
+        assert [e["clip_id"] for e in replayed] == ["2", "3", "4"]
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_resume_point_gets_resync(self):
+        feed = ChangeFeed(backlog=3)
+        start = feed.seq
+        for i in range(10):
+            feed.publish("history", "delete", clip_id=str(i))
+        for after in (start, feed.seq + 100):  # fell off the backlog / from a later run
+            events = feed.events(after=after)
+            assert (await _take(events, 1))[0]["op"] == "resync"
+            await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_told_to_resync(self):
+        feed = ChangeFeed(queue_limit=5)
+        events = feed.events(after=feed.seq)
+        feed.publish("history", "clear")
+        assert (await _take(events, 1))[0]["op"] == "clear"
+        # Publish from another thread while nobody drains the queue
+        thread = threading.Thread(
+            target=lambda: [feed.publish("history", "clear") for _ in range(20)]
+        )
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.05)
+        assert (await _take(events, 1))[0]["op"] == "resync"
+        assert feed.get_stats()["overflows"] > 0
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_idle_stream_yields_keepalive(self):
+        feed = ChangeFeed()
+        events = feed.events(idle_timeout=0.01)
+        assert (await _take(events, 1)) == [None]
+        await events.aclose()
+
+
+@pytest.mark.api
+class TestEventsEndpoint:
+    """Test /api/events over SSE."""
+
+    @pytest.mark.asyncio
+    async def test_stream_and_resume_with_last_event_id(self, manager, app):
+        manager.add_clip("one")
+        manager.add_clip("two")
+        start = app.state.change_feed.seq - 2
+
+        events = await _read_stream(app, f"/api/events?after={start}", 2)
+        assert [e["item"]["content"] for e in events] == ["one", "two"]
+
+        resumed = await _read_stream(
+            app, "/api/events", 1, headers=[("last-event-id", str(start + 1))]
+        )
+        assert [e["item"]["content"] for e in resumed] == ["two"]
+        assert app.state.change_feed.get_stats()["subscribers"] == 0
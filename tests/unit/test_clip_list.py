@@ -0,0 +1,130 @@
+"""
+Unit tests for ClipList ordered container.
+"""
+import pytest
+from stores.clip_list import ClipList
+from stores.clipboard_item import ClipboardItem
+from stores.history_store import HistoryStore
+
+
+def _items(n):
+    return [ClipboardItem(content=f"item {i}") for i in range(n)]
+
+
+@pytest.mark.unit
+class TestClipList:
+    """Test ClipList operations."""
+
+    def test_front_back_and_positional_access(self):
+        """Items keep insertion order from both ends."""
+        a, b, c = _items(3)
+        clips = ClipList([b])
+        clips.push_front(a)
+        clips.push_back(c)
+
+        assert list(clips) == [a, b, c]
+        assert clips.item_at(0) is a
+        assert clips.item_at(-1) is c
+        assert clips.slice(1) == [b, c]
+        assert clips.index_of(c.clip_id) == 2
+        with pytest.raises(IndexError):
+            clips.item_at(3)
+
+    def test_move_remove_and_pop_back(self):
+        """Moves and removals relink neighbours."""
+        a, b, c = _items(3)
+        clips = ClipList([a, b, c])
+
+        assert clips.move_to_front(c.clip_id) is c
+        assert list(clips) == [c, a, b]
+        assert clips.remove(a.clip_id) is a
+        assert clips.pop_back() is b
+        assert list(clips) == [c]
+        assert a.clip_id not in clips
+        assert clips.remove(a.clip_id) is None
+
+    def test_insert_middle_and_readd_replaces(self):
+        """Middle inserts work and re-adding an ID keeps one entry."""
+        a, b, c = _items(3)
+        clips = ClipList([a, c])
+        clips.insert(1, b)
+        assert list(clips) == [a, b, c]
+
+        clips.push_back(a)
+        assert list(clips) == [b, c, a]
+        assert len(clips) == 3
+
+    def test_keyset_page(self):
+        """Pages continue after the cursor and report the next cursor."""
+        items = _items(5)
+        clips = ClipList(items)
+
+        page, cursor = clips.page(limit=2)
+        assert page == items[:2] and cursor.endswith(items[1].clip_id)
+        page, cursor = clips.page(after=cursor, limit=3)
+        assert page == items[2:] and cursor is None
+        with pytest.raises(KeyError):
+            clips.page(after="missing")
+
+    def test_page_survives_cursor_delete_and_move(self):
+        """A deleted or re-copied cursor item does not break the walk."""
+        items = _items(6)
+        clips = ClipList(items)
+
+        page, cursor = clips.page(limit=2)
+        clips.remove(items[1].clip_id)
+        page, cursor = clips.page(after=cursor, limit=2)
+        assert page == items[2:4]
+
+        clips.move_to_front(items[3].clip_id)
+        page, cursor = clips.page(after=cursor, limit=2)
+        assert page == items[4:] and cursor is None
+
+    def test_middle_inserts_keep_pages_ordered(self):
+        """Repeated inserts at one spot renumber without reordering."""
+        items = _items(3)
+        clips = ClipList(items)
+        for item in _items(30):
+            clips.insert(1, item)
+        expected = list(clips)
+
+        walked, cursor = [], None
+        while True:
+            page, cursor = clips.page(after=cursor, limit=4)
+            walked += page
+            if cursor is None:
+                break
+        assert walked == expected
+
+
+@pytest.mark.unit
+class TestHistoryStoreOrdering:
+    """Test HistoryStore ordering on top of ClipList."""
+
+    def test_recopy_and_eviction_order(self):
+        """Re-copied items move to front and the oldest item is evicted."""
+        store = HistoryStore(max_items=3, display_count=2)
+        a, b, c, d = _items(4)
+        for item in (a, b, c):
+            store.insert(item)
+
+        store.insert(ClipboardItem(content=a.content))
+        assert store.get_items() == [a, c, b]
+
+        store.insert(d)
+        assert store.get_items() == [d, a, c]
+        assert store.get_item_by_id(b.clip_id) is None
+
+    def test_auto_folders_and_delete(self):
+        """Auto folders chunk items past display_count."""
+        store = HistoryStore(max_items=10, display_count=2)
+        items = _items(5)
+        for item in items:
+            store.insert(item)
+
+        folders = store.get_auto_folders()
+        assert [f["name"] for f in folders] == ["3-4", "5-5"]
+        assert folders[1]["items"] == [items[0]]
+
+        assert store.delete_item(1) is items[3]
+        assert store.get_recent_items() == [items[4], items[2]]
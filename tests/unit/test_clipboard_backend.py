@@ -0,0 +1,59 @@
+"""
+Unit tests for clipboard backends.
+"""
+import pytest
+from clipboard_backend import HelperProcessBackend, create_backend
+
+
+@pytest.mark.unit
+class TestClipboardBackends:
+    """Test ClipboardManager polling through a backend."""
+
+    def test_check_clipboard_uses_backend(self, manager):
+        manager.clipboard.write("copied elsewhere")
+        item = manager.check_clipboard()
+        assert item.content == "copied elsewhere"
+        assert manager.check_clipboard() is None
+
+    def test_unchanged_count_skips_read(self, manager):
+        """With a change counter an idle poll does not read the clipboard."""
+        manager.clipboard.write("once")
+        manager.check_clipboard()
+        reads = manager.clipboard.get_stats()["reads"]
+        for _ in range(5):
+            assert manager.check_clipboard() is None
+        assert manager.clipboard.get_stats()["reads"] == reads
+
+    def test_missed_changes_are_counted(self, manager):
+        manager.clipboard.write("first")
+        manager.check_clipboard()
+        manager.clipboard.write("overwritten")
+        manager.clipboard.write("second")
+        assert manager.check_clipboard().content == "second"
+        assert manager.missed_clipboard_changes == 1
+
+    def test_copy_is_not_recaptured(self, manager):
+        item = manager.add_clip("stored clip")
+        manager.add_clip("newer clip")
+        assert manager.copy_to_clipboard(item.clip_id)
+        assert manager.clipboard.read() == "stored clip"
+        assert manager.check_clipboard() is None
+        assert manager.missed_clipboard_changes == 0
+
+    def test_helper_process_round_trip(self):
+        """The helper process serves requests and is restarted if it dies."""
+        backend = HelperProcessBackend("memory")
+        try:
+            backend.write("line one\nline two \ud800")
+            assert backend.read() == "line one\nline two \ud800"
+            assert backend.change_count() == 1
+            backend._process.kill()
+            backend._process.wait()
+            assert backend.read() == ""
+            assert backend.get_stats()["restarts"] == 1
+        finally:
+            backend.close()
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_backend("clipboard.exe")
@@ -0,0 +1,119 @@
+"""
+Unit tests for snapshot and in-memory content compression.
+"""
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.compression import CompressedText, DecompressedCache, compress, decompress, METHODS
+from stores.snapshot_codec import SnapshotFormatError, decode_items, encode_items
+
+TEXT = "compressible clipboard text " * 400  # 11,200 characters
+
+
+@pytest.mark.unit
+class TestCompression:
+    """Test compression helpers and the decompressed-content LRU."""
+
+    @pytest.mark.parametrize("method", ["none", "zlib", "lzma"])
+    def test_round_trip(self, method):
+        data = TEXT.encode()
+        assert decompress(compress(data, method), METHODS[method]) == data
+
+    def test_corrupt_data_raises_value_error(self):
+        with pytest.raises(ValueError):
+            decompress(b"not zlib", METHODS["zlib"])
+
+    def test_cache_is_bounded_by_chars(self):
+        """Least recently used texts are evicted past the budget."""
+        cache = DecompressedCache(max_chars=10)
+        assert cache.get("a", lambda: "aaaa") == "aaaa"
+        assert cache.get("b", lambda: "bbbb") == "bbbb"
+        cache.get("a", lambda: pytest.fail("should be cached"))
+        cache.get("c", lambda: "cccc")
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["chars"] == 8
+        assert stats["hits"] == 1
+        cache.get("b", lambda: "bbbb")
+        assert cache.get_stats()["misses"] == 4
+
+    @pytest.mark.parametrize("compression", ["zlib", "lzma"])
+    def test_compressed_snapshot(self, compression):
+        """Compressed snapshots are smaller and decode to the same items."""
+        data = [ClipboardItem(f"{TEXT} {i}").to_dict() for i in range(20)]
+        plain = encode_items(data)
+        packed = encode_items(data, compression)
+        assert len(packed) < len(plain) / 10
+        assert decode_items(packed) == data
+        with pytest.raises(SnapshotFormatError):
+            decode_items(packed[:7] + b"garbage")
+
+    def test_version_one_snapshots_still_load(self):
+        """Snapshots written before the compression byte decode unchanged."""
+        data = [ClipboardItem("old snapshot").to_dict()]
+        current = encode_items(data)
+        legacy = current[:4] + bytes((1, current[5])) + current[7:]
+        assert decode_items(legacy) == data
+
+
+@pytest.mark.unit
+class TestCompressedItems:
+    """Test items holding compressed content."""
+
+    def test_item_compression_is_transparent(self):
+        item = ClipboardItem(TEXT)
+        digest = item.content_digest
+        item.compress("zlib")
+        assert item.is_compressed
+        assert isinstance(item._content, CompressedText)
+        assert len(item._content.data) < len(TEXT) / 10
+        assert item.content == TEXT
+        assert item.content_length == len(TEXT)
+        assert item.content_digest == digest
+        assert item == ClipboardItem(TEXT)
+        assert item.to_dict()["content"] == TEXT
+        assert item.matches_search("clipboard text")
+
+    def test_display_string_does_not_inflate(self, monkeypatch):
+        item = ClipboardItem("  \n" + TEXT)
+        expected = item.display_string
+        item.compress("zlib")
+
+        def inflate(self):
+            raise AssertionError("display string inflated the content")
+
+        monkeypatch.setattr(CompressedText, "text", inflate)
+        assert item.display_string == expected
+        item.update_display_length(20)
+        monkeypatch.undo()
+        assert item.display_string == expected[:17] + "..."
+
+    def test_manager_compresses_large_clips(self, tmp_path):
+        """Large clips are compressed in memory and snapshots are compressed."""
+        manager = ClipboardManager(
+            data_dir=str(tmp_path),
+            snapshot_format="binary",
+            compression="zlib",
+            compress_threshold=1024,
+        )
+        big = manager.add_clip(TEXT)
+        small = manager.add_clip("short clip")
+        snippet = manager.add_snippet_direct("short", "Name", "Work")
+        manager.update_snippet("Work", snippet.clip_id, new_content=TEXT + " edited")
+        assert big.is_compressed and not small.is_compressed
+        assert snippet.is_compressed
+        assert manager.search_all("clipboard text")["history"] == [big]
+        manager.shutdown()
+        assert manager.history_file.endswith(".snap")
+
+        reloaded = ClipboardManager(
+            data_dir=str(tmp_path), compression="zlib", compress_threshold=1024
+        )
+        loaded = reloaded.history_store.get_item_by_id(big.clip_id)
+        assert loaded.is_compressed
+        assert loaded.content == TEXT
+        assert reloaded.get_folder_snippets("Work")[0].content == TEXT + " edited"
+        assert "content_cache" in reloaded.get_persistence_stats()
+
+        with pytest.raises(ValueError):
+            ClipboardManager(data_dir=str(tmp_path), compression="brotli")
@@ -0,0 +1,78 @@
+"""
+Unit tests for the content-type classifier.
+"""
+import time
+import pytest
+from stores.clipboard_item import ClipboardItem, content_digest
+from stores.content_classifier import ContentClassifier, SNIFF_CHARS, sample
+
+
+@pytest.mark.unit
+class TestContentClassifier:
+    """Test classification rules, bounds and caching."""
+
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("https://example.com", "url"),
+            ("  www.example.com\n", "url"),
+            ("user@example.com", "email"),
+            ('\t{"key": [1, 2]}\n', "json"),
+            ("{not json}", "text"),
+            ("select * from users", "sql"),
+            ("$ ls -la", "shell"),
+            ("def main(): pass", "code"),
+            ("42.5", "number"),
+            ("/usr/local/bin", "path"),
+            ("plain words", "text"),
+            ("", "text"),
+        ],
+    )
+    def test_rules(self, content, expected):
+        """Short clips classify as before."""
+        assert ContentClassifier().classify(content) == expected
+
+    def test_sample_is_bounded(self):
+        """Samples copy at most the sniff window, stripped."""
+        s = sample("   " + "x" * (SNIFF_CHARS * 10) + "y \n")
+        assert len(s.head) == SNIFF_CHARS
+        assert s.head[0] == "x"
+        assert s.last == "y"
+        assert s.length == SNIFF_CHARS * 10 + 1
+        assert not s.complete
+
+    def test_large_payloads_classify_quickly(self):
+        """Multi-megabyte clips are classified from the sniff window."""
+        classifier = ContentClassifier()
+        payloads = {
+            "json": "[" + ",".join(['{"k": "v"}'] * 400_000) + "]",
+            "text": "[" + "x" * 4_000_000 + "]",
+            "code": "import os\n" + "y" * 4_000_000,
+        }
+        for expected, content in payloads.items():
+            start = time.perf_counter()
+            assert classifier.classify(content) == expected
+            assert time.perf_counter() - start < 0.05
+
+    def test_results_are_cached_by_digest(self):
+        """Repeated content is classified once."""
+        classifier = ContentClassifier(cache_size=2)
+        for content in ("a@b.co", "a@b.co", "x", "y", "a@b.co"):
+            classifier.classify(content, content_digest(content))
+        stats = classifier.get_stats()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_misses"] == 4
+        assert stats["cache_size"] == 2
+
+    def test_registered_rules_take_precedence(self):
+        """Custom rules slot into the pipeline."""
+        classifier = ContentClassifier()
+        classifier.register("color", lambda s: s.complete and s.head.startswith("#"), before="url")
+        assert classifier.classify("#ff8800") == "color"
+        with pytest.raises(ValueError):
+            classifier.register("x", lambda s: False, before="missing")
+
+    def test_clipboard_item_uses_classifier(self):
+        """Items get their type from the pipeline unless one is given."""
+        assert ClipboardItem("SELECT 1").content_type == "sql"
+        assert ClipboardItem("SELECT 1", content_type="text").content_type == "text"
@@ -209,3 +209,71 @@ class TestHistoryStore:
 
         # Note: Actual behavior depends on implementation
         # This test documents expected behavior
+
+
+@pytest.mark.unit
+class TestHistoryStoreDigestIndex:
+    """Test digest-indexed deduplication."""
+
+    @pytest.fixture
+    def history_store(self):
+        """Create a fresh history store for each test."""
+        return HistoryStore(max_items=5, display_count=3)
+
+    def test_duplicate_moves_existing_to_top(self, history_store):
+        """Re-inserting known content moves the original item to the top."""
+        first = ClipboardItem(content="alpha")
+        history_store.insert(first)
+        history_store.insert(ClipboardItem(content="beta"))
+
+        assert history_store.insert(ClipboardItem(content="alpha")) is False
+        assert len(history_store) == 2
+        assert history_store[0] is first
+
+    def test_index_tracks_delete_clear_and_eviction(self, history_store):
+        """Deleted, cleared and evicted items are no longer duplicates."""
+        for i in range(6):
+            history_store.insert(ClipboardItem(content=f"clip {i}"))
+        # "clip 0" was evicted by the size limit
+        assert history_store.find_duplicate(ClipboardItem(content="clip 0")) == -1
+        assert history_store.find_duplicate(ClipboardItem(content="clip 1")) == 4
+
+        history_store.delete_item(0)
+        assert history_store.get_duplicate(ClipboardItem(content="clip 5")) is None
+
+        history_store.clear()
+        assert history_store.insert(ClipboardItem(content="clip 1")) is True
+
+    def test_load_items_rebuilds_index(self, history_store):
+        """Loaded items are indexed for deduplication."""
+        items = [ClipboardItem(content="one"), ClipboardItem(content="two")]
+        history_store.load_items(items)
+
+        assert history_store.find_duplicate(ClipboardItem(content="two")) == 1
+
+    def test_edited_content_is_not_a_duplicate(self, history_store):
+        """Items whose content changed in place do not match their old digest."""
+        item = ClipboardItem(content="original")
+        history_store.insert(item)
+        item.set_content("edited")
+
+        assert history_store.insert(ClipboardItem(content="original")) is True
+
+    def test_lookup_and_delete_by_id(self, history_store):
+        """Items can be fetched and deleted by clip ID."""
+        item = ClipboardItem(content="by id")
+        history_store.insert(item)
+        history_store.insert(ClipboardItem(content="other"))
+
+        assert history_store.get_item_by_id(item.clip_id) is item
+        assert history_store.delete_by_id(item.clip_id) is item
+        assert history_store.get_item_by_id(item.clip_id) is None
+        assert history_store.delete_by_id(item.clip_id) is None
+        assert len(history_store) == 1
+
+    def test_clip_id_derived_from_digest(self):
+        """Clip IDs stay 16 hex chars and differ per timestamp."""
+        a = ClipboardItem(content="same")
+        b = ClipboardItem(content="same")
+        assert a.content_digest == b.content_digest
+        assert len(a.clip_id) == 16
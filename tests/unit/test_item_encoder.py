@@ -0,0 +1,142 @@
+"""
+Unit tests for the direct ClipboardItem JSON encoder.
+"""
+import json
+import pytest
+from api.item_encoder import ItemEncoder, encode_item
+from api.models import ClipboardItemResponse, clipboard_item_to_response
+from stores.clipboard_item import ClipboardItem
+
+
+def _model_json(item) -> bytes:
+    """What FastAPI produced before: the validated response model."""
+    return clipboard_item_to_response(item).model_dump_json().encode()
+
+
+@pytest.mark.unit
+class TestEncodeItem:
+    """Test that the direct encoding matches the response model."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "plain",
+            'quotes " and \\ backslash',
+            "tabs\tnew\nlines\r\x00\x1f\x7f",
+            "unicode café 日本語 🎉  ",
+            "https://example.com/path?q=1",
+        ],
+    )
+    def test_matches_model_bytes(self, content):
+        item = ClipboardItem(content, source_app="Términal")
+        assert encode_item(item) == _model_json(item)
+
+    def test_snippet_fields(self):
+        item = ClipboardItem("body").make_snippet("Name \"1\"", "Folder/Sub", ["a", "ü"])
+        assert encode_item(item) == _model_json(item)
+        assert ClipboardItemResponse.model_validate_json(encode_item(item)).tags == ["a", "ü"]
+
+
+@pytest.mark.unit
+class TestItemEncoder:
+    """Test fragment caching and invalidation."""
+
+    def test_repeat_encode_hits(self):
+        encoder = ItemEncoder()
+        item = ClipboardItem("hello")
+        assert encoder.encode(item) is encoder.encode(item)
+        stats = encoder.get_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_same_clip_id_on_another_object_is_not_served(self):
+        encoder = ItemEncoder()
+        first = ClipboardItem("hello")
+        encoder.encode(first)
+        copy = ClipboardItem.from_dict(first.to_dict())
+        copy.make_snippet("named", "F")
+        assert b'"named"' in encoder.encode(copy)
+
+    def test_byte_budget_evicts_and_large_items_are_not_kept(self):
+        encoder = ItemEncoder(max_bytes=1000, max_item_bytes=500)
+        items = [ClipboardItem(f"item {i} " + "x" * 50) for i in range(5)]
+        for item in items:
+            encoder.encode(item)
+        stats = encoder.get_stats()
+        assert stats["bytes"] <= 1000 and stats["evictions"] > 0
+        encoder.encode(ClipboardItem("y" * 1000))
+        assert encoder.get_stats()["bytes"] <= 1000
+        assert ItemEncoder(max_bytes=0).encode(items[0]) == encode_item(items[0])
+
+    def test_invalidation_during_encode_is_not_cached(self):
+        encoder = ItemEncoder()
+        item = ClipboardItem("hello")
+
+        class Racing:
+            """Looks like the item, but changes while being encoded."""
+
+            def __getattr__(self, name):
+                if name == "content":
+                    encoder.discard(item)
+                return getattr(item, name)
+
+        encoder.encode(Racing())
+        assert encoder.get_stats()["entries"] == 0
+
+    def test_store_changes_drop_fragments(self, manager):
+        encoder = ItemEncoder()
+        manager.history_store.add_delegate(encoder.handle_history_event)
+        manager.snippet_store.add_delegate(encoder.handle_snippet_event)
+        clip = manager.add_clip("saved")
+        encoder.encode(clip)
+        manager.save_as_snippet(clip.clip_id, "name", "Old")
+        assert b'"Old"' in encoder.encode(clip)
+        manager.rename_snippet_folder("Old", "New")
+        assert b'"New"' in encoder.encode(clip)
+        snippet = manager.get_folder_snippets("New")[0]
+        manager.update_snippet("New", snippet.clip_id, new_name="renamed")
+        assert b'"renamed"' in encoder.encode(snippet)
+        manager.delete_snippet_folder("New")
+        manager.delete_history_item(clip.clip_id)
+        assert encoder.get_stats()["entries"] == 0
+
+
+@pytest.mark.api
+class TestEncodedEndpoints:
+    """Test that list and search bodies are unchanged by the fast path."""
+
+    def test_bodies_match_response_models(self, client, manager):
+        clip = manager.add_clip("first café")
+        manager.add_clip("second\nline")
+        manager.save_as_snippet(clip.clip_id, "name", "Work", ["t"])
+        manager.add_snippet_direct("direct", "other", "Work")
+        history = [json.loads(_model_json(item)) for item in manager.get_all_history()]
+        snippets = [json.loads(_model_json(item)) for item in manager.get_folder_snippets("Work")]
+
+        assert client.get("/api/history").json() == history
+        assert client.get("/api/snippets/Work").json() == snippets
+        assert client.get("/api/snippets").json() == [{"folder_name": "Work", "snippets": snippets}]
+        assert client.get("/api/snippets/folders").json() == ["Work"]
+        folders = client.get("/api/history/folders").json()
+        assert [item for folder in folders for item in folder["items"]] == history[: sum(
+            folder["count"] for folder in folders
+        )]
+
+        found = client.get("/api/search", params={"q": "first"})
+        assert found.headers["content-type"] == "application/json"
+        assert found.json() == {"history": history[1:], "snippets": snippets[:1]}
+        posted = client.post("/api/search", json={"query": "first", "include_history": False})
+        assert posted.json() == {"history": [], "snippets": snippets[:1]}
+
+    def test_search_paging_keeps_cursor_header(self, client, manager):
+        for i in range(5):
+            manager.add_clip(f"match {i}")
+        page = client.get("/api/search", params={"q": "match", "limit": 2})
+        assert len(page.json()["history"]) == 2
+        assert "x-next-cursor" in page.headers
+
+    def test_openapi_schema_still_names_the_models(self, client):
+        paths = client.get("/openapi.json").json()["paths"]
+        ok = paths["/api/search"]["get"]["responses"]["200"]["content"]["application/json"]
+        assert ok["schema"]["$ref"].endswith("/SearchResponse")
+        history = paths["/api/history"]["get"]["responses"]["200"]["content"]["application/json"]
+        assert history["schema"]["items"]["$ref"].endswith("/ClipboardItemResponse")
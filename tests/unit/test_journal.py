@@ -0,0 +1,116 @@
+"""
+Unit tests for the store journal and compaction.
+"""
+import json
+import os
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.journal import StoreJournal, replay
+
+
+def _snapshot(manager):
+    history = [(item.clip_id, item.content) for item in manager.history_store]
+    snippets = {
+        folder: [(item.clip_id, item.content, item.snippet_name) for item in items]
+        for folder, items in manager.snippet_store.get_all_snippets().items()
+    }
+    return history, snippets
+
+
+@pytest.mark.unit
+class TestStoreJournal:
+    """Test journal records, flushing and replay."""
+
+    def test_flush_appends_buffered_records(self, tmp_path):
+        """Records are buffered until flush, then appended in order."""
+        journal = StoreJournal(str(tmp_path / "journal.jsonl"))
+        journal.record("h_delete", clip_id="a")
+        journal.record("h_delete", clip_id="b")
+        assert journal.pending == 2
+        assert journal.read() == []
+
+        assert journal.flush() == 2
+        assert journal.flush() == 0
+        assert [r["seq"] for r in journal.read()] == [1, 2]
+        assert journal.size == (tmp_path / "journal.jsonl").stat().st_size
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """A partially written last line does not break replay."""
+        path = tmp_path / "journal.jsonl"
+        path.write_text('{"seq":1,"op":"h_clear"}\n{"seq":2,"op":"h_del')
+        assert [r["seq"] for r in StoreJournal(str(path)).read()] == [1]
+
+    def test_truncate_keeps_newer_records(self, tmp_path):
+        """Compaction drops only records covered by the snapshot."""
+        journal = StoreJournal(str(tmp_path / "journal.jsonl"))
+        for i in range(5):
+            journal.record("h_delete", clip_id=str(i))
+        journal.truncate(3)
+        assert [r["seq"] for r in journal.read()] == [4, 5]
+
+    def test_replay_is_idempotent(self):
+        """Replaying records a snapshot already contains changes nothing."""
+        a = {"clip_id": "a", "content": "a"}
+        b = {"clip_id": "b", "content": "b"}
+        records = [
+            {"seq": 1, "op": "h_insert", "index": 0, "item": a},
+            {"seq": 2, "op": "h_insert", "index": 0, "item": b},
+            {"seq": 3, "op": "h_move", "clip_id": "a"},
+            {"seq": 4, "op": "s_add", "folder": "F", "item": dict(b, folder_path="F")},
+        ]
+        history, snippets = replay([], {}, records)
+        assert [d["clip_id"] for d in history] == ["a", "b"]
+        assert replay(history, snippets, records) == (history, snippets)
+
+
+@pytest.mark.unit
+class TestClipboardManagerJournal:
+    """Test manager persistence through the journal."""
+
+    def test_mutations_survive_reload_without_snapshot(self, tmp_path):
+        """All operation kinds replay to the same state."""
+        manager = ClipboardManager(data_dir=str(tmp_path))
+        clips = [manager.add_clip(f"clip {i}") for i in range(5)]
+        manager.add_clip("clip 1")  # duplicate moves to top
+        manager.delete_history_item(clips[0].clip_id)
+        manager.save_as_snippet(clips[2].clip_id, "Second", "Work", ["t"])
+        direct = manager.add_snippet_direct("body", "Direct", "Work")
+        manager.update_snippet("Work", direct.clip_id, new_content="new body")
+        manager.create_snippet_folder("Empty")
+        manager.move_snippet("Work", "Other", clips[2].clip_id)
+        manager.rename_snippet_folder("Other", "Renamed")
+        manager.delete_snippet_folder("Empty")
+
+        assert not os.path.exists(manager.history_file)
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        assert _snapshot(reloaded) == _snapshot(manager)
+        assert reloaded.snippet_store.get_snippet_folder(clips[2].clip_id) == "Renamed"
+
+    def test_mutation_io_is_proportional_to_change(self, tmp_path):
+        """Adding one clip appends one small record."""
+        manager = ClipboardManager(data_dir=str(tmp_path), max_history=500)
+        for i in range(200):
+            manager.add_clip(f"clip {i}")
+        manager.save_stores()
+        assert manager.journal.size == 0
+
+        manager.add_clip("one more")
+        records = manager.journal.read()
+        assert [r["op"] for r in records] == ["h_insert"]
+        assert manager.journal.size < 1024
+
+    def test_compaction_runs_past_threshold(self, tmp_path):
+        """A large journal is folded into a snapshot and stays replayable."""
+        manager = ClipboardManager(data_dir=str(tmp_path), compact_threshold=4096)
+        for i in range(100):
+            manager.add_clip(f"clip {i}")
+        manager.shutdown()
+
+        stats = manager.get_persistence_stats()["journal"]
+        assert stats["compactions"] >= 1
+        meta = json.loads((tmp_path / "snapshot_meta.json").read_text())
+        assert 0 < meta["last_seq"] <= manager.journal.seq
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        assert _snapshot(reloaded) == _snapshot(manager)
+        assert reloaded.journal.seq == manager.journal.seq
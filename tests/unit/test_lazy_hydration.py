@@ -0,0 +1,92 @@
+"""
+Unit tests for lazy hydration of persisted clips and indexes.
+"""
+from datetime import datetime
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.history_store import HistoryStore
+
+
+@pytest.mark.unit
+class TestLazyClipboardItem:
+    """Test deferred parsing and hashing in ClipboardItem.from_dict."""
+
+    def test_from_dict_defers_derived_fields(self):
+        """Timestamp, display string and digest materialize on first read."""
+        original = ClipboardItem("Some   spaced\ncontent")
+        data = original.to_dict()
+        data.pop("display_string")
+
+        item = ClipboardItem.from_dict(data)
+        assert not item.is_hydrated
+        assert item.to_dict()["timestamp"] == data["timestamp"]
+        assert item.timestamp_iso == data["timestamp"]
+        assert not item.is_hydrated
+
+        assert item.timestamp == original.timestamp
+        assert item.display_string == original.display_string
+        assert item.content_digest == original.content_digest
+        assert item.is_hydrated
+        assert item.to_dict() == original.to_dict()
+
+    def test_changes_invalidate_derived_fields(self):
+        """Editing content or display length rebuilds derived fields."""
+        item = ClipboardItem.from_dict(ClipboardItem("first").to_dict())
+        item.set_content("second value")
+        assert item.content_digest == ClipboardItem("second value").content_digest
+        item.update_display_length(6)
+        assert item.display_string == ClipboardItem("second value", display_length=6).display_string
+
+        stamp = datetime(2024, 1, 2, 3, 4, 5)
+        item.timestamp = stamp
+        assert item.timestamp_iso == stamp.isoformat()
+
+
+@pytest.mark.unit
+class TestLazyIndexes:
+    """Test that bulk loads defer index construction."""
+
+    def test_history_indexes_build_on_first_use(self):
+        """Loaded items are not tokenized or hashed until queried."""
+        items = [ClipboardItem.from_dict(ClipboardItem(f"clip {i}").to_dict()) for i in range(10)]
+        store = HistoryStore(max_items=20)
+        store.load_items(items)
+        assert store.search_index.pending == 10
+        assert not any(item.is_hydrated for item in items)
+
+        assert store.search("clip 3") == [items[3]]
+        assert store.search_index.pending == 0
+
+        # Duplicate detection still finds loaded content
+        assert not store.insert(ClipboardItem("clip 7"))
+        assert store[0] is items[7]
+
+    def test_pending_items_track_mutations(self):
+        """Deletes and in-place edits before the first query are honoured."""
+        items = [ClipboardItem(f"entry {i}") for i in range(3)]
+        store = HistoryStore()
+        store.load_items(items)
+        store.delete_by_id(items[0].clip_id)
+        items[1].set_content("renamed entry")
+        store.notify_item_updated(items[1])
+
+        assert store.search("entry 0") == []
+        assert store.search("renamed") == [items[1]]
+        assert [item for _, item in store.fuzzy_search("entry 2", 5)][0] is items[2]
+
+    def test_reloaded_manager_matches(self, tmp_path):
+        """Search and ordering after a lazy reload match the live manager."""
+        manager = ClipboardManager(data_dir=str(tmp_path), max_history=100)
+        for i in range(30):
+            manager.add_clip(f"note {i} https://example.com/{i}")
+        manager.add_clip("note 4 https://example.com/4")
+        manager.add_snippet_direct("example snippet body", "Example", "Work")
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), max_history=100)
+        for query in ("example.com/2", "note 4", "snippet", "zz"):
+            assert reloaded.search_all(query) == manager.search_all(query), query
+        reloaded.add_clip("note 10 https://example.com/10")
+        assert reloaded.history_store[0].content == "note 10 https://example.com/10"
+        assert len(reloaded.history_store) == 30
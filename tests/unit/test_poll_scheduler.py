@@ -0,0 +1,58 @@
+"""
+Unit tests for the adaptive clipboard poll scheduler.
+"""
+import pytest
+from poll_scheduler import AdaptivePollScheduler
+
+
+@pytest.mark.unit
+class TestAdaptivePollScheduler:
+    """Test backoff, reset and capture metrics."""
+
+    def test_idle_polls_back_off_to_ceiling(self):
+        scheduler = AdaptivePollScheduler(floor=0.1, ceiling=1.0, backoff=2.0)
+        delays = [scheduler.record(False, 0.001) for _ in range(6)]
+        assert delays == pytest.approx([0.2, 0.4, 0.8, 1.0, 1.0, 1.0])
+
+    def test_change_resets_to_floor(self):
+        """A change after backing off is captured late and polls fast again."""
+        scheduler = AdaptivePollScheduler(floor=0.1, ceiling=1.0, backoff=2.0)
+        scheduler.record(False, 0.001)
+        assert scheduler.record(True, 0.002) == pytest.approx(0.1)
+        assert scheduler.record(True, 0.002) == pytest.approx(0.1)
+
+        stats = scheduler.get_stats()
+        assert stats["polls"] == 3
+        assert stats["captured"] == 2
+        assert stats["late_captures"] == 1
+        assert stats["max_poll_ms"] == pytest.approx(2.0)
+        assert stats["interval_ms"] == pytest.approx(100.0)
+
+    def test_missed_changes_are_counted(self):
+        scheduler = AdaptivePollScheduler()
+        scheduler.record(True, 0.001, missed=2)
+        assert scheduler.get_stats()["missed"] == 2
+
+    def test_fixed_interval_when_floor_equals_ceiling(self):
+        scheduler = AdaptivePollScheduler(floor=0.5, ceiling=0.5)
+        assert scheduler.record(False, 0.0) == pytest.approx(0.5)
+        assert scheduler.record(True, 0.0) == pytest.approx(0.5)
+        assert scheduler.get_stats()["late_captures"] == 0
+
+    @pytest.mark.parametrize(
+        "floor,ceiling,backoff", [(0, 1.0, 2.0), (1.0, 0.5, 2.0), (0.1, 1.0, 0.5)]
+    )
+    def test_invalid_configuration(self, floor, ceiling, backoff):
+        with pytest.raises(ValueError):
+            AdaptivePollScheduler(floor, ceiling, backoff)
+
+    def test_daemon_idles_past_the_baseline(self, monkeypatch):
+        """By default an idle clipboard is checked less often than the baseline interval."""
+        import daemon
+        from settings import settings
+
+        monkeypatch.setattr(daemon, "create_backend", lambda name: None)
+        monkeypatch.setattr(daemon, "ClipboardManager", lambda **kwargs: None)
+        scheduler = daemon.SimpleCP_Daemon().poll_scheduler
+        assert scheduler.floor < settings.clipboard_check_interval < scheduler.ceiling
+        assert daemon.SimpleCP_Daemon(max_check_interval=0.5).poll_scheduler.ceiling == 1.0
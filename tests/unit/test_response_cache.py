@@ -0,0 +1,104 @@
+"""
+Unit tests for the pre-serialized response cache.
+"""
+import gzip
+import pytest
+from api.response_cache import CachedBody, ResponseCache
+from api.server import create_app
+from monitoring import get_monitoring_stats
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test versioned lookups, invalidation and eviction."""
+
+    def test_entry_only_served_at_its_version(self):
+        cache = ResponseCache()
+        cache.put(("history", "recent"), CachedBody(3, b"[]"))
+        assert cache.get(("history", "recent"), 3).body == b"[]"
+        assert cache.get(("history", "recent"), 4) is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_store_events_drop_only_that_store(self):
+        cache = ResponseCache()
+        cache.put(("history", "recent"), CachedBody(1, b"h"))
+        cache.put(("snippets", "all"), CachedBody(1, b"s"))
+        cache.handle_history_event("did_insert", 0, None)
+        assert cache.get(("history", "recent"), 1) is None
+        assert cache.get(("snippets", "all"), 1) is not None
+        cache.handle_snippet_event("folder_loaded", "A", [])  # lazy load is not a change
+        assert cache.get(("snippets", "all"), 1) is not None
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        for i in range(3):
+            cache.put(("history", i), CachedBody(0, b"x"))
+        assert cache.get(("history", 0), 0) is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_apps_on_one_manager_share_store_listeners(self, manager):
+        first = create_app(manager)
+        delegates = (len(manager.history_store._delegates), len(manager.snippet_store._delegates))
+        second = create_app(manager)
+        assert (len(manager.history_store._delegates), len(manager.snippet_store._delegates)) == (
+            delegates
+        )
+        assert second.state.response_cache is first.state.response_cache
+        assert second.state.change_feed is first.state.change_feed
+
+
+@pytest.mark.api
+class TestCachedEndpoints:
+    """Test cached list endpoints end to end."""
+
+    def test_repeat_reads_hit_the_cache(self, client, app, manager):
+        for i in range(3):
+            manager.add_clip(f"clip {i}")
+        first = client.get("/api/history/recent")
+        second = client.get("/api/history/recent")
+        assert first.content == second.content
+        assert [item["content"] for item in second.json()] == ["clip 2", "clip 1", "clip 0"]
+        stats = app.state.response_cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert get_monitoring_stats()["response_cache"]["hits"] >= 1
+
+    def test_mutation_invalidates(self, client, manager):
+        manager.add_clip("before")
+        assert len(client.get("/api/history/recent").json()) == 1
+        manager.add_clip("after")
+        assert [item["content"] for item in client.get("/api/history/recent").json()] == [
+            "after",
+            "before",
+        ]
+        manager.add_snippet_direct("body", "name", "Work")
+        assert client.get("/api/snippets").json()[0]["snippets"][0]["content"] == "body"
+        manager.update_snippet("Work", manager.get_folder_snippets("Work")[0].clip_id, "edited")
+        assert client.get("/api/snippets").json()[0]["snippets"][0]["content"] == "edited"
+
+    def test_history_reflects_folder_rename_of_saved_snippet(self, client, manager):
+        clip = manager.add_clip("saved")
+        manager.save_as_snippet(clip.clip_id, "name", "Old")
+        assert client.get("/api/history").json()[0]["folder_path"] == "Old"
+        manager.rename_snippet_folder("Old", "New")
+        assert client.get("/api/history").json()[0]["folder_path"] == "New"
+
+    def test_cursor_header_is_cached_with_the_body(self, client, manager):
+        for i in range(5):
+            manager.add_clip(f"clip {i}")
+        first = client.get("/api/history?limit=2")
+        second = client.get("/api/history?limit=2")
+        assert first.headers["x-next-cursor"] == second.headers["x-next-cursor"]
+        assert client.get("/api/history?after=missing").status_code == 400
+
+    def test_large_bodies_are_served_gzipped(self, client, manager):
+        for i in range(20):
+            manager.add_clip(f"clip {i} " + "x" * 200)
+        plain = client.get("/api/history", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["vary"]
+        zipped = client.get("/api/history", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["content-encoding"] == "gzip"
+        # httpx decodes transparently; the decoded body is the cached JSON
+        assert zipped.content == plain.content
+        assert len(gzip.compress(plain.content)) < len(plain.content)
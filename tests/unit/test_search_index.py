@@ -0,0 +1,152 @@
+"""
+Unit tests for the incremental search index.
+"""
+import random
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.history_store import HistoryStore
+from stores.search_index import SearchIndex
+from stores.snippet_store import SnippetStore
+
+
+def _scan(items, query):
+    return [item for item in items if item.matches_search(query)]
+
+
+@pytest.mark.unit
+class TestSearchIndex:
+    """Test SearchIndex candidate generation and maintenance."""
+
+    def test_substring_semantics_preserved(self):
+        """Partial words and multi-word queries match like a scan."""
+        index = SearchIndex()
+        items = [
+            ClipboardItem(content="https://example.com/path"),
+            ClipboardItem(content="hello world"),
+            ClipboardItem(content="Testing 123"),
+        ]
+        for item in items:
+            index.add(item)
+
+        for query in ["ttp://exa", "LO WOR", "sting", "123", "nothing"]:
+            assert sorted(index.matches(query), key=id) == sorted(_scan(items, query), key=id)
+        assert index.matches("//") is None
+
+    def test_trigram_candidates_narrow_punctuated_queries(self):
+        """Trigram postings narrow queries that have no whole words."""
+        index = SearchIndex()
+        url = ClipboardItem(content="see HTTP://host/x")
+        for item in [url] + [ClipboardItem(content=f"plain {i}") for i in range(20)]:
+            index.add(item)
+
+        assert index.candidates("ttp://") == {url.clip_id}
+        assert index.matches("TTP://H") == [url]
+        assert index.candidates("zzz") == set()
+
+    def test_trigrams_cover_names_and_tags(self):
+        """Snippet names and tags are trigram-indexed as well."""
+        index = SearchIndex()
+        item = ClipboardItem(content="body")
+        item.make_snippet("Straße Notes", "F", ["Release-Plan"])
+        index.add(item)
+
+        assert index.matches("straße") == [item]
+        assert index.matches("se-pl") == [item]
+
+    def test_discard_and_reindex(self):
+        """Removed items disappear and updated items are re-tokenized."""
+        index = SearchIndex()
+        item = ClipboardItem(content="alpha")
+        index.add(item)
+        item.set_content("beta")
+        index.reindex(item)
+
+        assert index.matches("alpha") == []
+        assert index.matches("beta") == [item]
+        index.discard(item)
+        assert index.matches("beta") == []
+        assert len(index) == 0
+
+
+@pytest.mark.unit
+class TestStoreSearchThroughIndex:
+    """Test store searches stay equivalent to full scans."""
+
+    def test_history_search_matches_scan_in_order(self):
+        """Indexed history search returns scan results in store order."""
+        rng = random.Random(7)
+        words = ["alpha", "beta", "gamma", "delta", "url", "http", "x1"]
+        store = HistoryStore(max_items=30)
+        for _ in range(200):
+            content = " ".join(rng.choice(words) for _ in range(3))
+            if rng.random() < 0.1 and len(store):
+                store.delete_item(rng.randrange(len(store)))
+            else:
+                store.insert(ClipboardItem(content=content))
+
+        for query in ["alp", "gamma delta", "ttp", "x", "zzz"]:
+            assert store.search(query) == _scan(store, query)
+
+    def test_snippet_search_follows_folder_order(self):
+        """Snippet search covers names/tags and survives folder changes."""
+        store = SnippetStore()
+        first = ClipboardItem(content="echo one")
+        first.make_snippet("Deploy", "B", ["ops"])
+        second = ClipboardItem(content="echo two")
+        second.make_snippet("Build", "A", ["ops"])
+        store.add_snippet("A", second)
+        store.add_snippet("B", first)
+
+        assert store.search("ops") == [second, first]
+        assert store.search("deploy") == [first]
+
+        store.delete_folder("A")
+        assert store.search("echo") == [first]
+        store.update_snippet("B", first.clip_id, new_tags=["release"])
+        assert store.search("ops") == []
+        assert store.search("releas") == [first]
+
+    def test_manager_search_after_reload_and_save_as_snippet(self, test_data_dir):
+        """Loaded items are indexed and snippet names reach history search."""
+        manager = ClipboardManager(data_dir=test_data_dir)
+        manager.history_store.clear()
+        manager.snippet_store.clear()
+        item = manager.add_clip("persisted searchable text")
+        manager.save_as_snippet(item.clip_id, "Keeper", "Saved")
+
+        assert manager.search_all("keeper")["history"] == [item]
+
+        reloaded = ClipboardManager(data_dir=test_data_dir)
+        results = reloaded.search_all("searchable")
+        assert [r.clip_id for r in results["history"]] == [item.clip_id]
+        assert [r.clip_id for r in results["snippets"]] == [item.clip_id]
+
+
+@pytest.mark.unit
+class TestFuzzySearch:
+    """Test ranked fuzzy search."""
+
+    def test_typo_tolerance_and_top_k(self):
+        """Misspelled queries still find close matches, best first."""
+        index = SearchIndex()
+        exact = ClipboardItem(content="kubernetes deployment")
+        close = ClipboardItem(content="kubernetis cluster")
+        for item in [exact, close] + [ClipboardItem(content=f"noise {i}") for i in range(50)]:
+            index.add(item)
+
+        ranked = index.fuzzy_search("kubernetes", limit=5)
+        assert [item for _, item in ranked] == [exact, close]
+        assert ranked[0][0] > ranked[1][0]
+        assert len(index.fuzzy_search("kubernetes", limit=1)) == 1
+
+    def test_recency_breaks_ties(self):
+        """Equal matches rank the more recently placed item first."""
+        index = SearchIndex()
+        older = ClipboardItem(content="token abc")
+        newer = ClipboardItem(content="token abd")
+        index.add(older)
+        index.add(newer)
+        index.touch(older)
+
+        assert [item for _, item in index.fuzzy_search("token", 2)] == [older, newer]
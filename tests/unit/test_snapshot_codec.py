@@ -0,0 +1,93 @@
+"""
+Unit tests for the binary snapshot codec.
+"""
+import json
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.snapshot_codec import (
+    MAGIC,
+    SnapshotFormatError,
+    decode_items,
+    encode_items,
+)
+
+
+def _items():
+    items = [ClipboardItem(content=f"item {i}\nsecond line") for i in range(3)]
+    items[1].make_snippet("Named", "Folder", ["a", "b"])
+    return [item.to_dict() for item in items]
+
+
+@pytest.mark.unit
+class TestSnapshotCodec:
+    """Test encoding, decoding and versioning."""
+
+    def test_round_trip(self):
+        """Encoded items decode to the same dicts."""
+        data = _items()
+        payload = encode_items(data)
+        assert payload.startswith(MAGIC)
+        assert decode_items(payload) == data
+        assert len(payload) < len(json.dumps(data, indent=2))
+
+    def test_plain_json_still_loads(self):
+        """Snapshots written before the binary format are read as JSON."""
+        data = _items()
+        assert decode_items(json.dumps(data).encode()) == data
+
+    def test_lone_surrogates_survive(self):
+        """Content orjson rejects falls back to the stdlib codec."""
+        data = [ClipboardItem(content="broken \ud800 pair").to_dict()]
+        assert decode_items(encode_items(data)) == data
+
+    def test_unknown_version_rejected(self):
+        """Future format versions fail loudly instead of misreading."""
+        payload = encode_items(_items())
+        with pytest.raises(SnapshotFormatError):
+            decode_items(payload[:4] + bytes((99,)) + payload[5:])
+
+    def test_from_dict_trusts_persisted_content_type(self):
+        """Loading keeps the stored content type; display string is derived."""
+        data = ClipboardItem(content="def f(): pass").to_dict()
+        data["content_type"] = "text"
+        item = ClipboardItem.from_dict(data)
+        assert item.content_type == "text"
+        assert item.display_string == "def f(): pass"
+        assert item.clip_id == data["clip_id"]
+        assert item.to_dict() == data
+
+
+@pytest.mark.unit
+class TestManagerSnapshotFormat:
+    """Test switching snapshot formats on an existing data directory."""
+
+    def test_switching_formats_keeps_data(self, tmp_path):
+        """Data saved in one format loads and re-saves in the other."""
+        manager = ClipboardManager(data_dir=str(tmp_path), snapshot_format="json")
+        for i in range(5):
+            manager.add_clip(f"clip {i}")
+        for folder in ("A", "B"):
+            manager.add_snippet_direct(f"{folder} body", folder, folder)
+        manager.shutdown()
+        assert (tmp_path / "history.json").exists()
+
+        binary = ClipboardManager(data_dir=str(tmp_path), snapshot_format="binary")
+        assert [item.content for item in binary.history_store][0] == "clip 4"
+        binary.add_snippet_direct("A body 2", "A2", "A")  # folder B stays unloaded
+        binary.shutdown()
+        assert (tmp_path / "history.snap").exists()
+        assert not (tmp_path / "history.json").exists()
+        # The replaced snapshot is kept as a backup, not deleted
+        backup = json.loads((tmp_path / "history.json.bak").read_text())
+        assert [item["content"] for item in backup][0] == "clip 4"
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), snapshot_format="binary")
+        assert len(reloaded.history_store) == 5
+        assert [s.content for s in reloaded.get_folder_snippets("A")] == ["A body", "A body 2"]
+        assert [s.content for s in reloaded.get_folder_snippets("B")] == ["B body"]
+
+    def test_unknown_format_rejected(self, tmp_path):
+        """Misconfigured snapshot format fails fast."""
+        with pytest.raises(ValueError):
+            ClipboardManager(data_dir=str(tmp_path), snapshot_format="xml")
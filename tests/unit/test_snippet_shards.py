@@ -0,0 +1,101 @@
+"""
+Unit tests for per-folder sharded snippet persistence.
+"""
+import json
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.snapshot_codec import decode_items
+
+
+def _record_writes(manager):
+    written = []
+    original = manager.persistence._write_atomic
+
+    def spy(path, data):
+        written.append(path)
+        original(path, data)
+
+    manager.persistence._write_atomic = spy
+    return written
+
+
+@pytest.mark.unit
+class TestSnippetShards:
+    """Test dirty-aware shard writes and lazy folder loading."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Manager with three folders saved to shards."""
+        manager = ClipboardManager(data_dir=str(tmp_path))
+        for folder in ("Alpha", "Beta", "Gamma"):
+            for i in range(3):
+                manager.add_snippet_direct(f"{folder} body {i}", f"{folder} {i}", folder)
+        manager.add_clip("history clip")
+        manager.save_stores()
+        return manager
+
+    def test_only_changed_folder_is_rewritten(self, manager, tmp_path):
+        """Editing one snippet rewrites one shard, not history or other folders."""
+        snippet = manager.get_folder_snippets("Beta")[0]
+        written = _record_writes(manager)
+
+        manager.update_snippet("Beta", snippet.clip_id, new_content="edited")
+        manager.save_stores()
+
+        shard = tmp_path / "snippets" / manager.persistence._shard_file_name("Beta")
+        assert str(shard) in written
+        assert manager.history_file not in written
+        assert len([p for p in written if p.startswith(str(tmp_path / "snippets"))]) == 2
+        assert decode_items(shard.read_bytes())[0]["content"] == "edited"
+
+        written.clear()
+        manager.save_stores()
+        assert written == [str(tmp_path / "snapshot_meta.json")]
+
+    def test_folders_load_lazily_after_restart(self, manager, tmp_path):
+        """A restarted manager reads a folder shard only when it is accessed."""
+        manager.shutdown()
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        store = reloaded.snippet_store
+
+        assert reloaded.get_snippet_folders() == ["Alpha", "Beta", "Gamma"]
+        assert reloaded.get_stats()["snippet_count"] == 9
+        assert not any(store.is_folder_loaded(f) for f in ("Alpha", "Beta", "Gamma"))
+
+        assert [s.content for s in reloaded.get_folder_snippets("Gamma")][0] == "Gamma body 0"
+        assert store.is_folder_loaded("Gamma") and not store.is_folder_loaded("Alpha")
+
+        assert len(reloaded.search_all("body 1")["snippets"]) == 3
+
+    def test_rename_and_delete_drop_stale_shards(self, manager, tmp_path):
+        """Shards of renamed and deleted folders are removed."""
+        manager.rename_snippet_folder("Alpha", "Delta")
+        manager.delete_snippet_folder("Gamma")
+        manager.save_stores()
+
+        files = sorted(p.name for p in (tmp_path / "snippets").iterdir())
+        expected = sorted(
+            ["manifest.json", manager.persistence._shard_file_name("Beta"), manager.persistence._shard_file_name("Delta")]
+        )
+        assert files == expected
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        delta = reloaded.get_folder_snippets("Delta")
+        assert [s.folder_path for s in delta] == ["Delta"] * 3
+
+    def test_legacy_snippets_file_migrates_to_shards(self, tmp_path):
+        """An old single-file snippets.json is split into shards on save."""
+        item = ClipboardItem(content="legacy")
+        item.make_snippet("Legacy", "Old")
+        legacy = {"Old": [item.to_dict()]}
+        (tmp_path / "snippets.json").write_text(json.dumps(legacy))
+
+        manager = ClipboardManager(data_dir=str(tmp_path))
+        assert [s.content for s in manager.get_folder_snippets("Old")] == ["legacy"]
+        manager.save_stores()
+
+        assert (tmp_path / "snippets" / "manifest.json").exists()
+        assert (tmp_path / "snippets.json.bak").exists()
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        assert [s.content for s in reloaded.get_folder_snippets("Old")] == ["legacy"]
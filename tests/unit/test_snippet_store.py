@@ -84,3 +84,126 @@ class TestSnippetStore:
         results = snippet_store.search("python")
         assert len(results) == 1
         assert results[0].content == "python code"
+
+
+@pytest.mark.unit
+class TestSnippetStoreIdRegistry:
+    """Test clip_id -> folder registry used by by-ID operations."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a fresh snippet store."""
+        from stores.snippet_store import SnippetStore
+
+        return SnippetStore()
+
+    def _snippet(self, store, folder, content):
+        item = ClipboardItem(content=content)
+        item.make_snippet(content, folder)
+        store.add_snippet(folder, item)
+        return item
+
+    def test_lookup_follows_move_and_rename(self, store):
+        """Registry tracks snippets through moves and folder renames."""
+        item = self._snippet(store, "A", "hello")
+        assert store.get_snippet_by_id(item.clip_id) is item
+
+        assert store.move_snippet("A", "B", item.clip_id) is True
+        assert store.get_snippet_folder(item.clip_id) == "B"
+        assert store.move_snippet("A", "B", item.clip_id) is False
+
+        store.rename_folder("B", "C")
+        assert store.get_snippet_folder(item.clip_id) == "C"
+        assert store.get_snippet_by_id(item.clip_id).folder_path == "C"
+
+    def test_operations_require_matching_folder(self, store):
+        """By-ID operations fail when the folder does not hold the snippet."""
+        item = self._snippet(store, "A", "hello")
+        store.create_folder("B")
+
+        assert store.update_snippet("B", item.clip_id, new_name="x") is False
+        assert store.delete_snippet("B", item.clip_id) is False
+        assert store.delete_snippet("A", item.clip_id) is True
+        assert store.get_snippet_by_id(item.clip_id) is None
+        assert len(store) == 0
+
+    def test_delete_folder_and_clear_drop_entries(self, store):
+        """Removing folders removes their snippets from the registry."""
+        first = self._snippet(store, "A", "one")
+        second = self._snippet(store, "B", "two")
+
+        store.delete_folder("A")
+        assert store.get_snippet_by_id(first.clip_id) is None
+        assert len(store) == 1
+
+        store.clear()
+        assert store.get_snippet_by_id(second.clip_id) is None
+        assert store.get_folder_names() == []
+
+
+@pytest.mark.unit
+class TestSnippetStoreDirtyAndLazyFolders:
+    """Test per-folder dirty tracking and lazy folder loading."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a fresh snippet store."""
+        from stores.snippet_store import SnippetStore
+
+        return SnippetStore()
+
+    def _snippet(self, folder, content):
+        item = ClipboardItem(content=content)
+        item.make_snippet(content, folder)
+        return item
+
+    def test_mutations_mark_only_touched_folders(self, store):
+        """Each mutation flags the folders it changed."""
+        item = self._snippet("A", "one")
+        store.add_snippet("A", item)
+        store.create_folder("B")
+        assert store.take_dirty_folders() == {"A", "B"}
+        assert store.dirty_folders == set()
+        assert store.modified is False
+
+        store.move_snippet("A", "B", item.clip_id)
+        assert store.take_dirty_folders() == {"A", "B"}
+        store.update_snippet("B", item.clip_id, new_name="renamed")
+        assert store.take_dirty_folders() == {"B"}
+        store.rename_folder("B", "C")
+        assert store.take_dirty_folders() == {"C"}
+
+    def test_lazy_folder_loads_on_first_access(self, store):
+        """Lazy folders are counted without loading and load once on access."""
+        items = [self._snippet("A", "alpha"), self._snippet("A", "beta")]
+        calls = []
+
+        def loader():
+            calls.append("A")
+            return items
+
+        store.add_lazy_folder("A", loader, count=2)
+        store.add_lazy_folder("B", lambda: [self._snippet("B", "gamma")], count=1)
+        assert store.get_folder_names() == ["A", "B"]
+        assert len(store) == 3
+        assert not store.is_folder_loaded("A")
+
+        assert store.get_folder_items("A") == items
+        assert store.get_folder_items("A") == items
+        assert calls == ["A"]
+        assert not store.is_folder_loaded("B")
+        assert store.dirty_folders == set()
+
+        assert [item.content for item in store.search("gamma")] == ["gamma"]
+        assert store.is_folder_loaded("B")
+        assert len(store) == 3
+
+    def test_deleting_lazy_folder_skips_loading(self, store):
+        """Deleting an unloaded folder never reads it."""
+
+        def loader():
+            raise AssertionError("folder should not be loaded")
+
+        store.add_lazy_folder("A", loader, count=5)
+        assert store.delete_folder("A") is True
+        assert len(store) == 0
@@ -0,0 +1,121 @@
+"""
+Unit tests for the SQLite storage backend.
+"""
+import os
+import sqlite3
+import pytest
+from clipboard_manager import ClipboardManager
+
+
+def _state(manager):
+    history = [(item.clip_id, item.content) for item in manager.history_store]
+    snippets = {
+        folder: [(item.clip_id, item.content, item.snippet_name, item.folder_path) for item in items]
+        for folder, items in manager.snippet_store.get_all_snippets().items()
+    }
+    return history, snippets
+
+
+def _populate(manager):
+    clips = [manager.add_clip(f"clip number {i}") for i in range(6)]
+    manager.add_clip("clip number 1")
+    manager.delete_history_item(clips[0].clip_id)
+    manager.save_as_snippet(clips[2].clip_id, "Second", "Work", ["greeting"])
+    direct = manager.add_snippet_direct("hello body", "Direct", "Work")
+    manager.update_snippet("Work", direct.clip_id, new_content="hello world body")
+    manager.create_snippet_folder("Empty")
+    manager.move_snippet("Work", "Other", clips[2].clip_id)
+    manager.rename_snippet_folder("Other", "Renamed")
+    return clips
+
+
+@pytest.mark.unit
+class TestSQLiteStorage:
+    """Test SQLite-backed ClipboardManager persistence and queries."""
+
+    def test_round_trip(self, tmp_path):
+        """Row-level writes reload to the same state."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        _populate(manager)
+        manager.shutdown()
+        with pytest.raises(sqlite3.ProgrammingError):
+            manager.database._conn.execute("SELECT 1")
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        assert _state(reloaded) == _state(manager)
+        assert not os.path.exists(manager.history_file)
+
+    def test_one_shot_json_migration(self, tmp_path):
+        """Existing JSON data is imported once, then SQLite is authoritative."""
+        json_manager = ClipboardManager(data_dir=str(tmp_path))
+        clips = _populate(json_manager)
+        json_manager.shutdown()
+
+        migrated = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        assert _state(migrated) == _state(json_manager)
+        assert migrated.database.get_meta("json_migrated") is not None
+
+        migrated.delete_history_item(clips[1].clip_id)
+        migrated.shutdown()
+        reopened = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        assert reopened.history_store.get_item_by_id(clips[1].clip_id) is None
+        assert _state(reopened) == _state(migrated)
+
+    def test_fts_search_matches_in_memory_search(self, tmp_path):
+        """FTS5 search returns the same results as the in-memory index."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        _populate(manager)
+        manager.add_clip("Visit https://Example.com/path")
+        assert manager.database.fts_enabled
+
+        for query in ("number", "NUMBER 3", "hello world", "greeting", "example.com", "zz", "nothing here"):
+            expected = {
+                "history": manager.history_store.search(query),
+                "snippets": manager.snippet_store.search(query),
+            }
+            assert manager.search_all(query) == expected, query
+
+    def test_bounded_pages(self, tmp_path):
+        """History and folder pages are served from the in-memory stores."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        _populate(manager)
+        for i in range(5):
+            manager.add_snippet_direct(f"snippet {i}", f"S{i}", "Work")
+
+        items, cursor = manager.get_history_page(limit=2)
+        assert items == manager.history_store.get_items(2)
+        rest, end = manager.get_history_page(after=cursor)
+        assert items + rest == manager.history_store.items
+        assert end is None
+
+        folder = manager.get_folder_snippets("Work")
+        page, cursor = manager.get_folder_snippets_page("Work", limit=3)
+        assert page == folder[:3]
+        page, cursor = manager.get_folder_snippets_page("Work", after=cursor, limit=3)
+        assert page == folder[3:6]
+        assert cursor is None
+
+        with pytest.raises(KeyError):
+            manager.get_history_page(after="missing")
+        with pytest.raises(KeyError):
+            manager.get_folder_snippets_page("Renamed", after=folder[0].clip_id)
+
+    def test_page_survives_cursor_delete_and_move(self, tmp_path):
+        """Cursors compare store ranks, so the cursor item may change."""
+        manager = ClipboardManager(data_dir=str(tmp_path), storage="sqlite")
+        clips = [manager.add_clip(f"clip number {i}") for i in range(6)]
+
+        page, cursor = manager.get_history_page(limit=2)
+        manager.delete_history_item(page[-1].clip_id)
+        page, cursor = manager.get_history_page(after=cursor, limit=2)
+        assert page == [clips[3], clips[2]]
+
+        manager.add_clip("clip number 2")
+        page, cursor = manager.get_history_page(after=cursor, limit=2)
+        assert [item.content for item in page] == ["clip number 1", "clip number 0"]
+        assert cursor is None
+
+    def test_unknown_backend_rejected(self, tmp_path):
+        """Misconfigured storage fails fast."""
+        with pytest.raises(ValueError):
+            ClipboardManager(data_dir=str(tmp_path), storage="xml")
@@ -0,0 +1,259 @@
+"""
+Unit tests for the store concurrency model (ReadWriteLock + ClipboardManager).
+"""
+import random
+import threading
+import time
+import pytest
+from clipboard_backend import MemoryClipboard
+from clipboard_manager import ClipboardManager
+from stores.clipboard_item import ClipboardItem
+from stores.rwlock import ReadWriteLock
+
+
+def _run_threads(targets, duration):
+    """Run each target in its own thread until `duration` elapses; re-raise failures."""
+    stop = threading.Event()
+    errors = []
+    counts = [0] * len(targets)
+
+    def worker(index, target):
+        rng = random.Random(index)
+        try:
+            while not stop.is_set():
+                target(rng)
+                counts[index] += 1
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+            stop.set()
+
+    threads = [
+        threading.Thread(target=worker, args=(i, target), daemon=True)
+        for i, target in enumerate(targets)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=10)
+    if errors:
+        raise errors[0]
+    return counts
+
+
+def _check_invariants(manager):
+    """Stores agree with their own indexes and limits."""
+    with manager.lock.read():
+        history = manager.history_store
+        items = history.items
+        ids = [item.clip_id for item in items]
+        assert len(items) <= history.max_items
+        assert len(ids) == len(set(ids))
+        for item in items:
+            assert history.get_item_by_id(item.clip_id) is item
+            assert history.get_duplicate(item) is item
+
+        snippets = manager.snippet_store
+        located = {}
+        for folder_name, folder in snippets.folders.items():
+            for item in folder:
+                assert item.folder_path == folder_name
+                located[item.clip_id] = folder_name
+        assert located == snippets._locations
+
+
+@pytest.mark.unit
+class TestReadWriteLock:
+    """Test shared/exclusive semantics."""
+
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                inside.wait()  # all three readers hold it at once
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        entered = threading.Event()
+        lock.acquire_write()
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), entered.set(), lock.release_read()))
+        reader.start()
+        assert not entered.wait(0.1)
+        lock.release_write()
+        assert entered.wait(5)
+        reader.join(timeout=5)
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """Writer preference: readers arriving behind a writer wait for it."""
+        lock = ReadWriteLock()
+        order = []
+        lock.acquire_read()
+        writer = threading.Thread(target=lambda: (lock.acquire_write(), order.append("w"), lock.release_write()))
+        writer.start()
+        while lock.get_stats()["write_waits"] == 0:
+            time.sleep(0.001)
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), order.append("r"), lock.release_read()))
+        reader.start()
+        time.sleep(0.05)
+        assert order == []
+        lock.release_read()
+        writer.join(timeout=5)
+        reader.join(timeout=5)
+        assert order == ["w", "r"]
+
+    def test_reentrant_for_the_same_thread(self):
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+        assert lock.get_stats()["active_readers"] == 0
+
+
+@pytest.mark.unit
+class TestStoreConcurrency:
+    """Hammer one manager from many threads."""
+
+    def test_concurrent_mutations_searches_and_saves(self, tmp_path):
+        manager = ClipboardManager(
+            data_dir=str(tmp_path),
+            max_history=200,
+            save_delay=0.005,
+            compact_threshold=4096,
+            clipboard=MemoryClipboard(),
+        )
+        for folder in ("alpha", "beta", "gamma"):
+            manager.create_snippet_folder(folder)
+
+        def insert(rng):
+            manager.add_clip(f"clip {rng.randrange(400)} payload")
+
+        def delete(rng):
+            items = manager.get_all_history(20)
+            if items:
+                manager.delete_history_item(rng.choice(items).clip_id)
+
+        def snippets(rng):
+            folder = rng.choice(("alpha", "beta", "gamma"))
+            snippet = manager.add_snippet_direct(f"snippet {rng.randrange(100)}", "s", folder)
+            if rng.random() < 0.5:
+                manager.move_snippet(folder, rng.choice(("alpha", "beta", "gamma")), snippet.clip_id)
+            else:
+                manager.delete_snippet(folder, snippet.clip_id)
+
+        def search(rng):
+            results = manager.search_all(f"clip {rng.randrange(400)}")
+            for item in results["history"]:
+                assert "clip" in item.content
+            manager.search_fuzzy("payload", 5)
+            manager.get_history_page(limit=10)
+            manager.get_all_snippets()
+
+        def save(rng):
+            manager.save_stores()
+
+        targets = [insert, insert, delete, snippets, search, search, save]
+        duration = 1.0
+        counts = _run_threads(targets, duration)
+        manager.shutdown()
+
+        _check_invariants(manager)
+        # Every thread made progress, and the whole mix kept a useful rate
+        assert all(counts), counts
+        assert sum(counts) / duration > 200, counts
+        stats = manager.get_persistence_stats()["store_lock"]
+        assert stats["writes"] > 0 and stats["reads"] > 0
+
+        # What was saved is what is in memory
+        reloaded = ClipboardManager(data_dir=str(tmp_path), max_history=200, clipboard=MemoryClipboard())
+        assert [item.clip_id for item in reloaded.get_all_history()] == [
+            item.clip_id for item in manager.get_all_history()
+        ]
+        assert {
+            folder: [item.clip_id for item in items]
+            for folder, items in reloaded.get_all_snippets().items()
+        } == {
+            folder: [item.clip_id for item in items]
+            for folder, items in manager.get_all_snippets().items()
+        }
+
+    def test_lazy_folders_load_once_under_concurrent_reads(self, tmp_path):
+        manager = ClipboardManager(data_dir=str(tmp_path), clipboard=MemoryClipboard())
+        for i in range(200):
+            manager.add_snippet_direct(f"snippet {i}", f"s{i}", f"folder {i % 4}")
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), clipboard=MemoryClipboard())
+        assert not reloaded.snippet_store.is_folder_loaded("folder 0")
+        barrier = threading.Barrier(8, timeout=5)
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append(len(reloaded.search_all("snippet")["snippets"]))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        assert results == [200] * 8
+        _check_invariants(reloaded)
+
+    def test_save_serializes_outside_the_store_lock(self, tmp_path, monkeypatch):
+        """A slow save lets writers through, so readers never queue behind them."""
+        manager = ClipboardManager(data_dir=str(tmp_path), max_history=500, clipboard=MemoryClipboard())
+        for i in range(500):
+            manager.add_clip(f"clip {i}")
+        serializing = threading.Event()
+        release = threading.Event()
+        to_dict = ClipboardItem.to_dict
+
+        def slow_to_dict(item, *args, **kwargs):
+            # Only the save blocks; the writer's journal record encodes normally
+            if threading.current_thread() is saver:
+                serializing.set()
+                release.wait(timeout=10)
+            return to_dict(item, *args, **kwargs)
+
+        monkeypatch.setattr(ClipboardItem, "to_dict", slow_to_dict)
+        saver = threading.Thread(target=manager.save_stores)
+        saver.start()
+        try:
+            assert serializing.wait(timeout=5)
+            writer = threading.Thread(target=manager.add_clip, args=("written during save",))
+            writer.start()
+            writer.join(timeout=2)
+            assert not writer.is_alive()
+
+            reader = threading.Thread(target=manager.get_recent_history)
+            started = time.monotonic()
+            reader.start()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+            assert time.monotonic() - started < 0.5
+        finally:
+            release.set()
+            saver.join(timeout=10)
+        monkeypatch.undo()
+        manager.shutdown()
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path), max_history=500, clipboard=MemoryClipboard())
+        assert reloaded.history_store.items[0].content == "written during save"
+        assert len(reloaded.history_store) == 500
+        _check_invariants(reloaded)
@@ -0,0 +1,125 @@
+"""
+Unit tests for WriteBehindPersister.
+"""
+import os
+import time
+import pytest
+from clipboard_manager import ClipboardManager
+from stores.write_behind import WriteBehindPersister
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+
+@pytest.mark.unit
+class TestWriteBehindPersister:
+    """Test debounced flushing."""
+
+    def test_zero_delay_flushes_inline(self):
+        """delay=0 keeps save-per-mutation behaviour."""
+        recorder = _Recorder()
+        persister = WriteBehindPersister(recorder)
+        persister.mark_dirty()
+        persister.mark_dirty()
+        assert recorder.calls == 2
+        assert not persister.pending
+
+    def test_burst_coalesces_into_one_flush(self):
+        """Many mutations inside the quiet period produce a single write."""
+        recorder = _Recorder()
+        lags = []
+        persister = WriteBehindPersister(recorder, delay=0.05, on_flush=lags.append)
+        for _ in range(100):
+            persister.mark_dirty()
+        assert recorder.calls == 0
+        assert persister.pending
+
+        time.sleep(0.3)
+        assert recorder.calls == 1
+        assert len(lags) == 1
+        stats = persister.get_stats()
+        assert stats["mutations"] == 100
+        assert stats["flushes"] == 1
+        assert not stats["pending"]
+        persister.stop()
+
+    def test_max_latency_bounds_continuous_writes(self):
+        """Steady mutations still flush within max_latency."""
+        recorder = _Recorder()
+        persister = WriteBehindPersister(recorder, delay=0.05, max_latency=0.1)
+        deadline = time.monotonic() + 0.4
+        while time.monotonic() < deadline:
+            persister.mark_dirty()
+            time.sleep(0.01)
+        assert recorder.calls >= 2
+        persister.stop()
+
+    def test_stop_and_flush_write_pending_changes(self):
+        """stop() and flush() never lose a pending change."""
+        recorder = _Recorder()
+        persister = WriteBehindPersister(recorder, delay=60)
+        persister.mark_dirty()
+        assert persister.flush() is True
+        assert persister.flush() is False
+        persister.mark_dirty()
+        persister.stop()
+        assert recorder.calls == 2
+
+        # After stop, mutations are written inline
+        persister.mark_dirty()
+        assert recorder.calls == 3
+
+    def test_failed_flush_is_counted(self):
+        """A failing save is logged and counted, not raised."""
+
+        def failing():
+            raise OSError("disk full")
+
+        persister = WriteBehindPersister(failing)
+        persister.mark_dirty()
+        assert persister.get_stats()["failed_flushes"] == 1
+        assert persister.pending
+
+    def test_failed_flush_is_retried(self, monkeypatch):
+        """Changes stay pending after a failure and are retried without a new mutation."""
+        monkeypatch.setattr("stores.write_behind.RETRY_DELAY", 0.05)
+        attempts = []
+
+        def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise OSError("disk full")
+
+        persister = WriteBehindPersister(flaky, delay=0.01)
+        persister.mark_dirty()
+        time.sleep(0.5)
+        stats = persister.get_stats()
+        assert (stats["failed_flushes"], stats["flushes"]) == (1, 1)
+        assert attempts[1] - attempts[0] >= 0.05
+        assert not persister.pending
+        persister.stop()
+
+
+@pytest.mark.unit
+class TestClipboardManagerWriteBehind:
+    """Test manager persistence through the write-behind persister."""
+
+    def test_deferred_saves_persist_on_flush(self, tmp_path):
+        """Mutations are saved once on flush and reload intact."""
+        manager = ClipboardManager(data_dir=str(tmp_path), save_delay=60)
+        for i in range(20):
+            manager.add_clip(f"clip {i}")
+        assert manager.get_persistence_stats()["pending"]
+        assert not os.path.exists(manager.history_file)
+
+        manager.shutdown()
+        assert manager.get_persistence_stats()["flushes"] == 1
+
+        reloaded = ClipboardManager(data_dir=str(tmp_path))
+        assert len(reloaded.history_store) == 20
+        assert reloaded.history_store[0].content == "clip 19"